@@ -68,10 +68,16 @@ def trial_balance() -> list[dict]:
         }
         for row in cursor.fetchall()
     ]
-    cursor.execute("SELECT account_id, debit, credit FROM journal_lines")
-    lines = [dict(row) for row in cursor.fetchall()]
+    cursor.execute(
+        """
+        SELECT account_id, COALESCE(SUM(debit), 0) AS debit, COALESCE(SUM(credit), 0) AS credit
+        FROM journal_lines
+        GROUP BY account_id
+        """
+    )
+    totals = [dict(row) for row in cursor.fetchall()]
     conn.close()
-    report = build_trial_balance_report(accounts, lines)
+    report = build_trial_balance_report(accounts, account_totals=totals)
     return [
         {
             "account": item["name"],
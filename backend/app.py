@@ -6,14 +6,32 @@ from extensions import db, jwt, bcrypt
 from models import *
 from services.accounting_engine import (
     post_journal_entry,
+    post_journal_entries_batch,
     get_company_account,
     serialize_journal_entry,
     seed_chart_of_accounts,
     serialize_ledger_account,
     analyze_journal_lines,
 )
-from services.invoice_service import create_invoice, serialize_invoice, apply_customer_payment, post_invoice_journal
-from services.bill_service import create_bill, serialize_bill, apply_vendor_payment, post_bill_journal, get_or_create_vendor_profile
+from services.invoice_service import (
+    create_invoice,
+    serialize_invoice,
+    apply_customer_payment,
+    post_invoice_journal,
+    list_invoice_page,
+    import_invoices,
+    apply_customer_remittance,
+)
+from services.bill_service import (
+    create_bill,
+    serialize_bill,
+    apply_vendor_payment,
+    post_bill_journal,
+    get_or_create_vendor_profile,
+    list_bill_page,
+    import_bills,
+    apply_vendor_remittance,
+)
 from services.reporting_service import (
     build_account_register,
     build_accounting_overview,
@@ -25,22 +43,56 @@ from services.reporting_service import (
     serialize_inventory_item,
     serialize_purchase_order,
     serialize_project,
+    REGISTER_CURSOR_FIELDS,
 )
 from services.finance_service import calculate_finance_summary, calculate_tax_summary, get_or_create_tax_profile
 from services.ai_cfo_service import build_ai_cfo_overview, answer_ai_cfo_question
 from services.guided_entry_service import post_guided_entries
-from services.statement_service import build_financial_statements
+from services.aging_service import build_payables_aging, build_receivables_aging
+from services.statement_service import (
+    build_comparative_statements,
+    build_consolidated_statements,
+    build_financial_statements,
+    parse_statement_sections,
+)
 from services.ingestion_service import (
     read_external_dataframe,
     normalize_ledger_dataframe,
     calc,
     extract_manufacturing_schedule,
 )
-from services.common import refresh_finance_documents, generate_document_number
+from services.common import (
+    refresh_finance_documents,
+    generate_document_number,
+    reconcile_document_payment_totals,
+    sweep_overdue_documents,
+    document_import_payloads,
+    remittance_payloads,
+    DOCUMENT_CURSOR_FIELDS,
+    parse_document_filters,
+)
+from services.ledger_state_service import bump_chart_version, bump_ledger_version
+from services.balance_service import (
+    backfill_account_balances,
+    close_balance_periods,
+    rebuild_account_balances,
+    verify_account_balances,
+)
+from services.cash_flow_service import backfill_cash_flow_entries, rebuild_cash_flow_entries
+from services.statement_cache import cached_statement, statement_cache_key, statement_etag
 from middleware import get_user_from_token, roles_required, plan_required, get_plan_definition
-from utils import parse_money, parse_iso_date, today_utc_date, iso_date, hash_key
+from utils import (
+    parse_money,
+    parse_iso_date,
+    parse_keyset_cursor,
+    parse_page_limit,
+    today_utc_date,
+    iso_date,
+    hash_key,
+)
 from constants import *
 from bootstrap import ensure_startup_schema, build_system_status_payload
+import click
 import os
 import datetime
 import json
@@ -68,6 +120,10 @@ CORS(app)
 with app.app_context():
     db.create_all()
     ensure_startup_schema(db)
+    backfill_account_balances()
+    backfill_cash_flow_entries()
+    if reconcile_document_payment_totals(only_missing=True):
+        db.session.commit()
 
 # Return JSON for unhandled exceptions (avoids HTML 500 pages)
 @app.errorhandler(Exception)
@@ -115,6 +171,20 @@ def _require_user():
     return user, None
 
 
+def _ledger_cached_response(company, name, params, builder):
+    # Polling dashboards revalidate with If-None-Match; an unchanged ledger answers 304 before
+    # anything is computed.
+    key = statement_cache_key(company.id, name, params)
+    etag = statement_etag(key)
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = jsonify(cached_statement(key, builder))
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
 def _is_org_admin(user):
     return user.role in {"owner", "admin"}
 
@@ -950,6 +1020,8 @@ def setup_company(company_id):
     state.is_configured = True
     state.configured_at = datetime.datetime.now(datetime.UTC)
 
+    # Statements and summaries depend on the business type and partners, not only on postings.
+    bump_ledger_version(company.id)
     db.session.commit()
     return _serialize_company(company)
 
@@ -1114,7 +1186,7 @@ def dashboard():
     company = Company.query.filter_by(id=company_id, org_id=user.org_id).first()
     if not company:
         return {"error": "company not found"}, 404
-    return calculate_finance_summary(company)
+    return _ledger_cached_response(company, "finance_summary", (), lambda: calculate_finance_summary(company))
 
 @app.route("/finance/summary")
 @jwt_required()
@@ -1126,7 +1198,7 @@ def finance_summary():
     company = Company.query.filter_by(id=company_id, org_id=user.org_id).first()
     if not company:
         return {"error": "company not found"}, 404
-    return calculate_finance_summary(company)
+    return _ledger_cached_response(company, "finance_summary", (), lambda: calculate_finance_summary(company))
 
 
 @app.route("/finance/statements")
@@ -1139,7 +1211,69 @@ def finance_statements():
     company = Company.query.get(user.default_company_id)
     if not company:
         return {"error": "company not found"}, 404
-    return build_financial_statements(company)
+    try:
+        start_date = parse_iso_date(request.args.get("start_date"), "start_date")
+        end_date = parse_iso_date(request.args.get("end_date"), "end_date")
+        as_of = parse_iso_date(request.args.get("as_of"), "as_of")
+        include = parse_statement_sections(request.args.get("include"))
+        return _ledger_cached_response(
+            company,
+            "financial_statements",
+            (start_date, end_date, as_of, include),
+            lambda: build_financial_statements(
+                company,
+                start_date=start_date,
+                end_date=end_date,
+                as_of=as_of,
+                include=include,
+            ),
+        )
+    except ValueError as exc:
+        return {"error": str(exc)}, 400
+
+@app.route("/finance/statements/comparative")
+@jwt_required()
+def finance_comparative_statements():
+    user, error = _require_user()
+    if error:
+        return error
+
+    company = Company.query.get(user.default_company_id)
+    if not company:
+        return {"error": "company not found"}, 404
+    try:
+        start_date = parse_iso_date(request.args.get("start_date"), "start_date")
+        end_date = parse_iso_date(request.args.get("end_date"), "end_date")
+        period = request.args.get("period", "month")
+        return _ledger_cached_response(
+            company,
+            "comparative_statements",
+            (start_date, end_date, period),
+            lambda: build_comparative_statements(company, start_date=start_date, end_date=end_date, period=period),
+        )
+    except ValueError as exc:
+        return {"error": str(exc)}, 400
+
+@app.route("/org/consolidated-statements")
+@jwt_required()
+def org_consolidated_statements():
+    user, error = _require_user()
+    if error:
+        return error
+
+    companies = _visible_companies_for_user(user)
+    if not companies:
+        return {"error": "company not found"}, 404
+    try:
+        payload = build_consolidated_statements(
+            companies,
+            start_date=parse_iso_date(request.args.get("start_date"), "start_date"),
+            end_date=parse_iso_date(request.args.get("end_date"), "end_date"),
+        )
+    except ValueError as exc:
+        return {"error": str(exc)}, 400
+    payload["org_id"] = user.org_id
+    return payload
 
 @app.route("/finance/invoices", methods=["GET"])
 @jwt_required()
@@ -1148,8 +1282,13 @@ def list_invoices():
     if error:
         return error
     company = Company.query.get(user.default_company_id)
-    invoices, _ = refresh_finance_documents(company.id)
-    return {"items": [serialize_invoice(inv) for inv in invoices]}
+    try:
+        filters = parse_document_filters(request.args, "customer")
+        after = parse_keyset_cursor(request.args.get("after"), DOCUMENT_CURSOR_FIELDS)
+        limit = parse_page_limit(request.args.get("limit"))
+    except ValueError as exc:
+        return {"error": str(exc)}, 400
+    return list_invoice_page(company, filters, after=after, limit=limit)
 
 @app.route("/finance/invoices", methods=["POST"])
 @jwt_required()
@@ -1160,6 +1299,7 @@ def create_invoice_route():
     company = Company.query.get(user.default_company_id)
     data = request.get_json()
     invoice = create_invoice(user, company, data)
+    db.session.commit()
     return serialize_invoice(invoice), 201
 
 @app.route("/finance/bills", methods=["GET"])
@@ -1169,8 +1309,13 @@ def list_bills():
     if error:
         return error
     company = Company.query.get(user.default_company_id)
-    _, bills = refresh_finance_documents(company.id)
-    return {"items": [serialize_bill(b) for b in bills]}
+    try:
+        filters = parse_document_filters(request.args, "vendor")
+        after = parse_keyset_cursor(request.args.get("after"), DOCUMENT_CURSOR_FIELDS)
+        limit = parse_page_limit(request.args.get("limit"))
+    except ValueError as exc:
+        return {"error": str(exc)}, 400
+    return list_bill_page(company, filters, after=after, limit=limit)
 
 @app.route("/finance/bills", methods=["POST"])
 @jwt_required()
@@ -1181,8 +1326,95 @@ def create_bill_route():
     company = Company.query.get(user.default_company_id)
     data = request.get_json()
     bill = create_bill(user, company, data)
+    db.session.commit()
     return serialize_bill(bill), 201
 
+def _bulk_document_request(collection, parse_csv):
+    # CSV uploads go through parse_csv; JSON bodies list their rows under the collection key.
+    file = request.files.get("file")
+    if file:
+        try:
+            payloads = parse_csv(file.stream)
+        except ValueError as exc:
+            return None, ({"error": str(exc)}, 400)
+    else:
+        payloads = (request.get_json(silent=True) or {}).get(collection)
+    if not isinstance(payloads, list) or not payloads:
+        return None, ({"error": f"{collection} must be a non-empty list"}, 400)
+    return payloads, None
+
+def _document_import_response(collection, imported, results):
+    if not imported:
+        db.session.rollback()
+        failed = [result for result in results if result["error"]]
+        return {
+            "error": f"{len(failed)} of {len(results)} {collection} cannot be imported",
+            "imported": 0,
+            "items": results,
+        }, 400
+    db.session.commit()
+    return {"imported": len(results), "items": results}, 201
+
+@app.route("/finance/invoices/import", methods=["POST"])
+@jwt_required()
+def import_invoices_route():
+    user, error = _require_user()
+    if error:
+        return error
+    company = Company.query.get(user.default_company_id)
+    payloads, error = _bulk_document_request("invoices", document_import_payloads)
+    if error:
+        return error
+    return _document_import_response("invoices", *import_invoices(user, company, payloads))
+
+@app.route("/finance/bills/import", methods=["POST"])
+@jwt_required()
+def import_bills_route():
+    user, error = _require_user()
+    if error:
+        return error
+    company = Company.query.get(user.default_company_id)
+    payloads, error = _bulk_document_request("bills", document_import_payloads)
+    if error:
+        return error
+    return _document_import_response("bills", *import_bills(user, company, payloads))
+
+def _remittance_response(applied, results):
+    if not applied:
+        db.session.rollback()
+        return {
+            "error": f"{len(results)} of {len(results)} payments cannot be applied",
+            "applied": 0,
+            "failed": len(results),
+            "items": results,
+        }, 400
+    db.session.commit()
+    return {"applied": applied, "failed": len(results) - applied, "items": results}
+
+@app.route("/finance/invoices/remittance", methods=["POST"])
+@jwt_required()
+def invoice_remittance():
+    user, error = _require_user()
+    if error:
+        return error
+    company = Company.query.get(user.default_company_id)
+    payloads, error = _bulk_document_request("payments", remittance_payloads)
+    if error:
+        return error
+    return _remittance_response(*apply_customer_remittance(company, payloads))
+
+@app.route("/finance/bills/remittance", methods=["POST"])
+@jwt_required()
+def bill_remittance():
+    user, error = _require_user()
+    if error:
+        return error
+    company = Company.query.get(user.default_company_id)
+    payloads, error = _bulk_document_request("payments", remittance_payloads)
+    if error:
+        return error
+    return _remittance_response(*apply_vendor_remittance(company, payloads))
+
 @app.route("/finance/invoices/<int:invoice_id>/payments", methods=["POST"])
 @jwt_required()
 def pay_invoice(invoice_id):
@@ -1237,6 +1469,36 @@ def payables():
     total_open = round(sum(bill.balance_due for bill in open_bills), 2)
     return {"total_open": total_open, "count": len(open_bills)}
 
+@app.route("/finance/aging/receivables")
+@jwt_required()
+def receivables_aging():
+    user, error = _require_user()
+    if error:
+        return error
+    company = _resolve_company_for_user(user)
+    if not company:
+        return {"error": "company not found"}, 404
+    try:
+        as_of = parse_iso_date(request.args.get("as_of"), "as_of")
+    except ValueError as exc:
+        return {"error": str(exc)}, 400
+    return build_receivables_aging(company, as_of=as_of)
+
+@app.route("/finance/aging/payables")
+@jwt_required()
+def payables_aging():
+    user, error = _require_user()
+    if error:
+        return error
+    company = _resolve_company_for_user(user)
+    if not company:
+        return {"error": "company not found"}, 404
+    try:
+        as_of = parse_iso_date(request.args.get("as_of"), "as_of")
+    except ValueError as exc:
+        return {"error": str(exc)}, 400
+    return build_payables_aging(company, as_of=as_of)
+
 @app.route("/finance/accounting/overview")
 @jwt_required()
 def accounting_overview():
@@ -1244,7 +1506,14 @@ def accounting_overview():
     if error:
         return error
     company = _resolve_company_for_user(user)
-    return build_accounting_overview(company)
+    if not company:
+        return {"error": "company not found"}, 404
+    try:
+        as_of = parse_iso_date(request.args.get("as_of"), "as_of")
+        source = (request.args.get("source") or "balances").strip().lower()
+        return build_accounting_overview(company, as_of=as_of, source=source)
+    except ValueError as exc:
+        return {"error": str(exc)}, 400
 
 
 @app.route("/finance/chart-of-accounts", methods=["GET", "POST"])
@@ -1290,6 +1559,8 @@ def chart_of_accounts():
         is_active=True,
     )
     db.session.add(account)
+    db.session.flush()
+    bump_chart_version(company.id)
     db.session.commit()
     return serialize_ledger_account(account), 201
 
@@ -1304,7 +1575,7 @@ def seed_chart_of_accounts_route():
     if not company:
         return {"error": "company not found"}, 404
 
-    created = seed_chart_of_accounts(company)
+    created = seed_chart_of_accounts(company, force=True)
     db.session.commit()
     accounts = (
         LedgerAccount.query.filter_by(company_id=company.id)
@@ -1370,6 +1641,43 @@ def journal_entries():
     return response, 201
 
 
+@app.route("/finance/journal-entries/batch", methods=["POST"])
+@jwt_required()
+def journal_entries_batch():
+    user, error = _require_user()
+    if error:
+        return error
+    company = _resolve_company_for_user(user)
+    if not company:
+        return {"error": "company not found"}, 404
+
+    payload = request.get_json(silent=True) or {}
+    entries = payload.get("entries")
+    if not isinstance(entries, list) or not entries:
+        return {"error": "entries must be a non-empty list"}, 400
+    try:
+        default_entry_date = parse_iso_date(payload.get("entry_date"), "entry_date", today_utc_date())
+    except ValueError as exc:
+        return {"error": str(exc)}, 400
+
+    posted, results = post_journal_entries_batch(company, user, entries, default_entry_date)
+    if not posted:
+        db.session.rollback()
+        failed = [result for result in results if not result["diagnostics"]["can_post"]]
+        return {
+            "error": f"{len(failed)} of {len(results)} entries cannot be posted",
+            "posted": 0,
+            "items": results,
+        }, 400
+
+    db.session.commit()
+    return {
+        "posted": len(results),
+        "line_count": sum(result["diagnostics"]["line_count"] for result in results),
+        "items": results,
+    }, 201
+
+
 @app.route("/finance/guided-entries", methods=["POST"])
 @jwt_required()
 def guided_entries():
@@ -1425,7 +1733,12 @@ def account_register():
         )
     if not account:
         return {"error": "account not found"}, 404
-    return build_account_register(company, account)
+    try:
+        after = parse_keyset_cursor(request.args.get("after"), REGISTER_CURSOR_FIELDS)
+        limit = parse_page_limit(request.args.get("limit"))
+    except ValueError as exc:
+        return {"error": str(exc)}, 400
+    return build_account_register(company, account, after=after, limit=limit)
 
 @app.route("/ai-cfo/overview")
 @jwt_required()
@@ -1616,6 +1929,92 @@ def analyze_report():
     except Exception as e:
         return {"error": str(e)}, 400
 
+# ---------------------------------------------------------------------------
+# Maintenance commands
+# ---------------------------------------------------------------------------
+
+@app.cli.command("rebuild-balances")
+@click.option("--company-id", type=int, default=None, help="Limit the run to one company.")
+@click.option("--verify-only", is_flag=True, help="Report drift without rewriting balances.")
+def rebuild_balances_command(company_id, verify_only):
+    """Recompute account balances and the cash-flow index from journal lines and report any drift."""
+    if company_id is not None:
+        company_ids = [company_id]
+    else:
+        company_ids = [row.id for row in Company.query.order_by(Company.id.asc()).all()]
+
+    drifted = 0
+    for target_id in company_ids:
+        report = verify_account_balances(target_id)
+        if report["in_sync"]:
+            continue
+        drifted += 1
+        for item in report["drift"]:
+            click.echo(
+                f"company {target_id} account {item['account_code'] or item['account_id']}: "
+                f"stored {item['stored_debit']:.2f}/{item['stored_credit']:.2f}, "
+                f"expected {item['expected_debit']:.2f}/{item['expected_credit']:.2f}"
+            )
+        if not verify_only:
+            rebuild_account_balances(target_id)
+
+    if not verify_only:
+        # Cash-flow classification depends on the current chart, so refresh it alongside balances.
+        for target_id in company_ids:
+            rebuild_cash_flow_entries(target_id)
+            # Cached statements were built from the rows just rewritten.
+            bump_ledger_version(target_id)
+        db.session.commit()
+    click.echo(f"checked {len(company_ids)} companies, {drifted} with drift" + ("" if verify_only else ", balances rebuilt"))
+
+
+@app.cli.command("snapshot-balances")
+@click.option("--company-id", type=int, default=None, help="Limit the run to one company.")
+@click.option("--through", default=None, help="Close every complete month up to this date (YYYY-MM-DD).")
+def snapshot_balances_command(company_id, through):
+    """Write month-end balance snapshots for every closed month that is missing one."""
+    through_date = parse_iso_date(through, "through", today_utc_date())
+    if company_id is not None:
+        company_ids = [company_id]
+    else:
+        company_ids = [row.id for row in Company.query.order_by(Company.id.asc()).all()]
+
+    closed_count = 0
+    for target_id in company_ids:
+        closed_count += len(close_balance_periods(target_id, through_date))
+    db.session.commit()
+    click.echo(f"closed {closed_count} periods across {len(company_ids)} companies")
+
+
+@app.cli.command("reconcile-documents")
+@click.option("--company-id", type=int, default=None, help="Limit the run to one company.")
+def reconcile_documents_command(company_id):
+    """Recompute stored invoice and bill payment totals from their payments and fix any drift."""
+    fixed = reconcile_document_payment_totals(company_id)
+    for changed_company_id in sorted({document.company_id for document in fixed}):
+        bump_ledger_version(changed_company_id)
+    db.session.commit()
+    click.echo(f"reconciled {len(fixed)} documents")
+
+
+@app.cli.command("sweep-overdue")
+@click.option("--company-id", type=int, default=None, help="Limit the run to one company.")
+@click.option("--today", default=None, help="Treat this date as today (YYYY-MM-DD).")
+def sweep_overdue_command(company_id, today):
+    """Move sent invoices and approved bills past their due date to overdue; run once a day."""
+    today_date = parse_iso_date(today, "today", today_utc_date())
+    if company_id is not None:
+        company_ids = [company_id]
+    else:
+        company_ids = [row.id for row in Company.query.order_by(Company.id.asc()).all()]
+
+    moved = 0
+    for target_id in company_ids:
+        moved += sweep_overdue_documents(target_id, today_date)
+        db.session.commit()
+    click.echo(f"marked {moved} documents overdue across {len(company_ids)} companies")
+
+
 if __name__ == "__main__":
     with app.app_context():
         db.create_all()
@@ -21,6 +21,18 @@ SCHEMA_UPGRADES = {
     "company": {
         "business_type": "VARCHAR(50) DEFAULT 'sole_proprietor'",
     },
+    "invoice": {
+        "paid_total": "FLOAT DEFAULT 0",
+    },
+    "vendor_bill": {
+        "paid_total": "FLOAT DEFAULT 0",
+    },
+    "company_ledger_state": {
+        "seeded_version": "INTEGER DEFAULT 0",
+        "guided_seeded_version": "INTEGER DEFAULT 0",
+        "cash_flow_version": "INTEGER DEFAULT 0",
+        "ledger_version": "INTEGER DEFAULT 0",
+    },
 }
 
 
@@ -48,6 +60,25 @@ def ensure_startup_schema(db):
             )
 
     db.session.commit()
+    ensure_model_indexes(db, inspect(db.engine))
+
+
+def ensure_model_indexes(db, inspector=None):
+    # create_all() never adds indexes to tables that already exist, so databases created
+    # before an index was declared on a model pick it up here instead.
+    inspector = inspector or inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    created = []
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables or not table.indexes:
+            continue
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda item: item.name):
+            if index.name in existing_indexes:
+                continue
+            index.create(bind=db.engine)
+            created.append(index.name)
+    return created
 
 
 def build_system_status_payload():
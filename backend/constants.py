@@ -16,6 +16,12 @@ VALID_BUSINESS_TYPES = {"sole_proprietor", "partnership", "manufacturing", "comp
 JOB_TYPES = {"finance_digest", "tax_filing_package", "accountant_brief"}
 JOB_TERMINAL_STATUSES = {"completed", "failed"}
 
+# Bump whenever cash-flow classification changes so existing cash-flow indexes are rebuilt.
+CASH_FLOW_INDEX_VERSION = 1
+
+# Bump whenever DEFAULT_CHART_OF_ACCOUNTS changes so seeded companies pick up the new accounts.
+CHART_OF_ACCOUNTS_VERSION = 1
+
 DEFAULT_CHART_OF_ACCOUNTS = [
     {"code": "1000", "name": "Cash", "category": "asset", "subtype": "current", "normal_balance": "debit"},
     {"code": "1100", "name": "Accounts Receivable", "category": "asset", "subtype": "current", "normal_balance": "debit"},
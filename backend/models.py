@@ -25,6 +25,8 @@ class User(db.Model):
 
 
 class Report(db.Model):
+    __table_args__ = (db.Index("ix_report_org_id_company_id", "org_id", "company_id"),)
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=True)
@@ -32,6 +34,8 @@ class Report(db.Model):
 
 
 class Company(db.Model):
+    __table_args__ = (db.Index("ix_company_org_id", "org_id"),)
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     name = db.Column(db.String(120), nullable=False)
@@ -39,7 +43,10 @@ class Company(db.Model):
 
 
 class UserCompanyMembership(db.Model):
-    __table_args__ = (db.UniqueConstraint("user_id", "company_id", name="uq_user_company_membership"),)
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "company_id", name="uq_user_company_membership"),
+        db.Index("ix_user_company_membership_company_id", "company_id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, nullable=False)
@@ -54,6 +61,8 @@ class UserCompanyMembership(db.Model):
 
 
 class CompanyPartner(db.Model):
+    __table_args__ = (db.Index("ix_company_partner_company_id_display_order", "company_id", "display_order"),)
+
     id = db.Column(db.Integer, primary_key=True)
     company_id = db.Column(db.Integer, nullable=False)
     name = db.Column(db.String(120), nullable=False)
@@ -74,6 +83,8 @@ class APIKey(db.Model):
 
 
 class AuditLog(db.Model):
+    __table_args__ = (db.Index("ix_audit_log_company_id", "company_id"),)
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=True)
@@ -125,6 +136,8 @@ class UserSetting(db.Model):
 
 
 class BackgroundJob(db.Model):
+    __table_args__ = (db.Index("ix_background_job_company_id_status", "company_id", "status"),)
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=False)
@@ -145,6 +158,8 @@ class BackgroundJob(db.Model):
 
 
 class BillingPaymentRequest(db.Model):
+    __table_args__ = (db.Index("ix_billing_payment_request_company_id_status", "company_id", "status"),)
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=False)
@@ -174,6 +189,11 @@ class BillingPaymentRequest(db.Model):
 
 
 class Invoice(db.Model):
+    __table_args__ = (
+        db.Index("ix_invoice_company_id_status_due_date", "company_id", "status", "due_date"),
+        db.Index("ix_invoice_company_id_issue_date", "company_id", "issue_date"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=False)
@@ -187,6 +207,7 @@ class Invoice(db.Model):
     tax_rate = db.Column(db.Float, nullable=False, default=0.0)
     tax_amount = db.Column(db.Float, nullable=False, default=0.0)
     total_amount = db.Column(db.Float, nullable=False, default=0.0)
+    paid_total = db.Column(db.Float, nullable=False, default=0.0)
     balance_due = db.Column(db.Float, nullable=False, default=0.0)
     notes = db.Column(db.Text, nullable=True)
     created_by = db.Column(db.Integer, nullable=False)
@@ -200,6 +221,8 @@ class Invoice(db.Model):
 
 
 class InvoiceItem(db.Model):
+    __table_args__ = (db.Index("ix_invoice_item_invoice_id", "invoice_id"),)
+
     id = db.Column(db.Integer, primary_key=True)
     invoice_id = db.Column(db.Integer, nullable=False)
     description = db.Column(db.String(200), nullable=False)
@@ -209,6 +232,11 @@ class InvoiceItem(db.Model):
 
 
 class CustomerPayment(db.Model):
+    __table_args__ = (
+        db.Index("ix_customer_payment_invoice_id", "invoice_id"),
+        db.Index("ix_customer_payment_company_id_payment_date", "company_id", "payment_date"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=False)
@@ -227,6 +255,11 @@ class CustomerPayment(db.Model):
 
 
 class VendorBill(db.Model):
+    __table_args__ = (
+        db.Index("ix_vendor_bill_company_id_status_due_date", "company_id", "status", "due_date"),
+        db.Index("ix_vendor_bill_company_id_issue_date", "company_id", "issue_date"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=False)
@@ -239,6 +272,7 @@ class VendorBill(db.Model):
     tax_rate = db.Column(db.Float, nullable=False, default=0.0)
     tax_amount = db.Column(db.Float, nullable=False, default=0.0)
     total_amount = db.Column(db.Float, nullable=False, default=0.0)
+    paid_total = db.Column(db.Float, nullable=False, default=0.0)
     balance_due = db.Column(db.Float, nullable=False, default=0.0)
     notes = db.Column(db.Text, nullable=True)
     created_by = db.Column(db.Integer, nullable=False)
@@ -252,6 +286,8 @@ class VendorBill(db.Model):
 
 
 class VendorBillItem(db.Model):
+    __table_args__ = (db.Index("ix_vendor_bill_item_bill_id", "bill_id"),)
+
     id = db.Column(db.Integer, primary_key=True)
     bill_id = db.Column(db.Integer, nullable=False)
     description = db.Column(db.String(200), nullable=False)
@@ -261,6 +297,11 @@ class VendorBillItem(db.Model):
 
 
 class VendorPayment(db.Model):
+    __table_args__ = (
+        db.Index("ix_vendor_payment_bill_id", "bill_id"),
+        db.Index("ix_vendor_payment_company_id_payment_date", "company_id", "payment_date"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=False)
@@ -279,6 +320,8 @@ class VendorPayment(db.Model):
 
 
 class BankFeedTransaction(db.Model):
+    __table_args__ = (db.Index("ix_bank_feed_transaction_company_id_status", "company_id", "status"),)
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=False)
@@ -298,6 +341,8 @@ class BankFeedTransaction(db.Model):
 
 
 class BankConnection(db.Model):
+    __table_args__ = (db.Index("ix_bank_connection_company_id", "company_id"),)
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=False)
@@ -347,6 +392,8 @@ class TaxProfile(db.Model):
 
 
 class LedgerAccount(db.Model):
+    __table_args__ = (db.Index("ix_ledger_account_company_id_code", "company_id", "code"),)
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=False)
@@ -372,6 +419,12 @@ class LedgerAccount(db.Model):
 
 
 class JournalEntry(db.Model):
+    __table_args__ = (
+        db.Index("ix_journal_entry_company_id_status_entry_date", "company_id", "status", "entry_date"),
+        db.Index("ix_journal_entry_company_id_entry_date", "company_id", "entry_date"),
+        db.Index("ix_journal_entry_company_id_source_type_source_id", "company_id", "source_type", "source_id"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=False)
@@ -392,6 +445,11 @@ class JournalEntry(db.Model):
 
 
 class JournalLine(db.Model):
+    __table_args__ = (
+        db.Index("ix_journal_line_journal_entry_id_line_number", "journal_entry_id", "line_number"),
+        db.Index("ix_journal_line_account_id_journal_entry_id", "account_id", "journal_entry_id"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     journal_entry_id = db.Column(db.Integer, nullable=False)
     account_id = db.Column(db.Integer, nullable=False)
@@ -402,7 +460,91 @@ class JournalLine(db.Model):
     credit = db.Column(db.Float, nullable=False, default=0.0)
 
 
+class CompanyLedgerState(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    company_id = db.Column(db.Integer, unique=True, nullable=False)
+    chart_version = db.Column(db.Integer, nullable=False, default=0)
+    seeded_version = db.Column(db.Integer, nullable=False, default=0)
+    guided_seeded_version = db.Column(db.Integer, nullable=False, default=0)
+    cash_flow_version = db.Column(db.Integer, nullable=False, default=0)
+    ledger_version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(
+        db.DateTime(timezone=True),
+        default=lambda: datetime.datetime.now(datetime.UTC),
+        onupdate=lambda: datetime.datetime.now(datetime.UTC),
+        nullable=False,
+    )
+
+
+class AccountBalance(db.Model):
+    __table_args__ = (db.UniqueConstraint("company_id", "account_id", name="uq_account_balance_company_account"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    company_id = db.Column(db.Integer, nullable=False)
+    account_id = db.Column(db.Integer, nullable=False)
+    debit_cents = db.Column(db.BigInteger, nullable=False, default=0)
+    credit_cents = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(
+        db.DateTime(timezone=True),
+        default=lambda: datetime.datetime.now(datetime.UTC),
+        onupdate=lambda: datetime.datetime.now(datetime.UTC),
+        nullable=False,
+    )
+
+
+class AccountPeriodBalance(db.Model):
+    __table_args__ = (
+        db.UniqueConstraint("company_id", "account_id", "period_end", name="uq_account_period_balance"),
+        db.Index("ix_account_period_balance_company_id_period_end", "company_id", "period_end"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    company_id = db.Column(db.Integer, nullable=False)
+    account_id = db.Column(db.Integer, nullable=False)
+    period_end = db.Column(db.Date, nullable=False)
+    debit_cents = db.Column(db.BigInteger, nullable=False, default=0)
+    credit_cents = db.Column(db.BigInteger, nullable=False, default=0)
+    created_at = db.Column(
+        db.DateTime(timezone=True),
+        default=lambda: datetime.datetime.now(datetime.UTC),
+        nullable=False,
+    )
+
+
+class CashFlowEntry(db.Model):
+    __table_args__ = (db.Index("ix_cash_flow_entry_company_id_entry_date", "company_id", "entry_date"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    company_id = db.Column(db.Integer, nullable=False)
+    journal_entry_id = db.Column(db.Integer, unique=True, nullable=False)
+    entry_date = db.Column(db.Date, nullable=False)
+    section = db.Column(db.String(20), nullable=False, default="operating")
+    cash_delta_cents = db.Column(db.BigInteger, nullable=False, default=0)
+    created_at = db.Column(
+        db.DateTime(timezone=True),
+        default=lambda: datetime.datetime.now(datetime.UTC),
+        nullable=False,
+    )
+
+
+class DocumentSequence(db.Model):
+    __table_args__ = (db.UniqueConstraint("company_id", "prefix", name="uq_document_sequence_company_prefix"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    company_id = db.Column(db.Integer, nullable=False)
+    prefix = db.Column(db.String(20), nullable=False)
+    last_value = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(
+        db.DateTime(timezone=True),
+        default=lambda: datetime.datetime.now(datetime.UTC),
+        onupdate=lambda: datetime.datetime.now(datetime.UTC),
+        nullable=False,
+    )
+
+
 class VendorProfile(db.Model):
+    __table_args__ = (db.Index("ix_vendor_profile_company_id", "company_id"),)
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=False)
@@ -429,6 +571,11 @@ class VendorProfile(db.Model):
 
 
 class BillDisbursement(db.Model):
+    __table_args__ = (
+        db.Index("ix_bill_disbursement_company_id_status", "company_id", "status"),
+        db.Index("ix_bill_disbursement_bill_id", "bill_id"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=False)
@@ -451,6 +598,8 @@ class BillDisbursement(db.Model):
 
 
 class ReconciliationRule(db.Model):
+    __table_args__ = (db.Index("ix_reconciliation_rule_company_id", "company_id"),)
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=False)
@@ -472,6 +621,8 @@ class ReconciliationRule(db.Model):
 
 
 class ReconciliationException(db.Model):
+    __table_args__ = (db.Index("ix_reconciliation_exception_company_id_status", "company_id", "status"),)
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=False)
@@ -489,6 +640,8 @@ class ReconciliationException(db.Model):
 
 
 class TaxFiling(db.Model):
+    __table_args__ = (db.Index("ix_tax_filing_company_id", "company_id"),)
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=False)
@@ -515,6 +668,8 @@ class TaxFiling(db.Model):
 
 
 class EmployeeProfile(db.Model):
+    __table_args__ = (db.Index("ix_employee_profile_company_id", "company_id"),)
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=False)
@@ -540,6 +695,8 @@ class EmployeeProfile(db.Model):
 
 
 class ContractorProfile(db.Model):
+    __table_args__ = (db.Index("ix_contractor_profile_company_id", "company_id"),)
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=False)
@@ -564,6 +721,11 @@ class ContractorProfile(db.Model):
 
 
 class TimeEntry(db.Model):
+    __table_args__ = (
+        db.Index("ix_time_entry_company_id_project_id", "company_id", "project_id"),
+        db.Index("ix_time_entry_company_id_work_date", "company_id", "work_date"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=False)
@@ -584,6 +746,11 @@ class TimeEntry(db.Model):
 
 
 class MileageEntry(db.Model):
+    __table_args__ = (
+        db.Index("ix_mileage_entry_company_id_project_id", "company_id", "project_id"),
+        db.Index("ix_mileage_entry_company_id_trip_date", "company_id", "trip_date"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=False)
@@ -603,6 +770,8 @@ class MileageEntry(db.Model):
 
 
 class PayrollRun(db.Model):
+    __table_args__ = (db.Index("ix_payroll_run_company_id_pay_date", "company_id", "pay_date"),)
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=False)
@@ -625,6 +794,8 @@ class PayrollRun(db.Model):
 
 
 class PayrollLine(db.Model):
+    __table_args__ = (db.Index("ix_payroll_line_payroll_run_id", "payroll_run_id"),)
+
     id = db.Column(db.Integer, primary_key=True)
     payroll_run_id = db.Column(db.Integer, nullable=False)
     employee_id = db.Column(db.Integer, nullable=False)
@@ -637,6 +808,8 @@ class PayrollLine(db.Model):
 
 
 class InventoryItem(db.Model):
+    __table_args__ = (db.Index("ix_inventory_item_company_id", "company_id"),)
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=False)
@@ -663,6 +836,8 @@ class InventoryItem(db.Model):
 
 
 class PurchaseOrder(db.Model):
+    __table_args__ = (db.Index("ix_purchase_order_company_id_status", "company_id", "status"),)
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=False)
@@ -681,6 +856,8 @@ class PurchaseOrder(db.Model):
 
 
 class PurchaseOrderLine(db.Model):
+    __table_args__ = (db.Index("ix_purchase_order_line_purchase_order_id", "purchase_order_id"),)
+
     id = db.Column(db.Integer, primary_key=True)
     purchase_order_id = db.Column(db.Integer, nullable=False)
     inventory_item_id = db.Column(db.Integer, nullable=True)
@@ -692,6 +869,11 @@ class PurchaseOrderLine(db.Model):
 
 
 class InventoryMovement(db.Model):
+    __table_args__ = (
+        db.Index("ix_inventory_movement_company_id_project_id", "company_id", "project_id"),
+        db.Index("ix_inventory_movement_company_id_inventory_item_id", "company_id", "inventory_item_id"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=False)
@@ -709,6 +891,8 @@ class InventoryMovement(db.Model):
 
 
 class Project(db.Model):
+    __table_args__ = (db.Index("ix_project_company_id_status", "company_id", "status"),)
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=False)
@@ -733,6 +917,8 @@ class Project(db.Model):
 
 
 class ProjectCostEntry(db.Model):
+    __table_args__ = (db.Index("ix_project_cost_entry_project_id", "project_id"),)
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=False)
@@ -750,6 +936,8 @@ class ProjectCostEntry(db.Model):
 
 
 class IntegrationConnection(db.Model):
+    __table_args__ = (db.Index("ix_integration_connection_company_id", "company_id"),)
+
     id = db.Column(db.Integer, primary_key=True)
     org_id = db.Column(db.Integer, nullable=False)
     company_id = db.Column(db.Integer, nullable=False)
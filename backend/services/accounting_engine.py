@@ -1,37 +1,62 @@
+from sqlalchemy import insert
+
 from extensions import db
 from models import JournalEntry, JournalLine, LedgerAccount
-from constants import DEFAULT_CHART_OF_ACCOUNTS
+from services.balance_service import apply_balance_deltas, invalidate_period_balances
+from services.cash_flow_service import cash_flow_row, record_cash_flow_entries
+from services.ledger_state_service import (
+    bump_chart_version,
+    bump_ledger_version,
+    chart_version,
+    mark_chart_seeded,
+    seeded_version,
+)
+from services.sequence_service import reserve_document_numbers
+from constants import CHART_OF_ACCOUNTS_VERSION, DEFAULT_CHART_OF_ACCOUNTS
 from shared.accounting_core import analyze_entry_lines
-from utils import parse_money, today_utc_date, iso_date
+from utils import parse_iso_date, parse_money, today_utc_date, iso_date
 import datetime
+import threading
+
+_ACCOUNT_INDEX_CACHE = {}
+_ACCOUNT_INDEX_LOCK = threading.Lock()
 
 def generate_journal_number(company_id):
-    next_number = JournalEntry.query.filter_by(company_id=company_id).count() + 1
-    return f"JE-{int(company_id):03d}-{next_number:05d}"
+    return reserve_document_numbers(JournalEntry, company_id, "JE", 1)[0]
 
-def seed_chart_of_accounts(company):
-    created = 0
-    for template in DEFAULT_CHART_OF_ACCOUNTS:
-        existing = LedgerAccount.query.filter_by(company_id=company.id, code=template["code"]).first()
-        if existing:
+def ensure_company_accounts(company, definitions, is_system=False):
+    existing_codes = {
+        code for (code,) in db.session.query(LedgerAccount.code).filter(LedgerAccount.company_id == company.id).all()
+    }
+    missing = []
+    for definition in definitions:
+        if definition["code"] in existing_codes:
             continue
-        db.session.add(
-            LedgerAccount(
-                org_id=company.org_id,
-                company_id=company.id,
-                code=template["code"],
-                name=template["name"],
-                category=template["category"],
-                subtype=template.get("subtype"),
-                normal_balance=template.get("normal_balance", "debit"),
-                description=template.get("description"),
-                is_system=True,
-                is_active=True,
-            )
+        existing_codes.add(definition["code"])
+        missing.append(
+            {
+                "org_id": company.org_id,
+                "company_id": company.id,
+                "code": definition["code"],
+                "name": definition["name"],
+                "category": definition["category"],
+                "subtype": definition.get("subtype"),
+                "normal_balance": definition.get("normal_balance", "debit"),
+                "description": definition.get("description"),
+                "is_system": is_system,
+                "is_active": True,
+            }
         )
-        created += 1
-    if created:
-        db.session.flush()
+    if missing:
+        db.session.execute(insert(LedgerAccount), missing)
+        bump_chart_version(company.id)
+    return len(missing)
+
+def seed_chart_of_accounts(company, force=False):
+    if not force and seeded_version(company.id) >= CHART_OF_ACCOUNTS_VERSION:
+        return 0
+    created = ensure_company_accounts(company, DEFAULT_CHART_OF_ACCOUNTS, is_system=True)
+    mark_chart_seeded(company.id, CHART_OF_ACCOUNTS_VERSION)
     return created
 
 def get_company_account(company_id, account_id=None, account_code=None):
@@ -41,14 +66,47 @@ def get_company_account(company_id, account_id=None, account_code=None):
         return LedgerAccount.query.filter_by(company_id=company_id, code=str(account_code).strip()).first()
     return None
 
-def analyze_journal_lines(company, lines):
+def reset_account_index_cache():
+    with _ACCOUNT_INDEX_LOCK:
+        _ACCOUNT_INDEX_CACHE.clear()
+
+def company_account_index(company_id):
+    version = chart_version(company_id)
+    with _ACCOUNT_INDEX_LOCK:
+        cached = _ACCOUNT_INDEX_CACHE.get(company_id)
+    if cached and cached["version"] == version:
+        return cached
+
+    accounts = [serialize_ledger_account(account) for account in LedgerAccount.query.filter_by(company_id=company_id).all()]
+    index = {
+        "version": version,
+        "by_id": {account["id"]: account for account in accounts},
+        "by_code": {account["code"]: account for account in accounts},
+    }
+    if company_id not in db.session.info.get("chart_changed_company_ids", ()):
+        with _ACCOUNT_INDEX_LOCK:
+            _ACCOUNT_INDEX_CACHE[company_id] = index
+    return index
+
+def resolve_indexed_account(index, account_id=None, account_code=None):
+    if account_id is not None:
+        try:
+            return index["by_id"].get(int(account_id))
+        except (TypeError, ValueError):
+            return None
+    if account_code:
+        return index["by_code"].get(str(account_code).strip())
+    return None
+
+def analyze_journal_lines(company, lines, account_index=None):
     if not isinstance(lines, list):
         return analyze_entry_lines([])
 
+    account_index = account_index or company_account_index(company.id)
     prepared_lines = []
     for index, raw_line in enumerate(lines, start=1):
         payload = raw_line if isinstance(raw_line, dict) else {}
-        account = get_company_account(company.id, payload.get("account_id"), payload.get("account_code"))
+        account = resolve_indexed_account(account_index, payload.get("account_id"), payload.get("account_code"))
         issues = []
 
         if not isinstance(raw_line, dict):
@@ -71,9 +129,9 @@ def analyze_journal_lines(company, lines):
         prepared_lines.append(
             {
                 "line_number": index,
-                "account_id": account.id if account else None,
-                "account_code": account.code if account else str(payload.get("account_code") or "").strip(),
-                "account_name": account.name if account else "",
+                "account_id": account["id"] if account else None,
+                "account_code": account["code"] if account else str(payload.get("account_code") or "").strip(),
+                "account_name": account["name"] if account else "",
                 "debit": debit,
                 "credit": credit,
                 "issues": issues,
@@ -82,8 +140,9 @@ def analyze_journal_lines(company, lines):
 
     return analyze_entry_lines(prepared_lines)
 
-def normalize_journal_lines(company, lines):
-    diagnostics = analyze_journal_lines(company, lines)
+def normalize_journal_lines(company, lines, account_index=None):
+    account_index = account_index or company_account_index(company.id)
+    diagnostics = analyze_journal_lines(company, lines, account_index)
     if not diagnostics["can_post"]:
         raise ValueError(diagnostics["error"])
 
@@ -91,13 +150,13 @@ def normalize_journal_lines(company, lines):
 
     for index, raw_line in enumerate(lines, start=1):
         payload = raw_line or {}
-        account = get_company_account(company.id, payload.get("account_id"), payload.get("account_code"))
+        account = resolve_indexed_account(account_index, payload.get("account_id"), payload.get("account_code"))
         debit = parse_money(payload.get("debit", 0), f"journal line {index} debit")
         credit = parse_money(payload.get("credit", 0), f"journal line {index} credit")
 
         normalized.append(
             {
-                "account_id": account.id,
+                "account_id": account["id"],
                 "project_id": payload.get("project_id"),
                 "description": (payload.get("description") or "").strip() or None,
                 "debit": debit,
@@ -108,7 +167,8 @@ def normalize_journal_lines(company, lines):
 
 def post_journal_entry(company, user, entry_date, memo, lines, source_type="manual", source_id=None, reference=None):
     seed_chart_of_accounts(company)
-    normalized_lines, _, _ = normalize_journal_lines(company, lines)
+    account_index = company_account_index(company.id)
+    normalized_lines, _, _ = normalize_journal_lines(company, lines, account_index)
     entry = JournalEntry(
         org_id=company.org_id,
         company_id=company.id,
@@ -138,8 +198,99 @@ def post_journal_entry(company, user, entry_date, memo, lines, source_type="manu
         )
 
     db.session.flush()
+    apply_balance_deltas(company.id, normalized_lines)
+    invalidate_period_balances(company.id, entry_date)
+    record_cash_flow_entries(
+        [cash_flow_row(company.id, entry.id, entry_date, normalized_lines, account_index["by_id"])]
+    )
+    bump_ledger_version(company.id)
     return entry
 
+def post_journal_entries_batch(company, user, entries, default_entry_date=None, source_type="manual", source_ids=None):
+    seed_chart_of_accounts(company)
+    account_index = company_account_index(company.id)
+    default_entry_date = default_entry_date or today_utc_date()
+
+    prepared = []
+    results = []
+    for index, payload in enumerate(entries or [], start=1):
+        payload = payload if isinstance(payload, dict) else {}
+        lines = payload.get("lines")
+        diagnostics = analyze_journal_lines(company, lines, account_index)
+        try:
+            entry_date = parse_iso_date(payload.get("entry_date"), f"entry {index} entry_date", default_entry_date)
+        except ValueError as exc:
+            entry_date = None
+            diagnostics["can_post"] = False
+            diagnostics["blocking_issues"].append(str(exc))
+            diagnostics["error"] = diagnostics["error"] or str(exc)
+        results.append({"index": index, "id": None, "entry_number": None, "diagnostics": diagnostics})
+        prepared.append((payload, lines, entry_date))
+
+    if not results or not all(result["diagnostics"]["can_post"] for result in results):
+        return False, results
+
+    # Validation already succeeded above, so lines are resolved straight from the index.
+    entry_numbers = reserve_document_numbers(JournalEntry, company.id, "JE", len(prepared))
+    now = datetime.datetime.now(datetime.UTC)
+    entry_rows = []
+    source_ids = source_ids or [None] * len(prepared)
+    for (payload, _, entry_date), entry_number, source_id in zip(prepared, entry_numbers, source_ids):
+        entry_rows.append(
+            {
+                "org_id": company.org_id,
+                "company_id": company.id,
+                "entry_number": entry_number,
+                "entry_date": entry_date,
+                "memo": str(payload.get("memo") or "").strip() or "Manual journal entry",
+                "reference": str(payload.get("reference") or "").strip() or None,
+                "source_type": source_type,
+                "source_id": source_id,
+                "status": "posted",
+                "created_by": user.id,
+                "created_at": now,
+            }
+        )
+    # Ids are matched back by entry number: asking SQLite for RETURNING rows in parameter order
+    # would fall back to one INSERT per entry.
+    ids_by_number = dict(
+        db.session.execute(
+            insert(JournalEntry).returning(JournalEntry.entry_number, JournalEntry.id),
+            entry_rows,
+        ).tuples().all()
+    )
+    entry_ids = [ids_by_number[row["entry_number"]] for row in entry_rows]
+
+    line_rows = []
+    cash_flow_rows = []
+    for entry_id, (_, lines, entry_date) in zip(entry_ids, prepared):
+        entry_line_rows = []
+        for line_number, raw_line in enumerate(lines, start=1):
+            account = resolve_indexed_account(account_index, raw_line.get("account_id"), raw_line.get("account_code"))
+            entry_line_rows.append(
+                {
+                    "journal_entry_id": entry_id,
+                    "account_id": account["id"],
+                    "project_id": raw_line.get("project_id"),
+                    "line_number": line_number,
+                    "description": (raw_line.get("description") or "").strip() or None,
+                    "debit": parse_money(raw_line.get("debit", 0), f"journal line {line_number} debit"),
+                    "credit": parse_money(raw_line.get("credit", 0), f"journal line {line_number} credit"),
+                }
+            )
+        line_rows.extend(entry_line_rows)
+        cash_flow_rows.append(cash_flow_row(company.id, entry_id, entry_date, entry_line_rows, account_index["by_id"]))
+    db.session.execute(insert(JournalLine), line_rows)
+    record_cash_flow_entries(cash_flow_rows)
+
+    apply_balance_deltas(company.id, line_rows)
+    invalidate_period_balances(company.id, min(row["entry_date"] for row in entry_rows))
+    bump_ledger_version(company.id)
+    for result, entry_id, entry_number in zip(results, entry_ids, entry_numbers):
+        result["id"] = entry_id
+        result["entry_number"] = entry_number
+    return True, results
+
 def post_operational_entry(company, user, source_type, source_id, memo, lines, entry_date=None, reference=None):
     # Check if entry exists
     if source_id:
@@ -178,16 +329,21 @@ def serialize_ledger_account(account):
         "description": account.description or "",
     }
 
-def serialize_journal_entry(entry):
-    lines = []
-    for line in journal_lines_for(entry.id):
-        account = db.session.get(LedgerAccount, line.account_id)
-        lines.append(
+def serialize_journal_entry(entry, lines=None, account_lookup=None):
+    serialized_lines = []
+    for line in journal_lines_for(entry.id) if lines is None else lines:
+        if account_lookup is None:
+            account = db.session.get(LedgerAccount, line.account_id)
+            account_code, account_name = (account.code, account.name) if account else ("", "")
+        else:
+            account = account_lookup.get(line.account_id)
+            account_code, account_name = (account["code"], account["name"]) if account else ("", "")
+        serialized_lines.append(
             {
                 "id": line.id,
                 "account_id": line.account_id,
-                "account_code": account.code if account else "",
-                "account_name": account.name if account else "",
+                "account_code": account_code,
+                "account_name": account_name,
                 "project_id": line.project_id,
                 "description": line.description or "",
                 "debit": round(float(line.debit or 0), 2),
@@ -205,5 +361,5 @@ def serialize_journal_entry(entry):
         "source_id": entry.source_id,
         "status": entry.status,
         "reverses_entry_id": entry.reverses_entry_id,
-        "lines": lines,
+        "lines": serialized_lines,
     }
@@ -0,0 +1,98 @@
+import datetime
+
+from sqlalchemy import BigInteger, case, cast, func
+
+from extensions import db
+from models import CustomerPayment, Invoice, VendorBill, VendorPayment
+from shared.accounting_core import from_cents
+from utils import iso_date, today_utc_date
+
+
+AGING_BUCKETS = ("current", "days_1_30", "days_31_60", "days_61_90", "days_over_90")
+CLOSED_DOCUMENT_STATUSES = ("draft", "cancelled")
+
+
+def _later_payments(payment_model, document_column, company_id, as_of):
+    # Payments dated after the as-of date are added back, so an older as-of reports the balance
+    # that was open then rather than today's.
+    return (
+        db.session.query(document_column.label("document_id"), func.sum(payment_model.amount).label("amount"))
+        .filter(payment_model.company_id == company_id, payment_model.payment_date > as_of)
+        .group_by(document_column)
+        .subquery()
+    )
+
+
+def _aging_bucket(due_date_column, as_of):
+    # Day boundaries are resolved to dates up front so the CASE compares plain dates on every backend.
+    def days_before(days):
+        return as_of - datetime.timedelta(days=days)
+
+    return case(
+        (due_date_column >= as_of, "current"),
+        (due_date_column >= days_before(30), "days_1_30"),
+        (due_date_column >= days_before(60), "days_31_60"),
+        (due_date_column >= days_before(90), "days_61_90"),
+        else_="days_over_90",
+    )
+
+
+def _build_aging(model, party_column, party_key, payment_model, document_column, company, as_of):
+    as_of = as_of or today_utc_date()
+    later = _later_payments(payment_model, document_column, company.id, as_of)
+    balance_cents = cast(
+        func.round((model.balance_due + func.coalesce(later.c.amount, 0)) * 100),
+        BigInteger,
+    )
+    bucket = _aging_bucket(model.due_date, as_of)
+    rows = (
+        db.session.query(
+            party_column,
+            func.count(model.id),
+            *(func.sum(case((bucket == name, balance_cents), else_=0)) for name in AGING_BUCKETS),
+        )
+        .outerjoin(later, later.c.document_id == model.id)
+        .filter(
+            model.company_id == company.id,
+            model.issue_date <= as_of,
+            model.status.notin_(CLOSED_DOCUMENT_STATUSES),
+            balance_cents > 0,
+        )
+        .group_by(party_column)
+        .all()
+    )
+
+    totals = {name: 0 for name in AGING_BUCKETS}
+    items = []
+    for party, document_count, *bucket_cents in rows:
+        item = {party_key: party, "document_count": int(document_count)}
+        for name, cents in zip(AGING_BUCKETS, bucket_cents):
+            cents = int(cents or 0)
+            totals[name] += cents
+            item[name] = from_cents(cents)
+        item["total"] = from_cents(sum(int(cents or 0) for cents in bucket_cents))
+        items.append(item)
+    items.sort(key=lambda item: (-item["total"], item[party_key]))
+
+    return {
+        "as_of": iso_date(as_of),
+        "buckets": list(AGING_BUCKETS),
+        "items": items,
+        "totals": {
+            **{name: from_cents(cents) for name, cents in totals.items()},
+            "total": from_cents(sum(totals.values())),
+            "document_count": sum(item["document_count"] for item in items),
+        },
+    }
+
+
+def build_receivables_aging(company, as_of=None):
+    return _build_aging(
+        Invoice, Invoice.customer_name, "customer_name", CustomerPayment, CustomerPayment.invoice_id, company, as_of
+    )
+
+
+def build_payables_aging(company, as_of=None):
+    return _build_aging(
+        VendorBill, VendorBill.vendor_name, "vendor_name", VendorPayment, VendorPayment.bill_id, company, as_of
+    )
@@ -28,7 +28,10 @@ def _status_from_alerts(alerts):
 
 def build_company_ai_snapshot(company):
     finance = calculate_finance_summary(company)
-    statements = build_financial_statements(company)
+    statements = build_financial_statements(
+        company,
+        include=("profit_or_loss", "financial_position", "cash_flow", "health"),
+    )
     tax = calculate_tax_summary(company)
     accounting = build_accounting_overview(company)
     workforce = build_workforce_overview(company)
@@ -0,0 +1,299 @@
+import datetime
+from collections import defaultdict
+
+from sqlalchemy import BigInteger, cast, func, select, update
+
+from extensions import db
+from models import AccountBalance, AccountPeriodBalance, JournalEntry, JournalLine, LedgerAccount
+from services.ledger_context import invalidate_ledger_context
+from shared.accounting_core import from_cents, to_cents
+
+
+POSTED_STATUSES = ("posted", "reversed")
+
+
+def _month_end(value):
+    next_month = datetime.date(value.year + (value.month == 12), value.month % 12 + 1, 1)
+    return next_month - datetime.timedelta(days=1)
+
+
+def _line_cents(column):
+    # Journal lines keep their two-decimal Float columns; converting each one to cents before
+    # summing keeps the aggregate exact.
+    return func.coalesce(func.sum(cast(func.round(column * 100), BigInteger)), 0)
+
+
+def _cents_rows(rows):
+    return [
+        {"account_id": account_id, "debit_cents": int(debit or 0), "credit_cents": int(credit or 0)}
+        for account_id, debit, credit in rows
+    ]
+
+
+def apply_balance_deltas(company_id, lines):
+    deltas = defaultdict(lambda: [0, 0])
+    for line in lines:
+        bucket = deltas[line["account_id"]]
+        bucket[0] += to_cents(line.get("debit"))
+        bucket[1] += to_cents(line.get("credit"))
+
+    now = datetime.datetime.now(datetime.UTC)
+    for account_id, (debit_cents, credit_cents) in deltas.items():
+        # Increment in SQL so concurrent postings never overwrite each other's totals.
+        result = db.session.execute(
+            update(AccountBalance)
+            .where(AccountBalance.company_id == company_id, AccountBalance.account_id == account_id)
+            .values(
+                debit_cents=AccountBalance.debit_cents + debit_cents,
+                credit_cents=AccountBalance.credit_cents + credit_cents,
+                updated_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            db.session.add(
+                AccountBalance(
+                    company_id=company_id,
+                    account_id=account_id,
+                    debit_cents=debit_cents,
+                    credit_cents=credit_cents,
+                )
+            )
+
+    if deltas:
+        db.session.flush()
+        invalidate_ledger_context(company_id)
+    return len(deltas)
+
+
+def account_balance_rows(company_id):
+    rows = (
+        db.session.query(AccountBalance.account_id, AccountBalance.debit_cents, AccountBalance.credit_cents)
+        .filter(AccountBalance.company_id == company_id)
+        .all()
+    )
+    return _cents_rows(rows)
+
+
+def journal_activity_by_account(company_id, after=None, through=None):
+    query = (
+        db.session.query(JournalLine.account_id, _line_cents(JournalLine.debit), _line_cents(JournalLine.credit))
+        .join(JournalEntry, JournalLine.journal_entry_id == JournalEntry.id)
+        .filter(JournalEntry.company_id == company_id, JournalEntry.status.in_(POSTED_STATUSES))
+    )
+    if after is not None:
+        query = query.filter(JournalEntry.entry_date > after)
+    if through is not None:
+        query = query.filter(JournalEntry.entry_date <= through)
+    return _cents_rows(query.group_by(JournalLine.account_id).all())
+
+
+def account_activity_cents(company_id, account_id, *filters):
+    debit, credit = (
+        db.session.query(_line_cents(JournalLine.debit), _line_cents(JournalLine.credit))
+        .join(JournalEntry, JournalLine.journal_entry_id == JournalEntry.id)
+        .filter(
+            JournalEntry.company_id == company_id,
+            JournalEntry.status.in_(POSTED_STATUSES),
+            JournalLine.account_id == account_id,
+            *filters,
+        )
+        .one()
+    )
+    return int(debit or 0), int(credit or 0)
+
+
+def journal_activity_by_account_and_date(company_id, after=None, through=None):
+    query = (
+        db.session.query(
+            JournalLine.account_id,
+            JournalEntry.entry_date,
+            _line_cents(JournalLine.debit),
+            _line_cents(JournalLine.credit),
+        )
+        .join(JournalEntry, JournalLine.journal_entry_id == JournalEntry.id)
+        .filter(JournalEntry.company_id == company_id, JournalEntry.status.in_(POSTED_STATUSES))
+    )
+    if after is not None:
+        query = query.filter(JournalEntry.entry_date > after)
+    if through is not None:
+        query = query.filter(JournalEntry.entry_date <= through)
+    rows = query.group_by(JournalLine.account_id, JournalEntry.entry_date).all()
+    return [
+        {
+            "account_id": account_id,
+            "entry_date": entry_date,
+            "debit_cents": int(debit or 0),
+            "credit_cents": int(credit or 0),
+        }
+        for account_id, entry_date, debit, credit in rows
+    ]
+
+
+def rebuild_account_balances(company_id):
+    activity = journal_activity_by_account(company_id)
+    AccountBalance.query.filter_by(company_id=company_id).delete(synchronize_session=False)
+    for row in activity:
+        db.session.add(
+            AccountBalance(
+                company_id=company_id,
+                account_id=row["account_id"],
+                debit_cents=row["debit_cents"],
+                credit_cents=row["credit_cents"],
+            )
+        )
+    db.session.flush()
+    return len(activity)
+
+
+def verify_account_balances(company_id):
+    expected = {row["account_id"]: row for row in journal_activity_by_account(company_id)}
+    stored = {row["account_id"]: row for row in account_balance_rows(company_id)}
+    account_codes = dict(
+        db.session.query(LedgerAccount.id, LedgerAccount.code).filter(LedgerAccount.company_id == company_id).all()
+    )
+
+    drift = []
+    empty_row = {"debit_cents": 0, "credit_cents": 0}
+    for account_id in sorted(set(expected) | set(stored)):
+        expected_row = expected.get(account_id, empty_row)
+        stored_row = stored.get(account_id, empty_row)
+        if (
+            expected_row["debit_cents"] == stored_row["debit_cents"]
+            and expected_row["credit_cents"] == stored_row["credit_cents"]
+        ):
+            continue
+        drift.append(
+            {
+                "account_id": account_id,
+                "account_code": account_codes.get(account_id, ""),
+                "stored_debit": from_cents(stored_row["debit_cents"]),
+                "stored_credit": from_cents(stored_row["credit_cents"]),
+                "expected_debit": from_cents(expected_row["debit_cents"]),
+                "expected_credit": from_cents(expected_row["credit_cents"]),
+            }
+        )
+
+    return {
+        "company_id": company_id,
+        "accounts_checked": len(set(expected) | set(stored)),
+        "in_sync": not drift,
+        "drift": drift,
+    }
+
+
+def _merge_balance_rows(*row_sets):
+    merged = {}
+    for rows in row_sets:
+        for row in rows:
+            bucket = merged.setdefault(
+                row["account_id"],
+                {"account_id": row["account_id"], "debit_cents": 0, "credit_cents": 0},
+            )
+            bucket["debit_cents"] += row["debit_cents"]
+            bucket["credit_cents"] += row["credit_cents"]
+    return list(merged.values())
+
+
+def latest_period_end(company_id, on_or_before=None):
+    query = db.session.query(func.max(AccountPeriodBalance.period_end)).filter(
+        AccountPeriodBalance.company_id == company_id
+    )
+    if on_or_before is not None:
+        query = query.filter(AccountPeriodBalance.period_end <= on_or_before)
+    return query.scalar()
+
+
+def period_balance_rows(company_id, period_end):
+    rows = (
+        db.session.query(
+            AccountPeriodBalance.account_id,
+            AccountPeriodBalance.debit_cents,
+            AccountPeriodBalance.credit_cents,
+        )
+        .filter(AccountPeriodBalance.company_id == company_id, AccountPeriodBalance.period_end == period_end)
+        .all()
+    )
+    return _cents_rows(rows)
+
+
+def account_balance_rows_as_of(company_id, as_of):
+    # Start from the nearest closed month and only scan the lines posted after it.
+    snapshot_end = latest_period_end(company_id, on_or_before=as_of)
+    if snapshot_end is None:
+        return journal_activity_by_account(company_id, through=as_of)
+    return _merge_balance_rows(
+        period_balance_rows(company_id, snapshot_end),
+        journal_activity_by_account(company_id, after=snapshot_end, through=as_of),
+    )
+
+
+def invalidate_period_balances(company_id, entry_date):
+    return (
+        AccountPeriodBalance.query.filter(
+            AccountPeriodBalance.company_id == company_id,
+            AccountPeriodBalance.period_end >= entry_date,
+        ).delete(synchronize_session=False)
+    )
+
+
+def close_balance_periods(company_id, through):
+    if through != _month_end(through):
+        through = through.replace(day=1) - datetime.timedelta(days=1)
+    previous_end = latest_period_end(company_id)
+    if previous_end is None:
+        first_entry_date = (
+            db.session.query(func.min(JournalEntry.entry_date))
+            .filter(JournalEntry.company_id == company_id, JournalEntry.status.in_(POSTED_STATUSES))
+            .scalar()
+        )
+        if first_entry_date is None:
+            return []
+        period_end = _month_end(first_entry_date)
+        running = []
+    else:
+        period_end = _month_end(previous_end + datetime.timedelta(days=1))
+        running = period_balance_rows(company_id, previous_end)
+
+    closed = []
+    while period_end <= through:
+        running = _merge_balance_rows(
+            running,
+            journal_activity_by_account(company_id, after=previous_end, through=period_end),
+        )
+        for row in running:
+            db.session.add(
+                AccountPeriodBalance(
+                    company_id=company_id,
+                    account_id=row["account_id"],
+                    period_end=period_end,
+                    debit_cents=row["debit_cents"],
+                    credit_cents=row["credit_cents"],
+                )
+            )
+        closed.append(period_end)
+        previous_end = period_end
+        period_end = _month_end(period_end + datetime.timedelta(days=1))
+
+    if closed:
+        db.session.flush()
+    return closed
+
+
+def companies_missing_balances():
+    balanced_companies = select(AccountBalance.company_id).distinct()
+    rows = (
+        db.session.query(JournalEntry.company_id)
+        .filter(~JournalEntry.company_id.in_(balanced_companies))
+        .distinct()
+        .all()
+    )
+    return [company_id for (company_id,) in rows]
+
+
+def backfill_account_balances():
+    company_ids = companies_missing_balances()
+    for company_id in company_ids:
+        rebuild_account_balances(company_id)
+    db.session.commit()
+    return company_ids
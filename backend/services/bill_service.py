@@ -1,13 +1,20 @@
 from extensions import db
 from models import VendorBill, VendorBillItem, VendorPayment, VendorProfile, Company
 from services.common import (
+    apply_remittance,
     generate_document_number,
     normalize_document_items,
     refresh_bill_status,
+    record_document_payment,
+    document_page,
+    insert_documents,
+    line_items_by_document,
     bill_items_for,
     serialize_line_items,
 )
-from services.accounting_engine import post_operational_entry
+from services.accounting_engine import post_journal_entries_batch, post_operational_entry
+from services.sequence_service import reserve_document_numbers
+from services.ledger_state_service import bump_ledger_version
 from utils import parse_iso_date, parse_money, today_utc_date, iso_date
 import datetime
 
@@ -37,7 +44,7 @@ def get_or_create_vendor_profile(company, vendor_name, defaults=None):
     db.session.flush()
     return vendor
 
-def create_bill(user, company, data):
+def _bill_fields(data):
     vendor_name = (data.get("vendor_name") or "").strip()
     if not vendor_name:
         raise ValueError("vendor_name is required")
@@ -53,34 +60,40 @@ def create_bill(user, company, data):
 
     tax_amount = round(subtotal * (tax_rate / 100), 2)
     total_amount = round(subtotal + tax_amount, 2)
-    get_or_create_vendor_profile(
-        company,
-        vendor_name,
-        {
-            "email": data.get("vendor_email"),
-            "tax_id": data.get("vendor_tax_id"),
-            "default_payment_rail": data.get("default_payment_rail"),
-            "is_1099_eligible": data.get("is_1099_eligible"),
-            "tax_form_type": data.get("tax_form_type"),
-            "tin_status": data.get("tin_status"),
-        },
-    )
+    fields = {
+        "vendor_name": vendor_name,
+        "status": requested_status,
+        "issue_date": issue_date,
+        "due_date": due_date,
+        "subtotal": subtotal,
+        "tax_rate": tax_rate,
+        "tax_amount": tax_amount,
+        "total_amount": total_amount,
+        "balance_due": total_amount,
+        "notes": (data.get("notes") or "").strip() or None,
+    }
+    return fields, items
+
+def _vendor_profile_defaults(data):
+    return {
+        "email": data.get("vendor_email"),
+        "tax_id": data.get("vendor_tax_id"),
+        "default_payment_rail": data.get("default_payment_rail"),
+        "is_1099_eligible": data.get("is_1099_eligible"),
+        "tax_form_type": data.get("tax_form_type"),
+        "tin_status": data.get("tin_status"),
+    }
+
+def create_bill(user, company, data):
+    fields, items = _bill_fields(data)
+    get_or_create_vendor_profile(company, fields["vendor_name"], _vendor_profile_defaults(data))
     bill = VendorBill(
         org_id=user.org_id,
         company_id=company.id,
         bill_number=generate_document_number(VendorBill, company.id, "BILL"),
-        vendor_name=vendor_name,
-        status=requested_status,
-        issue_date=issue_date,
-        due_date=due_date,
-        subtotal=subtotal,
-        tax_rate=tax_rate,
-        tax_amount=tax_amount,
-        total_amount=total_amount,
-        balance_due=total_amount,
-        notes=(data.get("notes") or "").strip() or None,
         created_by=user.id,
-        approved_at=datetime.datetime.now(datetime.UTC) if requested_status == "approved" else None,
+        approved_at=datetime.datetime.now(datetime.UTC) if fields["status"] == "approved" else None,
+        **fields,
     )
     db.session.add(bill)
     db.session.flush()
@@ -97,19 +110,90 @@ def create_bill(user, company, data):
         )
 
     refresh_bill_status(bill)
-    if requested_status == "approved":
+    if fields["status"] == "approved":
         post_bill_journal(bill, user)
 
+    bump_ledger_version(company.id)
     return bill
 
-def post_bill_journal(bill, user):
+def import_bills(user, company, payloads):
+    results = []
+    prepared = []
+    for index, payload in enumerate(payloads, start=1):
+        payload = payload if isinstance(payload, dict) else {}
+        try:
+            prepared.append((*_bill_fields(payload), payload))
+            results.append({"index": index, "id": None, "bill_number": None, "error": None})
+        except ValueError as exc:
+            results.append({"index": index, "id": None, "bill_number": None, "error": str(exc)})
+    if not results or any(result["error"] for result in results):
+        return False, results
+
+    # Vendor profiles are resolved once per vendor rather than once per bill.
+    first_payloads = {}
+    for fields, _, payload in prepared:
+        first_payloads.setdefault(fields["vendor_name"], payload)
+    for vendor_name, payload in first_payloads.items():
+        get_or_create_vendor_profile(company, vendor_name, _vendor_profile_defaults(payload))
+
+    numbers = reserve_document_numbers(VendorBill, company.id, "BILL", len(prepared))
+    now = datetime.datetime.now(datetime.UTC)
+    rows = [
+        {
+            **fields,
+            "org_id": user.org_id,
+            "company_id": company.id,
+            "bill_number": number,
+            "created_by": user.id,
+            "created_at": now,
+            "approved_at": now if fields["status"] == "approved" else None,
+        }
+        for (fields, _, _), number in zip(prepared, numbers)
+    ]
+    bill_ids = insert_documents(
+        VendorBill, VendorBillItem, "bill_id", "bill_number", rows, [items for _, items, _ in prepared]
+    )
+
+    # Journals follow the requested status, exactly as create_bill posts them.
+    approved = [position for position, (fields, _, _) in enumerate(prepared) if fields["status"] == "approved"]
+    if approved:
+        posted, journal_results = post_journal_entries_batch(
+            company,
+            user,
+            [_bill_import_entry(rows[position]) for position in approved],
+            source_type="bill_issue",
+            source_ids=[bill_ids[position] for position in approved],
+        )
+        if not posted:
+            for position, journal_result in zip(approved, journal_results):
+                results[position]["error"] = journal_result["diagnostics"]["error"]
+            return False, results
+
+    bump_ledger_version(company.id)
+    for result, bill_id, row in zip(results, bill_ids, rows):
+        result["id"] = bill_id
+        result["bill_number"] = row["bill_number"]
+    return True, results
+
+def _bill_import_entry(row):
+    return {
+        "entry_date": row["issue_date"],
+        "memo": f"Vendor bill {row['bill_number']} approved",
+        "reference": row["bill_number"],
+        "lines": _bill_journal_lines(row["vendor_name"], row["subtotal"], row["tax_amount"], row["total_amount"]),
+    }
+
+def _bill_journal_lines(vendor_name, subtotal, tax_amount, total_amount):
     journal_lines = [
-        {"account_code": "5200", "debit": float(bill.subtotal or 0), "credit": 0, "description": bill.vendor_name},
-        {"account_code": "2000", "debit": 0, "credit": float(bill.total_amount or 0), "description": bill.vendor_name},
+        {"account_code": "5200", "debit": float(subtotal or 0), "credit": 0, "description": vendor_name},
+        {"account_code": "2000", "debit": 0, "credit": float(total_amount or 0), "description": vendor_name},
     ]
-    if float(bill.tax_amount or 0) > 0:
-        journal_lines.insert(1, {"account_code": "1250", "debit": float(bill.tax_amount or 0), "credit": 0, "description": bill.vendor_name})
-    
+    if float(tax_amount or 0) > 0:
+        journal_lines.insert(1, {"account_code": "1250", "debit": float(tax_amount or 0), "credit": 0, "description": vendor_name})
+    return journal_lines
+
+def post_bill_journal(bill, user):
+    journal_lines = _bill_journal_lines(bill.vendor_name, bill.subtotal, bill.tax_amount, bill.total_amount)
     post_operational_entry(
         db.session.get(Company, bill.company_id),
         user,
@@ -141,10 +225,24 @@ def apply_vendor_payment(bill, amount, payment_date, reference="", source="manua
     )
     db.session.add(payment)
     db.session.flush()
+    record_document_payment(bill, payment.amount)
     refresh_bill_status(bill)
+    bump_ledger_version(bill.company_id)
     return payment
 
-def serialize_bill(bill):
+def apply_vendor_remittance(company, payloads):
+    return apply_remittance(
+        company,
+        payloads,
+        VendorBill,
+        VendorPayment,
+        "bill_id",
+        "bill_number",
+        ("approved", "partial", "overdue"),
+        refresh_bill_status,
+    )
+
+def serialize_bill(bill, items=None):
     paid_amount = round(float(bill.total_amount or 0) - float(bill.balance_due or 0), 2)
     return {
         "id": bill.id,
@@ -161,5 +259,15 @@ def serialize_bill(bill):
         "paid_amount": paid_amount,
         "notes": bill.notes or "",
         "overdue": bill.status == "overdue",
-        "items": serialize_line_items(bill_items_for(bill.id)),
+        "items": serialize_line_items(bill_items_for(bill.id) if items is None else items),
+    }
+
+def list_bill_page(company, filters, after=None, limit=None):
+    bills, next_cursor = document_page(
+        VendorBill, VendorBill.vendor_name, company.id, filters, after=after, limit=limit
+    )
+    items = line_items_by_document(VendorBillItem, VendorBillItem.bill_id, [bill.id for bill in bills])
+    return {
+        "items": [serialize_bill(bill, items[bill.id]) for bill in bills],
+        "next_cursor": next_cursor,
     }
@@ -0,0 +1,183 @@
+from collections import defaultdict
+
+from sqlalchemy import func, insert
+
+from constants import CASH_FLOW_INDEX_VERSION
+from extensions import db
+from models import CashFlowEntry, CompanyLedgerState, JournalEntry, JournalLine, LedgerAccount
+from services.ledger_state_service import mark_cash_flow_indexed
+from shared.accounting_core import from_cents, to_cents
+from utils import iso_date
+
+
+POSTED_STATUSES = ("posted", "reversed")
+CASH_FLOW_SECTIONS = ("operating", "investing", "financing")
+
+
+def is_cash_account(account):
+    return str(account["code"] or "").strip() == "1000" or "cash" in str(account["name"] or "").lower()
+
+
+def classify_cash_flow(counterparty_accounts):
+    for account in counterparty_accounts:
+        category = str(account["category"] or "").strip().lower()
+        subtype = str(account["subtype"] or "").strip().lower()
+        name = str(account["name"] or "").strip().lower()
+        if category == "equity":
+            return "financing"
+        if category == "liability" and subtype == "non-current":
+            return "financing"
+        if category == "liability" and "loan" in name:
+            return "financing"
+        if category == "asset" and subtype == "non-current":
+            return "investing"
+    return "operating"
+
+
+def cash_flow_row(company_id, journal_entry_id, entry_date, lines, account_lookup):
+    cash_delta_cents = 0
+    counterparty_accounts = []
+    for line in lines:
+        account = account_lookup.get(line["account_id"])
+        if account and is_cash_account(account):
+            cash_delta_cents += to_cents(line["debit"]) - to_cents(line["credit"])
+        elif account:
+            counterparty_accounts.append(account)
+    if not cash_delta_cents:
+        return None
+    return {
+        "company_id": company_id,
+        "journal_entry_id": journal_entry_id,
+        "entry_date": entry_date,
+        "section": classify_cash_flow(counterparty_accounts),
+        "cash_delta_cents": cash_delta_cents,
+    }
+
+
+def record_cash_flow_entries(rows):
+    rows = [row for row in rows if row]
+    if rows:
+        db.session.execute(insert(CashFlowEntry), rows)
+    return len(rows)
+
+
+def _account_lookup(company_id):
+    rows = (
+        db.session.query(
+            LedgerAccount.id,
+            LedgerAccount.code,
+            LedgerAccount.name,
+            LedgerAccount.category,
+            LedgerAccount.subtype,
+        )
+        .filter(LedgerAccount.company_id == company_id)
+        .all()
+    )
+    return {
+        account_id: {"id": account_id, "code": code, "name": name, "category": category, "subtype": subtype or ""}
+        for account_id, code, name, category, subtype in rows
+    }
+
+
+def rebuild_cash_flow_entries(company_id):
+    account_lookup = _account_lookup(company_id)
+    line_rows = (
+        db.session.query(
+            JournalEntry.id,
+            JournalEntry.entry_date,
+            JournalLine.account_id,
+            JournalLine.debit,
+            JournalLine.credit,
+        )
+        .join(JournalLine, JournalLine.journal_entry_id == JournalEntry.id)
+        .filter(JournalEntry.company_id == company_id, JournalEntry.status.in_(POSTED_STATUSES))
+        .order_by(JournalEntry.id.asc())
+        .all()
+    )
+    entries = defaultdict(list)
+    entry_dates = {}
+    for entry_id, entry_date, account_id, debit, credit in line_rows:
+        entries[entry_id].append({"account_id": account_id, "debit": debit, "credit": credit})
+        entry_dates[entry_id] = entry_date
+
+    CashFlowEntry.query.filter_by(company_id=company_id).delete(synchronize_session=False)
+    created = record_cash_flow_entries(
+        cash_flow_row(company_id, entry_id, entry_dates[entry_id], lines, account_lookup)
+        for entry_id, lines in entries.items()
+    )
+    mark_cash_flow_indexed(company_id, CASH_FLOW_INDEX_VERSION)
+    return created
+
+
+def companies_missing_cash_flow_index():
+    indexed_companies = db.session.query(CompanyLedgerState.company_id).filter(
+        CompanyLedgerState.cash_flow_version >= CASH_FLOW_INDEX_VERSION
+    )
+    rows = (
+        db.session.query(JournalEntry.company_id)
+        .filter(~JournalEntry.company_id.in_(indexed_companies))
+        .distinct()
+        .all()
+    )
+    return [company_id for (company_id,) in rows]
+
+
+def backfill_cash_flow_entries():
+    company_ids = companies_missing_cash_flow_index()
+    for company_id in company_ids:
+        rebuild_cash_flow_entries(company_id)
+    db.session.commit()
+    return company_ids
+
+
+def _cash_flow_filters(company_id, start_date=None, end_date=None):
+    filters = [CashFlowEntry.company_id == company_id]
+    if start_date is not None:
+        filters.append(CashFlowEntry.entry_date >= start_date)
+    if end_date is not None:
+        filters.append(CashFlowEntry.entry_date <= end_date)
+    return filters
+
+
+def cash_flow_section_totals(company_id, start_date=None, end_date=None):
+    rows = (
+        db.session.query(CashFlowEntry.section, func.coalesce(func.sum(CashFlowEntry.cash_delta_cents), 0))
+        .filter(*_cash_flow_filters(company_id, start_date, end_date))
+        .group_by(CashFlowEntry.section)
+        .all()
+    )
+    totals = {section: 0 for section in CASH_FLOW_SECTIONS}
+    for section, cents in rows:
+        totals[section] = int(cents or 0)
+    return totals
+
+
+def cash_flow_items(company_id, start_date=None, end_date=None):
+    rows = (
+        db.session.query(
+            CashFlowEntry.section,
+            CashFlowEntry.cash_delta_cents,
+            JournalEntry.id,
+            JournalEntry.entry_number,
+            JournalEntry.entry_date,
+            JournalEntry.memo,
+            JournalEntry.reference,
+        )
+        .join(JournalEntry, JournalEntry.id == CashFlowEntry.journal_entry_id)
+        .filter(*_cash_flow_filters(company_id, start_date, end_date))
+        .order_by(CashFlowEntry.entry_date.asc(), CashFlowEntry.journal_entry_id.asc())
+        .all()
+    )
+    sections = {section: [] for section in CASH_FLOW_SECTIONS}
+    for section, cents, entry_id, entry_number, entry_date, memo, reference in rows:
+        sections[section].append(
+            {
+                "entry_id": entry_id,
+                "entry_number": entry_number,
+                "entry_date": iso_date(entry_date),
+                "memo": memo,
+                "reference": reference or "",
+                "amount": from_cents(cents),
+            }
+        )
+    return sections
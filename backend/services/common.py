@@ -1,6 +1,22 @@
-from utils import parse_money, today_utc_date
+import csv
+import io
+
+from sqlalchemy import and_, bindparam, func, insert, or_, select, update
+
+from utils import iso_date, parse_iso_date, parse_money, today_utc_date
 from models import Invoice, VendorBill, CustomerPayment, VendorPayment, InvoiceItem, VendorBillItem
 from extensions import db
+from services.sequence_service import reserve_document_numbers
+from services.ledger_state_service import bump_ledger_version
+
+# Open status each document type leaves when its due date passes without any payment.
+OVERDUE_SWEEPS = ((Invoice, "sent"), (VendorBill, "approved"))
+
+DOCUMENT_CURSOR_FIELDS = ("issue_date", "id")
+
+# CSV imports carry one line item per row; rows sharing a document_ref become one document.
+IMPORT_ITEM_FIELDS = ("description", "quantity", "unit_price")
+REMITTANCE_LOOKUP_CHUNK = 500
 
 def normalize_document_items(items, document_name):
     if not isinstance(items, list) or not items:
@@ -31,22 +47,210 @@ def normalize_document_items(items, document_name):
 
     return normalized_items, round(subtotal, 2)
 
+def _csv_rows(stream):
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+    try:
+        rows = list(reader)
+    except csv.Error as exc:
+        raise ValueError(f"invalid csv: {exc}") from exc
+    for row_number, row in enumerate(rows, start=2):
+        row = {
+            str(key).strip().lower(): str(value or "").strip()
+            for key, value in row.items()
+            if key is not None and str(value or "").strip()
+        }
+        if row:
+            yield row_number, row
+
+def document_import_payloads(stream):
+    payloads = {}
+    for row_number, row in _csv_rows(stream):
+        document_ref = row.pop("document_ref", None) or f"row {row_number}"
+        payload = payloads.get(document_ref)
+        if payload is None:
+            payload = {key: value for key, value in row.items() if key not in IMPORT_ITEM_FIELDS}
+            payload["items"] = []
+            payloads[document_ref] = payload
+        payload["items"].append({key: row[key] for key in IMPORT_ITEM_FIELDS if key in row})
+    return list(payloads.values())
+
+def remittance_payloads(stream):
+    return [row for _, row in _csv_rows(stream)]
+
 def generate_document_number(model_class, company_id, prefix):
-    next_number = model_class.query.filter_by(company_id=company_id).count() + 1
-    return f"{prefix}-{int(company_id):03d}-{next_number:05d}"
+    return reserve_document_numbers(model_class, company_id, prefix, 1)[0]
+
+def insert_documents(model, item_model, document_key, number_key, rows, items_by_row):
+    # One multi-row INSERT per table; statuses a fresh document would settle into are applied
+    # up front so the rows match what create_invoice/create_bill leave behind.
+    open_status = dict(OVERDUE_SWEEPS)[model]
+    today = today_utc_date()
+    for row in rows:
+        if row["total_amount"] <= 0.009:
+            row["status"], row["balance_due"] = "paid", 0.0
+        elif row["status"] == open_status and row["due_date"] < today:
+            row["status"] = "overdue"
+    # Ids are matched back by document number: asking SQLite for RETURNING rows in parameter
+    # order would fall back to one INSERT per document.
+    number_column = getattr(model, number_key)
+    ids_by_number = dict(
+        db.session.execute(insert(model).returning(number_column, model.id), rows).tuples().all()
+    )
+    document_ids = [ids_by_number[row[number_key]] for row in rows]
+    item_rows = [
+        {document_key: document_id, **item}
+        for document_id, items in zip(document_ids, items_by_row)
+        for item in items
+    ]
+    if item_rows:
+        db.session.execute(insert(item_model), item_rows)
+    return document_ids
 
-def total_customer_payments(invoice_id):
-    rows = CustomerPayment.query.filter_by(invoice_id=invoice_id).all()
-    return round(sum(float(row.amount or 0) for row in rows), 2)
+def apply_remittance(
+    company, payloads, model, payment_model, document_key, number_key, open_statuses, refresh_status
+):
+    # Open documents are indexed by number once, and running balances are tracked in memory so
+    # several rows against one document are checked against each other before anything is written.
+    numbers = {str((payload or {}).get(number_key) or "").strip() for payload in payloads}
+    numbers.discard("")
+    number_column = getattr(model, number_key)
+    open_documents = {}
+    sorted_numbers = sorted(numbers)
+    for start in range(0, len(sorted_numbers), REMITTANCE_LOOKUP_CHUNK):
+        chunk = sorted_numbers[start:start + REMITTANCE_LOOKUP_CHUNK]
+        for document in model.query.filter(
+            model.company_id == company.id,
+            model.status.in_(open_statuses),
+            number_column.in_(chunk),
+        ):
+            open_documents[getattr(document, number_key)] = document
 
-def total_vendor_payments(bill_id):
-    rows = VendorPayment.query.filter_by(bill_id=bill_id).all()
-    return round(sum(float(row.amount or 0) for row in rows), 2)
+    remaining = {}
+    applied = {}
+    payment_rows = []
+    results = []
+    today = today_utc_date()
+    for index, payload in enumerate(payloads, start=1):
+        payload = payload if isinstance(payload, dict) else {}
+        number = str(payload.get(number_key) or "").strip()
+        result = {
+            "index": index,
+            number_key: number,
+            "id": None,
+            "amount": None,
+            "balance_due": None,
+            "error": None,
+        }
+        results.append(result)
+        try:
+            amount = parse_money(payload.get("amount"), "amount")
+            payment_date = parse_iso_date(payload.get("payment_date"), "payment_date", today)
+        except ValueError as exc:
+            result["error"] = str(exc)
+            continue
+        document = open_documents.get(number)
+        if document is None:
+            result["error"] = f"no open document numbered {number}" if number else f"{number_key} is required"
+            continue
+        balance = remaining.setdefault(document.id, round(float(document.balance_due or 0), 2))
+        if amount <= 0:
+            result["error"] = "payment amount must be greater than 0"
+            continue
+        if amount - balance > 0.01:
+            result["error"] = f"payment exceeds {number_key.removesuffix('_number')} balance"
+            continue
+
+        remaining[document.id] = round(balance - amount, 2)
+        applied[document.id] = round(applied.get(document.id, 0.0) + amount, 2)
+        result["id"] = document.id
+        result["amount"] = amount
+        payment_rows.append(
+            {
+                "org_id": document.org_id,
+                "company_id": document.company_id,
+                document_key: document.id,
+                "amount": amount,
+                "reference": str(payload.get("reference") or "").strip() or None,
+                "source": "remittance",
+                "payment_date": payment_date,
+            }
+        )
+
+    if payment_rows:
+        db.session.execute(insert(payment_model), payment_rows)
+        # One executemany increments every touched document in SQL, as record_document_payment does.
+        table = model.__table__
+        db.session.execute(
+            update(table)
+            .where(table.c.id == bindparam("document_id"))
+            .values(paid_total=func.round(table.c.paid_total + bindparam("paid"), 2)),
+            [{"document_id": document_id, "paid": paid} for document_id, paid in applied.items()],
+        )
+        document_ids = sorted(applied)
+        documents = []
+        for start in range(0, len(document_ids), REMITTANCE_LOOKUP_CHUNK):
+            chunk = document_ids[start:start + REMITTANCE_LOOKUP_CHUNK]
+            documents.extend(model.query.filter(model.id.in_(chunk)).populate_existing())
+        for document in documents:
+            refresh_status(document)
+        db.session.flush()
+        bump_ledger_version(company.id)
+        balances = {document.id: round(float(document.balance_due or 0), 2) for document in documents}
+        for result in results:
+            if result["id"] is not None:
+                result["balance_due"] = balances[result["id"]]
+    return len(payment_rows), results
+
+def record_document_payment(document, amount):
+    # Increment in SQL so concurrent payments against one document never overwrite each other.
+    model = type(document)
+    db.session.execute(
+        update(model)
+        .where(model.id == document.id)
+        .values(paid_total=func.round(model.paid_total + round(amount, 2), 2))
+        .execution_options(synchronize_session=False)
+    )
+    db.session.refresh(document, attribute_names=["paid_total"])
+
+def _payment_totals(payment_model, document_column, document_ids=None):
+    query = db.session.query(document_column, func.sum(payment_model.amount)).group_by(document_column)
+    if document_ids is not None:
+        query = query.filter(document_column.in_(document_ids))
+    return {document_id: round(float(total or 0), 2) for document_id, total in query.all()}
+
+def reconcile_document_payment_totals(company_id=None, only_missing=False):
+    # One grouped query per payment table; only_missing limits the pass to documents that have
+    # payments but were created before paid_total existed.
+    fixed = []
+    for model, payment_model, document_column, refresh_status in (
+        (Invoice, CustomerPayment, CustomerPayment.invoice_id, refresh_invoice_status),
+        (VendorBill, VendorPayment, VendorPayment.bill_id, refresh_bill_status),
+    ):
+        query = model.query
+        if company_id is not None:
+            query = query.filter(model.company_id == company_id)
+        paid_document_ids = select(document_column)
+        if only_missing:
+            query = query.filter(model.paid_total == 0, model.id.in_(paid_document_ids))
+        else:
+            query = query.filter((model.paid_total != 0) | model.id.in_(paid_document_ids))
+        documents = query.all()
+        totals = _payment_totals(payment_model, document_column, [document.id for document in documents])
+        for document in documents:
+            expected = totals.get(document.id, 0.0)
+            if round(float(document.paid_total or 0), 2) == expected:
+                continue
+            document.paid_total = expected
+            refresh_status(document)
+            fixed.append(document)
+    if fixed:
+        db.session.flush()
+    return fixed
 
 def refresh_invoice_status(invoice):
     previous_status = invoice.status
     previous_balance = round(float(invoice.balance_due or 0), 2)
-    payments_total = total_customer_payments(invoice.id)
+    payments_total = round(float(invoice.paid_total or 0), 2)
     invoice.balance_due = round(max(0.0, float(invoice.total_amount or 0) - payments_total), 2)
     today = today_utc_date()
 
@@ -70,7 +274,7 @@ def refresh_invoice_status(invoice):
 def refresh_bill_status(bill):
     previous_status = bill.status
     previous_balance = round(float(bill.balance_due or 0), 2)
-    payments_total = total_vendor_payments(bill.id)
+    payments_total = round(float(bill.paid_total or 0), 2)
     bill.balance_due = round(max(0.0, float(bill.total_amount or 0) - payments_total), 2)
     today = today_utc_date()
 
@@ -91,20 +295,87 @@ def refresh_bill_status(bill):
 
     return previous_status != bill.status or previous_balance != bill.balance_due
 
+def sweep_overdue_documents(company_id, today=None):
+    # One UPDATE per document table moves every open document past its due date; the
+    # (company_id, status, due_date) indexes keep it from touching anything else.
+    today = today or today_utc_date()
+    moved = 0
+    for model, open_status in OVERDUE_SWEEPS:
+        result = db.session.execute(
+            update(model)
+            .where(model.company_id == company_id, model.status == open_status, model.due_date < today)
+            .values(status="overdue")
+        )
+        moved += result.rowcount
+    if moved:
+        bump_ledger_version(company_id)
+    return moved
+
 def refresh_finance_documents(company_id):
-    dirty = False
+    # Reads trust the stored status; the scheduled sweep-overdue command moves past-due documents.
     invoices = Invoice.query.filter_by(company_id=company_id).all()
     bills = VendorBill.query.filter_by(company_id=company_id).all()
+    return invoices, bills
 
-    for invoice in invoices:
-        dirty = refresh_invoice_status(invoice) or dirty
-    for bill in bills:
-        dirty = refresh_bill_status(bill) or dirty
+def parse_document_filters(args, party_field):
+    statuses = [status.strip().lower() for status in (args.get("status") or "").split(",") if status.strip()]
+    amounts = {}
+    for field in ("min_amount", "max_amount"):
+        raw_value = args.get(field)
+        amounts[field] = None if raw_value in {None, ""} else parse_money(raw_value, field)
+    return {
+        "statuses": statuses,
+        "party": (args.get(party_field) or "").strip(),
+        "start_date": parse_iso_date(args.get("start_date"), "start_date"),
+        "end_date": parse_iso_date(args.get("end_date"), "end_date"),
+        **amounts,
+    }
 
-    if dirty:
-        db.session.commit()
+def document_page(model, party_column, company_id, filters, after=None, limit=None):
+    # Keyset order is (issue_date, id), which the (company_id, issue_date) index already serves,
+    # so a page costs the same however many documents come before it.
+    query = model.query.filter(model.company_id == company_id)
+    if filters["statuses"]:
+        query = query.filter(model.status.in_(filters["statuses"]))
+    if filters["party"]:
+        query = query.filter(func.lower(party_column).contains(filters["party"].lower(), autoescape=True))
+    if filters["start_date"] is not None:
+        query = query.filter(model.issue_date >= filters["start_date"])
+    if filters["end_date"] is not None:
+        query = query.filter(model.issue_date <= filters["end_date"])
+    if filters["min_amount"] is not None:
+        query = query.filter(model.total_amount >= filters["min_amount"])
+    if filters["max_amount"] is not None:
+        query = query.filter(model.total_amount <= filters["max_amount"])
+    if after is not None:
+        issue_date, document_id = after
+        query = query.filter(
+            or_(model.issue_date > issue_date, and_(model.issue_date == issue_date, model.id > document_id))
+        )
+    query = query.order_by(model.issue_date.asc(), model.id.asc())
+    if limit is None:
+        return query.all(), None
 
-    return invoices, bills
+    documents = query.limit(limit + 1).all()
+    if len(documents) <= limit:
+        return documents, None
+    documents = documents[:limit]
+    last = documents[-1]
+    return documents, f"{iso_date(last.issue_date)},{last.id}"
+
+def line_items_by_document(item_model, document_column, document_ids):
+    # One query for a whole page of documents instead of one per document.
+    grouped = {document_id: [] for document_id in document_ids}
+    if not document_ids:
+        return grouped
+    items = (
+        item_model.query.filter(document_column.in_(document_ids))
+        .order_by(document_column.asc(), item_model.id.asc())
+        .all()
+    )
+    for item in items:
+        grouped[getattr(item, document_column.key)].append(item)
+    return grouped
 
 def invoice_items_for(invoice_id):
     return InvoiceItem.query.filter_by(invoice_id=invoice_id).order_by(InvoiceItem.id.asc()).all()
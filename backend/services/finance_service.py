@@ -2,6 +2,7 @@ import os
 from extensions import db
 from models import TaxProfile, CustomerPayment, VendorPayment, BankFeedTransaction
 from services.common import refresh_finance_documents
+from services.ledger_context import ledger_cached
 from services.statement_service import build_financial_statements
 from utils import today_utc_date, parse_money
 
@@ -16,6 +17,9 @@ def _statement_item_amount(section, code):
             return round(float(item.get("amount") or 0), 2)
     return 0.0
 
+def _finance_documents(company):
+    return ledger_cached(company.id, "finance_documents", lambda: refresh_finance_documents(company.id))
+
 def get_or_create_tax_profile(company):
     profile = TaxProfile.query.filter_by(company_id=company.id).first()
     if profile:
@@ -38,9 +42,9 @@ def get_or_create_tax_profile(company):
     return profile
 
 def calculate_finance_summary(company):
-    invoices, bills = refresh_finance_documents(company.id)
+    invoices, bills = _finance_documents(company)
     today = today_utc_date()
-    statements = build_financial_statements(company)
+    statements = build_financial_statements(company, include=("profit_or_loss", "financial_position", "health"))
     profit_or_loss = statements["profit_or_loss"]
     financial_position = statements["financial_position"]
     health = statements["health"]
@@ -139,7 +143,7 @@ def calculate_finance_summary(company):
 
 def calculate_tax_summary(company, profile=None):
     profile = profile or get_or_create_tax_profile(company)
-    invoices, bills = refresh_finance_documents(company.id)
+    invoices, bills = _finance_documents(company)
     sales_tax_collected = sum(invoice.tax_amount for invoice in invoices if invoice.status not in {"draft", "cancelled"})
     purchase_tax_credit = sum(bill.tax_amount for bill in bills if bill.status not in {"draft", "cancelled"})
     taxable_profit = sum(invoice.subtotal for invoice in invoices if invoice.status not in {"draft", "cancelled"}) - sum(
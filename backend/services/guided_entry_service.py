@@ -1,11 +1,20 @@
 from __future__ import annotations
 
 from extensions import db
-from models import CompanyPartner, LedgerAccount
-from services.accounting_engine import post_journal_entry, seed_chart_of_accounts, serialize_journal_entry
+from models import CompanyPartner
+from services.accounting_engine import (
+    ensure_company_accounts,
+    post_journal_entry,
+    seed_chart_of_accounts,
+    serialize_journal_entry,
+)
+from services.ledger_state_service import guided_seeded_version, mark_chart_seeded
 from utils import parse_money
 
 
+# Bump whenever GUIDED_ACCOUNT_DEFINITIONS changes so seeded companies pick up the new accounts.
+GUIDED_ACCOUNTS_VERSION = 1
+
 GUIDED_ACCOUNT_DEFINITIONS = [
     {"code": "1210", "name": "Raw Materials Inventory", "category": "asset", "subtype": "current", "normal_balance": "debit"},
     {"code": "1220", "name": "Work in Progress Inventory", "category": "asset", "subtype": "current", "normal_balance": "debit"},
@@ -30,68 +39,48 @@ def _money(value, field_name):
     return parse_money(value, field_name)
 
 
-def _ensure_account(company, definition):
-    account = LedgerAccount.query.filter_by(company_id=company.id, code=definition["code"]).first()
-    if account:
-        return account
-
-    account = LedgerAccount(
-        org_id=company.org_id,
-        company_id=company.id,
-        code=definition["code"],
-        name=definition["name"],
-        category=definition["category"],
-        subtype=definition.get("subtype"),
-        normal_balance=definition.get("normal_balance", "debit"),
-        description=definition.get("description"),
-        is_system=False,
-        is_active=True,
-    )
-    db.session.add(account)
-    db.session.flush()
-    return account
-
-
 def _ensure_partner_accounts(company):
     partners = CompanyPartner.query.filter_by(company_id=company.id).order_by(CompanyPartner.display_order.asc()).all()
+    definitions = []
     result = []
     for index, partner in enumerate(partners, start=1):
         capital_code = f"30{index + 10:02d}"
         drawings_code = f"32{index + 10:02d}"
-        capital = _ensure_account(
-            company,
+        definitions.append(
             {
                 "code": capital_code,
                 "name": f"{partner.name} Capital",
                 "category": "equity",
                 "subtype": "equity",
                 "normal_balance": "credit",
-            },
+            }
         )
-        drawings = _ensure_account(
-            company,
+        definitions.append(
             {
                 "code": drawings_code,
                 "name": f"{partner.name} Drawings",
                 "category": "equity",
                 "subtype": "contra-equity",
                 "normal_balance": "debit",
-            },
+            }
         )
         result.append(
             {
                 "name": partner.name,
-                "capital_code": capital.code,
-                "drawings_code": drawings.code,
+                "capital_code": capital_code,
+                "drawings_code": drawings_code,
             }
         )
+    if definitions:
+        ensure_company_accounts(company, definitions)
     return result
 
 
 def _seed_guided_accounts(company):
     seed_chart_of_accounts(company)
-    for definition in GUIDED_ACCOUNT_DEFINITIONS:
-        _ensure_account(company, definition)
+    if guided_seeded_version(company.id) < GUIDED_ACCOUNTS_VERSION:
+        ensure_company_accounts(company, GUIDED_ACCOUNT_DEFINITIONS)
+        mark_chart_seeded(company.id, GUIDED_ACCOUNTS_VERSION, column="guided_seeded_version")
     return _ensure_partner_accounts(company)
 
 
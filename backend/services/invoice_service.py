@@ -1,17 +1,24 @@
 from extensions import db
 from models import Invoice, InvoiceItem, CustomerPayment, Company
 from services.common import (
+    apply_remittance,
     generate_document_number,
     normalize_document_items,
     refresh_invoice_status,
+    record_document_payment,
+    document_page,
+    insert_documents,
+    line_items_by_document,
     invoice_items_for,
     serialize_line_items,
 )
-from services.accounting_engine import post_operational_entry
+from services.accounting_engine import post_journal_entries_batch, post_operational_entry
+from services.sequence_service import reserve_document_numbers
+from services.ledger_state_service import bump_ledger_version
 from utils import parse_iso_date, parse_money, today_utc_date, iso_date
 import datetime
 
-def create_invoice(user, company, data):
+def _invoice_fields(data):
     customer_name = (data.get("customer_name") or "").strip()
     customer_email = (data.get("customer_email") or "").strip().lower() or None
     if not customer_name:
@@ -28,23 +35,30 @@ def create_invoice(user, company, data):
 
     tax_amount = round(subtotal * (tax_rate / 100), 2)
     total_amount = round(subtotal + tax_amount, 2)
+    fields = {
+        "customer_name": customer_name,
+        "customer_email": customer_email,
+        "status": requested_status,
+        "issue_date": issue_date,
+        "due_date": due_date,
+        "subtotal": subtotal,
+        "tax_rate": tax_rate,
+        "tax_amount": tax_amount,
+        "total_amount": total_amount,
+        "balance_due": total_amount,
+        "notes": (data.get("notes") or "").strip() or None,
+    }
+    return fields, items
+
+def create_invoice(user, company, data):
+    fields, items = _invoice_fields(data)
     invoice = Invoice(
         org_id=user.org_id,
         company_id=company.id,
         invoice_number=generate_document_number(Invoice, company.id, "INV"),
-        customer_name=customer_name,
-        customer_email=customer_email,
-        status=requested_status,
-        issue_date=issue_date,
-        due_date=due_date,
-        subtotal=subtotal,
-        tax_rate=tax_rate,
-        tax_amount=tax_amount,
-        total_amount=total_amount,
-        balance_due=total_amount,
-        notes=(data.get("notes") or "").strip() or None,
         created_by=user.id,
-        last_sent_at=datetime.datetime.now(datetime.UTC) if requested_status == "sent" else None,
+        last_sent_at=datetime.datetime.now(datetime.UTC) if fields["status"] == "sent" else None,
+        **fields,
     )
     db.session.add(invoice)
     db.session.flush()
@@ -61,19 +75,84 @@ def create_invoice(user, company, data):
         )
 
     refresh_invoice_status(invoice)
-    if requested_status == "sent":
+    if fields["status"] == "sent":
         post_invoice_journal(invoice, user)
 
+    bump_ledger_version(company.id)
     return invoice
 
-def post_invoice_journal(invoice, user):
+def import_invoices(user, company, payloads):
+    results = []
+    prepared = []
+    for index, payload in enumerate(payloads, start=1):
+        try:
+            prepared.append(_invoice_fields(payload if isinstance(payload, dict) else {}))
+            results.append({"index": index, "id": None, "invoice_number": None, "error": None})
+        except ValueError as exc:
+            results.append({"index": index, "id": None, "invoice_number": None, "error": str(exc)})
+    if not results or any(result["error"] for result in results):
+        return False, results
+
+    numbers = reserve_document_numbers(Invoice, company.id, "INV", len(prepared))
+    now = datetime.datetime.now(datetime.UTC)
+    rows = [
+        {
+            **fields,
+            "org_id": user.org_id,
+            "company_id": company.id,
+            "invoice_number": number,
+            "created_by": user.id,
+            "created_at": now,
+            "last_sent_at": now if fields["status"] == "sent" else None,
+        }
+        for (fields, _), number in zip(prepared, numbers)
+    ]
+    invoice_ids = insert_documents(
+        Invoice, InvoiceItem, "invoice_id", "invoice_number", rows, [items for _, items in prepared]
+    )
+
+    # Journals follow the requested status, exactly as create_invoice posts them.
+    sent = [position for position, (fields, _) in enumerate(prepared) if fields["status"] == "sent"]
+    if sent:
+        posted, journal_results = post_journal_entries_batch(
+            company,
+            user,
+            [_invoice_import_entry(rows[position]) for position in sent],
+            source_type="invoice_issue",
+            source_ids=[invoice_ids[position] for position in sent],
+        )
+        if not posted:
+            for position, journal_result in zip(sent, journal_results):
+                results[position]["error"] = journal_result["diagnostics"]["error"]
+            return False, results
+
+    bump_ledger_version(company.id)
+    for result, invoice_id, row in zip(results, invoice_ids, rows):
+        result["id"] = invoice_id
+        result["invoice_number"] = row["invoice_number"]
+    return True, results
+
+def _invoice_import_entry(row):
+    return {
+        "entry_date": row["issue_date"],
+        "memo": f"Invoice {row['invoice_number']} issued",
+        "reference": row["invoice_number"],
+        "lines": _invoice_journal_lines(row["customer_name"], row["subtotal"], row["tax_amount"], row["total_amount"]),
+    }
+
+def _invoice_journal_lines(customer_name, subtotal, tax_amount, total_amount):
     journal_lines = [
-        {"account_code": "1100", "debit": float(invoice.total_amount or 0), "credit": 0, "description": invoice.customer_name},
-        {"account_code": "4000", "debit": 0, "credit": float(invoice.subtotal or 0), "description": invoice.customer_name},
+        {"account_code": "1100", "debit": float(total_amount or 0), "credit": 0, "description": customer_name},
+        {"account_code": "4000", "debit": 0, "credit": float(subtotal or 0), "description": customer_name},
     ]
-    if float(invoice.tax_amount or 0) > 0:
-        journal_lines.append({"account_code": "2100", "debit": 0, "credit": float(invoice.tax_amount or 0), "description": invoice.customer_name})
-    
+    if float(tax_amount or 0) > 0:
+        journal_lines.append({"account_code": "2100", "debit": 0, "credit": float(tax_amount or 0), "description": customer_name})
+    return journal_lines
+
+def post_invoice_journal(invoice, user):
+    journal_lines = _invoice_journal_lines(
+        invoice.customer_name, invoice.subtotal, invoice.tax_amount, invoice.total_amount
+    )
     post_operational_entry(
         db.session.get(Company, invoice.company_id),
         user,
@@ -105,10 +184,24 @@ def apply_customer_payment(invoice, amount, payment_date, reference="", source="
     )
     db.session.add(payment)
     db.session.flush()
+    record_document_payment(invoice, payment.amount)
     refresh_invoice_status(invoice)
+    bump_ledger_version(invoice.company_id)
     return payment
 
-def serialize_invoice(invoice):
+def apply_customer_remittance(company, payloads):
+    return apply_remittance(
+        company,
+        payloads,
+        Invoice,
+        CustomerPayment,
+        "invoice_id",
+        "invoice_number",
+        ("sent", "partial", "overdue"),
+        refresh_invoice_status,
+    )
+
+def serialize_invoice(invoice, items=None):
     paid_amount = round(float(invoice.total_amount or 0) - float(invoice.balance_due or 0), 2)
     return {
         "id": invoice.id,
@@ -126,5 +219,15 @@ def serialize_invoice(invoice):
         "paid_amount": paid_amount,
         "notes": invoice.notes or "",
         "overdue": invoice.status == "overdue",
-        "items": serialize_line_items(invoice_items_for(invoice.id)),
+        "items": serialize_line_items(invoice_items_for(invoice.id) if items is None else items),
+    }
+
+def list_invoice_page(company, filters, after=None, limit=None):
+    invoices, next_cursor = document_page(
+        Invoice, Invoice.customer_name, company.id, filters, after=after, limit=limit
+    )
+    items = line_items_by_document(InvoiceItem, InvoiceItem.invoice_id, [invoice.id for invoice in invoices])
+    return {
+        "items": [serialize_invoice(invoice, items[invoice.id]) for invoice in invoices],
+        "next_cursor": next_cursor,
     }
@@ -0,0 +1,31 @@
+from flask import g, has_request_context
+
+
+def ledger_context(company_id):
+    # Report builders share one context per company for the lifetime of a request; CLI and
+    # background callers get None so they always read fresh data.
+    if not has_request_context():
+        return None
+    contexts = g.setdefault("ledger_contexts", {})
+    return contexts.setdefault(company_id, {})
+
+
+def ledger_cached(company_id, key, loader):
+    context = ledger_context(company_id)
+    if context is None:
+        return loader()
+    if key not in context:
+        context[key] = loader()
+    return context[key]
+
+
+def invalidate_ledger_context(company_id=None):
+    if not has_request_context():
+        return
+    contexts = g.get("ledger_contexts")
+    if not contexts:
+        return
+    if company_id is None:
+        contexts.clear()
+    else:
+        contexts.pop(company_id, None)
@@ -0,0 +1,94 @@
+import datetime
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from models import CompanyLedgerState
+from services.ledger_context import invalidate_ledger_context
+
+
+def _state_value(company_id, column):
+    value = db.session.query(column).filter(CompanyLedgerState.company_id == company_id).scalar()
+    return int(value or 0)
+
+
+def _update_state(company_id, **values):
+    result = db.session.execute(
+        update(CompanyLedgerState)
+        .where(CompanyLedgerState.company_id == company_id)
+        .values(updated_at=datetime.datetime.now(datetime.UTC), **values)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def _create_state(company_id, **values):
+    try:
+        with db.session.begin_nested():
+            db.session.add(CompanyLedgerState(company_id=company_id, **values))
+        return True
+    except IntegrityError:
+        return False
+
+
+def chart_version(company_id):
+    return _state_value(company_id, CompanyLedgerState.chart_version)
+
+
+def seeded_version(company_id):
+    return _state_value(company_id, CompanyLedgerState.seeded_version)
+
+
+def guided_seeded_version(company_id):
+    return _state_value(company_id, CompanyLedgerState.guided_seeded_version)
+
+
+def ledger_version(company_id):
+    return _state_value(company_id, CompanyLedgerState.ledger_version)
+
+
+def bump_chart_version(company_id):
+    # Indexes built later in this session may include uncommitted accounts, so they must not be shared.
+    db.session.info.setdefault("chart_changed_company_ids", set()).add(company_id)
+    invalidate_ledger_context(company_id)
+    if _update_state(
+        company_id,
+        chart_version=CompanyLedgerState.chart_version + 1,
+        ledger_version=CompanyLedgerState.ledger_version + 1,
+    ):
+        return chart_version(company_id)
+    if _create_state(company_id, chart_version=1, ledger_version=1):
+        return 1
+    return bump_chart_version(company_id)
+
+
+def bump_ledger_version(company_id):
+    # Bumped in the same transaction as the write, so a cached statement can never outlive the
+    # data it was computed from.
+    invalidate_ledger_context(company_id)
+    if _update_state(company_id, ledger_version=CompanyLedgerState.ledger_version + 1):
+        return ledger_version(company_id)
+    if _create_state(company_id, ledger_version=1):
+        return 1
+    return bump_ledger_version(company_id)
+
+
+def _set_state_version(company_id, column, version):
+    if _update_state(company_id, **{column: version}):
+        return
+    if not _create_state(company_id, **{column: version}):
+        _update_state(company_id, **{column: version})
+
+
+def mark_chart_seeded(company_id, version, column="seeded_version"):
+    _set_state_version(company_id, column, version)
+
+
+def cash_flow_version(company_id):
+    return _state_value(company_id, CompanyLedgerState.cash_flow_version)
+
+
+def mark_cash_flow_indexed(company_id, version):
+    _set_state_version(company_id, "cash_flow_version", version)
+
@@ -1,3 +1,5 @@
+from sqlalchemy import BigInteger, and_, cast, func, not_, or_
+
 from extensions import db
 from models import (
     JournalLine, JournalEntry, LedgerAccount, Project, ProjectCostEntry, TimeEntry, MileageEntry,
@@ -5,78 +7,204 @@ from models import (
     Report, PurchaseOrderLine
 )
 from services.accounting_engine import seed_chart_of_accounts, serialize_ledger_account, serialize_journal_entry
-from shared.accounting_core import build_trial_balance_report
+from services.balance_service import (
+    account_activity_cents,
+    account_balance_rows,
+    account_balance_rows_as_of,
+    journal_activity_by_account,
+)
+from services.ledger_context import ledger_cached
+from shared.accounting_core import build_trial_balance_report, from_cents, to_cents
 from utils import today_utc_date, iso_date
 import datetime
 import json
 
-def build_trial_balance(company):
-    seed_chart_of_accounts(company)
-    accounts = LedgerAccount.query.filter_by(company_id=company.id).order_by(LedgerAccount.code.asc()).all()
-    lines = (
-        db.session.query(JournalLine, JournalEntry)
-        .join(JournalEntry, JournalLine.journal_entry_id == JournalEntry.id)
-        .filter(JournalEntry.company_id == company.id, JournalEntry.status.in_(["posted", "reversed"]))
-        .all()
-    )
-    serialized_accounts = [serialize_ledger_account(account) for account in accounts]
+def company_ledger_accounts(company):
+    def load():
+        seed_chart_of_accounts(company)
+        accounts = LedgerAccount.query.filter_by(company_id=company.id).order_by(LedgerAccount.code.asc()).all()
+        return [serialize_ledger_account(account) for account in accounts]
+
+    return ledger_cached(company.id, "accounts", load)
+
+TRIAL_BALANCE_SOURCES = ("balances", "journal")
+
+def build_trial_balance(company, as_of=None, date_from=None, source="balances"):
+    if source not in TRIAL_BALANCE_SOURCES:
+        raise ValueError(f"source must be one of: {', '.join(TRIAL_BALANCE_SOURCES)}")
+    if as_of is None and date_from is None and source == "balances":
+        return ledger_cached(company.id, "trial_balance", lambda: _build_trial_balance(company))
+    return _build_trial_balance(company, as_of, date_from, source)
+
+def _trial_balance_rows(company, as_of=None, date_from=None, source="balances"):
+    if source == "journal" or date_from is not None:
+        # Let the database sum the lines instead of hydrating every JournalLine.
+        after = date_from - datetime.timedelta(days=1) if date_from is not None else None
+        return journal_activity_by_account(company.id, after=after, through=as_of)
+    # Balances are maintained at posting time, so this reads one row per account instead of every line.
+    if as_of is None:
+        return account_balance_rows(company.id)
+    return account_balance_rows_as_of(company.id, as_of)
+
+def _build_trial_balance(company, as_of=None, date_from=None, source="balances"):
+    serialized_accounts = company_ledger_accounts(company)
     account_lookup = {account["id"]: account for account in serialized_accounts}
-    journal_lines = [
+    balance_rows = _trial_balance_rows(company, as_of, date_from, source)
+    account_totals = [
         {
-            "account_id": line.account_id,
-            "account_code": account_lookup.get(line.account_id, {}).get("code", ""),
-            "account_name": account_lookup.get(line.account_id, {}).get("name", ""),
-            "debit": float(line.debit or 0),
-            "credit": float(line.credit or 0),
+            **row,
+            "account_code": account_lookup.get(row["account_id"], {}).get("code", ""),
+            "account_name": account_lookup.get(row["account_id"], {}).get("name", ""),
         }
-        for line, _entry in lines
+        for row in balance_rows
     ]
-    return build_trial_balance_report(serialized_accounts, journal_lines)
+    return build_trial_balance_report(serialized_accounts, account_totals=account_totals)
 
 def normalized_trial_balance_amount(item):
     amount = float(item.get("net_balance", 0) or 0)
     return round(-amount if item.get("normal_balance") == "credit" else amount, 2)
 
-def build_accounting_overview(company):
-    trial_balance = build_trial_balance(company)
+def build_accounting_overview(company, as_of=None, source="balances"):
+    trial_balance = build_trial_balance(company, as_of=as_of, source=source)
+    journal_query = JournalEntry.query.filter_by(company_id=company.id)
+    if as_of is not None:
+        journal_query = journal_query.filter(JournalEntry.entry_date <= as_of)
     recent_entries = (
-        JournalEntry.query.filter_by(company_id=company.id)
-        .order_by(JournalEntry.entry_date.desc(), JournalEntry.id.desc())
+        journal_query.order_by(JournalEntry.entry_date.desc(), JournalEntry.id.desc())
         .limit(8)
         .all()
     )
+    account_lookup = {account["id"]: account for account in company_ledger_accounts(company)}
+    recent_lines = {entry.id: [] for entry in recent_entries}
+    if recent_lines:
+        line_rows = (
+            JournalLine.query.filter(JournalLine.journal_entry_id.in_(list(recent_lines)))
+            .order_by(JournalLine.line_number.asc(), JournalLine.id.asc())
+            .all()
+        )
+        for line in line_rows:
+            recent_lines[line.journal_entry_id].append(line)
     return {
+        "as_of": iso_date(as_of),
         "account_count": len(trial_balance["items"]),
-        "journal_count": JournalEntry.query.filter_by(company_id=company.id).count(),
+        "journal_count": journal_query.count(),
         "reporting_locked": not trial_balance["balanced"],
         "trial_balance": trial_balance,
-        "recent_entries": [serialize_journal_entry(entry) for entry in recent_entries],
+        "recent_entries": [
+            serialize_journal_entry(entry, recent_lines[entry.id], account_lookup) for entry in recent_entries
+        ],
     }
 
 
-def build_account_register(company, account):
-    lines = (
+REGISTER_CURSOR_FIELDS = ("entry_date", "entry_id", "line_id")
+
+def register_window_functions_supported():
+    # SUM(...) OVER needs SQLite 3.25+; every supported Postgres has it.
+    dialect = db.engine.dialect
+    if dialect.name != "sqlite":
+        return True
+    return dialect.dbapi.sqlite_version_info >= (3, 25, 0)
+
+def _after_register_cursor(cursor, entry_date_column, entry_id_column, line_id_column):
+    # Keyset order is (entry_date, entry_id, line_id); line ids follow line_number within an entry.
+    entry_date, entry_id, line_id = cursor
+    return or_(
+        entry_date_column > entry_date,
+        and_(entry_date_column == entry_date, entry_id_column > entry_id),
+        and_(entry_date_column == entry_date, entry_id_column == entry_id, line_id_column > line_id),
+    )
+
+def _register_signed_cents(account, debit_cents, credit_cents=0):
+    signed = debit_cents - credit_cents
+    return -signed if account.normal_balance == "credit" else signed
+
+def _register_filters(company, account):
+    return (
+        JournalEntry.company_id == company.id,
+        JournalEntry.status.in_(["posted", "reversed"]),
+        JournalLine.account_id == account.id,
+    )
+
+def _register_opening_cents(company, account, after):
+    if after is None:
+        return 0
+    through_cursor = not_(_after_register_cursor(after, JournalEntry.entry_date, JournalEntry.id, JournalLine.id))
+    return _register_signed_cents(account, *account_activity_cents(company.id, account.id, through_cursor))
+
+def _register_rows_python(company, account, after, limit):
+    query = (
         db.session.query(JournalLine, JournalEntry)
         .join(JournalEntry, JournalLine.journal_entry_id == JournalEntry.id)
-        .filter(
-            JournalEntry.company_id == company.id,
-            JournalEntry.status.in_(["posted", "reversed"]),
-            JournalLine.account_id == account.id,
+        .filter(*_register_filters(company, account))
+        .order_by(JournalEntry.entry_date.asc(), JournalEntry.id.asc(), JournalLine.id.asc())
+    )
+    # Pages start from an aggregate of everything up to the cursor, so earlier lines are never loaded.
+    if after is not None:
+        query = query.filter(_after_register_cursor(after, JournalEntry.entry_date, JournalEntry.id, JournalLine.id))
+    rows = query.limit(limit + 1).all() if limit is not None else query.all()
+    opening_cents = _register_opening_cents(company, account, after)
+
+    running_cents = opening_cents
+    result = []
+    for line, entry in rows:
+        running_cents += _register_signed_cents(account, to_cents(line.debit), to_cents(line.credit))
+        result.append((line, entry, running_cents))
+    return result, opening_cents
+
+def _register_rows_windowed(company, account, after, limit):
+    # The database numbers the whole account once with a running SUM and hands back only the page.
+    signed_cents = cast(func.round(func.coalesce(JournalLine.debit, 0) * 100), BigInteger) - cast(
+        func.round(func.coalesce(JournalLine.credit, 0) * 100), BigInteger
+    )
+    ordered = (
+        db.session.query(
+            JournalLine.id.label("line_id"),
+            JournalEntry.id.label("entry_id"),
+            JournalEntry.entry_date.label("entry_date"),
+            func.sum(signed_cents)
+            .over(order_by=(JournalEntry.entry_date.asc(), JournalEntry.id.asc(), JournalLine.id.asc()))
+            .label("running_cents"),
         )
-        .order_by(JournalEntry.entry_date.asc(), JournalEntry.id.asc(), JournalLine.line_number.asc(), JournalLine.id.asc())
-        .all()
+        .join(JournalEntry, JournalLine.journal_entry_id == JournalEntry.id)
+        .filter(*_register_filters(company, account))
+        .subquery()
+    )
+    query = (
+        db.session.query(JournalLine, JournalEntry, ordered.c.running_cents)
+        .join(ordered, ordered.c.line_id == JournalLine.id)
+        .join(JournalEntry, JournalLine.journal_entry_id == JournalEntry.id)
+        .order_by(ordered.c.entry_date.asc(), ordered.c.entry_id.asc(), ordered.c.line_id.asc())
     )
+    if after is not None:
+        query = query.filter(
+            _after_register_cursor(after, ordered.c.entry_date, ordered.c.entry_id, ordered.c.line_id)
+        )
+    rows = query.limit(limit + 1).all() if limit is not None else query.all()
+    result = [(line, entry, _register_signed_cents(account, int(running or 0))) for line, entry, running in rows]
+    if not result:
+        return result, _register_opening_cents(company, account, after)
+    first_line, _, first_running = result[0]
+    first_cents = _register_signed_cents(account, to_cents(first_line.debit), to_cents(first_line.credit))
+    return result, first_running - first_cents
+
+def build_account_register(company, account, after=None, limit=None, use_window=None):
+    if use_window is None:
+        use_window = register_window_functions_supported()
+    load_rows = _register_rows_windowed if use_window else _register_rows_python
+    rows, opening_cents = load_rows(company, account, after, limit)
+
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last_line, last_entry, _ = rows[-1]
+        next_cursor = f"{iso_date(last_entry.entry_date)},{last_entry.id},{last_line.id}"
 
-    running_balance = 0.0
     items = []
-    for line, entry in lines:
-        signed_amount = float(line.debit or 0) - float(line.credit or 0)
-        if account.normal_balance == "credit":
-            signed_amount = -signed_amount
-        running_balance = round(running_balance + signed_amount, 2)
+    for line, entry, running_cents in rows:
         items.append(
             {
                 "entry_id": entry.id,
+                "line_id": line.id,
                 "entry_number": entry.entry_number,
                 "entry_date": iso_date(entry.entry_date),
                 "memo": entry.memo,
@@ -84,14 +212,16 @@ def build_account_register(company, account):
                 "description": line.description or "",
                 "debit": round(float(line.debit or 0), 2),
                 "credit": round(float(line.credit or 0), 2),
-                "running_balance": running_balance,
+                "running_balance": from_cents(running_cents),
             }
         )
 
     return {
         "account": serialize_ledger_account(account),
-        "ending_balance": running_balance,
+        "opening_balance": from_cents(opening_cents),
+        "ending_balance": from_cents(rows[-1][2] if rows else opening_cents),
         "items": items,
+        "next_cursor": next_cursor,
     }
 
 def serialize_project(project):
@@ -0,0 +1,81 @@
+import datetime
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from models import DocumentSequence, Invoice, JournalEntry, VendorBill
+
+# Column each numbered model stores its formatted document number in.
+DOCUMENT_NUMBER_COLUMNS = {
+    Invoice: Invoice.invoice_number,
+    VendorBill: VendorBill.bill_number,
+    JournalEntry: JournalEntry.entry_number,
+}
+
+
+def format_document_number(prefix, company_id, value):
+    return f"{prefix}-{int(company_id):03d}-{int(value):05d}"
+
+
+def _increment_sequence(company_id, prefix, count):
+    # Updating before reading takes the row lock on Postgres and the write lock on SQLite,
+    # so concurrent workers queue here instead of reading the same value.
+    result = db.session.execute(
+        update(DocumentSequence)
+        .where(DocumentSequence.company_id == company_id, DocumentSequence.prefix == prefix)
+        .values(
+            last_value=DocumentSequence.last_value + count,
+            updated_at=datetime.datetime.now(datetime.UTC),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        return None
+    return (
+        db.session.query(DocumentSequence.last_value)
+        .filter(DocumentSequence.company_id == company_id, DocumentSequence.prefix == prefix)
+        .scalar()
+    )
+
+
+def _highest_used_value(model_class, company_id, prefix):
+    # Deleted documents leave gaps, so the row count can fall below a number that is still in
+    # use; the highest numeric suffix already issued under this prefix is the safe starting point.
+    number_column = DOCUMENT_NUMBER_COLUMNS.get(model_class)
+    if number_column is None:
+        return model_class.query.filter_by(company_id=company_id).count()
+    number_prefix = f"{prefix}-{int(company_id):03d}-"
+    numbers = db.session.scalars(
+        select(number_column).where(
+            model_class.company_id == company_id,
+            number_column.startswith(number_prefix, autoescape=True),
+        )
+    )
+    suffixes = (number[len(number_prefix):] for number in numbers)
+    return max((int(suffix) for suffix in suffixes if suffix.isdigit()), default=0)
+
+
+def reserve_sequence_block(model_class, company_id, prefix, count=1):
+    if count < 1:
+        raise ValueError("sequence block size must be at least 1")
+
+    last_value = _increment_sequence(company_id, prefix, count)
+    if last_value is None:
+        # First number for this prefix: continue from the documents that already exist.
+        highest_value = _highest_used_value(model_class, company_id, prefix)
+        try:
+            with db.session.begin_nested():
+                db.session.add(
+                    DocumentSequence(company_id=company_id, prefix=prefix, last_value=highest_value + count)
+                )
+            last_value = highest_value + count
+        except IntegrityError:
+            last_value = _increment_sequence(company_id, prefix, count)
+
+    return last_value - count + 1
+
+
+def reserve_document_numbers(model_class, company_id, prefix, count):
+    first_value = reserve_sequence_block(model_class, company_id, prefix, count)
+    return [format_document_number(prefix, company_id, value) for value in range(first_value, first_value + count)]
@@ -0,0 +1,44 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from services.ledger_state_service import ledger_version
+from utils import today_utc_date
+
+
+STATEMENT_CACHE_SIZE = int(os.getenv("STATEMENT_CACHE_SIZE", "256") or 256)
+
+_STATEMENT_CACHE = OrderedDict()
+_STATEMENT_CACHE_LOCK = threading.Lock()
+
+
+def reset_statement_cache():
+    with _STATEMENT_CACHE_LOCK:
+        _STATEMENT_CACHE.clear()
+
+
+def statement_cache_key(company_id, name, params=()):
+    # Overdue statuses and month-to-date figures move with the calendar, so the day is part of
+    # the key alongside the ledger version.
+    return (company_id, ledger_version(company_id), today_utc_date().isoformat(), name, tuple(params))
+
+
+def statement_etag(key):
+    digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:16]
+    return f"ledger-{key[0]}-{key[1]}-{digest}"
+
+
+def cached_statement(key, builder):
+    with _STATEMENT_CACHE_LOCK:
+        if key in _STATEMENT_CACHE:
+            _STATEMENT_CACHE.move_to_end(key)
+            return _STATEMENT_CACHE[key]
+
+    payload = builder()
+    with _STATEMENT_CACHE_LOCK:
+        _STATEMENT_CACHE[key] = payload
+        _STATEMENT_CACHE.move_to_end(key)
+        while len(_STATEMENT_CACHE) > STATEMENT_CACHE_SIZE:
+            _STATEMENT_CACHE.popitem(last=False)
+    return payload
@@ -1,15 +1,30 @@
 from __future__ import annotations
 
 import datetime
+import os
+import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from flask import current_app
 
 from extensions import db
-from models import CompanyPartner, JournalEntry, JournalLine, LedgerAccount
-from services.reporting_service import build_trial_balance, normalized_trial_balance_amount
-from utils import iso_date
+from models import Company, CompanyPartner, JournalEntry, JournalLine
+from services.balance_service import account_balance_rows_as_of, journal_activity_by_account_and_date
+from services.cash_flow_service import CASH_FLOW_SECTIONS, cash_flow_items, cash_flow_section_totals
+from services.ledger_context import ledger_cached
+from services.reporting_service import build_trial_balance, company_ledger_accounts, normalized_trial_balance_amount
+from shared.accounting_core import build_trial_balance_report, from_cents, to_cents
+from utils import iso_date, today_utc_date
 
 
 POSTED_STATUSES = {"posted", "reversed"}
+COMPARATIVE_PERIODS = {"month": "M", "quarter": "Q", "year": "Y"}
+DEFAULT_COMPARATIVE_COLUMNS = {"month": 12, "quarter": 4, "year": 2}
+MAX_COMPARATIVE_COLUMNS = 60
+STATEMENT_SECTIONS = ("health", "profit_or_loss", "financial_position", "cash_flow", "special_reports")
+CONSOLIDATION_MAX_WORKERS = int(os.getenv("CONSOLIDATION_MAX_WORKERS", "4") or 4)
 
 
 def _round(value):
@@ -57,63 +72,46 @@ def _classify_expense(item):
     return "operating"
 
 
-def _posted_entry_payloads(company):
-    accounts = LedgerAccount.query.filter_by(company_id=company.id).all()
-    account_lookup = {account.id: account for account in accounts}
-    entries = (
-        JournalEntry.query.filter_by(company_id=company.id)
-        .filter(JournalEntry.status.in_(POSTED_STATUSES))
-        .order_by(JournalEntry.entry_date.asc(), JournalEntry.id.asc())
-        .all()
-    )
-    if not entries:
-        return [], account_lookup
-
-    entry_ids = [entry.id for entry in entries]
-    line_rows = (
-        db.session.query(JournalLine)
-        .filter(JournalLine.journal_entry_id.in_(entry_ids))
-        .order_by(
-            JournalLine.journal_entry_id.asc(),
-            JournalLine.line_number.asc(),
-            JournalLine.id.asc(),
-        )
-        .all()
+def _posted_entry_filters(company, start_date=None, end_date=None):
+    filters = [JournalEntry.company_id == company.id, JournalEntry.status.in_(POSTED_STATUSES)]
+    if start_date is not None:
+        filters.append(JournalEntry.entry_date >= start_date)
+    if end_date is not None:
+        filters.append(JournalEntry.entry_date <= end_date)
+    return filters
+
+
+def _posted_line_frame(company, start_date=None, end_date=None):
+    return ledger_cached(
+        company.id,
+        ("posted_line_frame", start_date, end_date),
+        lambda: _load_posted_line_frame(company, start_date, end_date),
     )
 
-    grouped_lines = defaultdict(list)
-    for line in line_rows:
-        account = account_lookup.get(line.account_id)
-        grouped_lines[line.journal_entry_id].append(
-            {
-                "account_id": line.account_id,
-                "account_code": account.code if account else "",
-                "account_name": account.name if account else "",
-                "category": account.category if account else "",
-                "subtype": account.subtype if account else "",
-                "debit": _round(line.debit),
-                "credit": _round(line.credit),
-                "description": line.description or "",
-            }
-        )
 
-    payload = []
-    for entry in entries:
-        payload.append(
-            {
-                "id": entry.id,
-                "entry_number": entry.entry_number,
-                "entry_date": iso_date(entry.entry_date),
-                "memo": entry.memo,
-                "reference": entry.reference or "",
-                "status": entry.status,
-                "lines": grouped_lines.get(entry.id, []),
-            }
-        )
-    return payload, account_lookup
+def _load_posted_line_frame(company, start_date=None, end_date=None):
+    # Special reports only need (entry, account code, amount) per line, so lines are kept as
+    # columns and reduced with grouped sums instead of being walked as nested entry payloads.
+    account_codes = {account["id"]: account["code"] for account in company_ledger_accounts(company)}
+    rows = (
+        db.session.query(JournalLine.journal_entry_id, JournalLine.account_id, JournalLine.debit, JournalLine.credit)
+        .join(JournalEntry, JournalLine.journal_entry_id == JournalEntry.id)
+        .filter(*_posted_entry_filters(company, start_date, end_date))
+        .all()
+    )
+    frame = pd.DataFrame(rows, columns=["entry_id", "account_id", "debit", "credit"])
+    return pd.DataFrame(
+        {
+            "entry_id": frame["entry_id"].astype("int64"),
+            "account_code": frame["account_id"].map(account_codes).fillna("").astype(str),
+            "debit_cents": (frame["debit"].astype(float).fillna(0) * 100).round().astype("int64"),
+            "credit_cents": (frame["credit"].astype(float).fillna(0) * 100).round().astype("int64"),
+        }
+    )
 
 
-def _activity_by_code(entry_payloads):
+def _activity_by_code(company, lines):
+    accounts = {account["code"]: account for account in company_ledger_accounts(company)}
     activity = defaultdict(
         lambda: {
             "name": "",
@@ -123,14 +121,16 @@ def _activity_by_code(entry_payloads):
             "credit": 0.0,
         }
     )
-    for entry in entry_payloads:
-        for line in entry["lines"]:
-            bucket = activity[line["account_code"]]
-            bucket["name"] = line["account_name"]
-            bucket["category"] = line["category"]
-            bucket["subtype"] = line["subtype"]
-            bucket["debit"] = _round(bucket["debit"] + float(line["debit"] or 0))
-            bucket["credit"] = _round(bucket["credit"] + float(line["credit"] or 0))
+    totals = lines.groupby("account_code")[["debit_cents", "credit_cents"]].sum()
+    for code, debit_cents, credit_cents in totals.itertuples():
+        account = accounts.get(code, {})
+        activity[code] = {
+            "name": account.get("name", ""),
+            "category": account.get("category", ""),
+            "subtype": account.get("subtype", ""),
+            "debit": from_cents(int(debit_cents)),
+            "credit": from_cents(int(credit_cents)),
+        }
     return activity
 
 
@@ -250,78 +250,12 @@ def _build_financial_position(trial_balance, profit_or_loss):
     }
 
 
-def _classify_cash_flow(counterparty_accounts):
-    for account in counterparty_accounts:
-        category = str(account.category or "").strip().lower()
-        subtype = str(account.subtype or "").strip().lower()
-        name = str(account.name or "").strip().lower()
-        if category == "equity":
-            return "financing"
-        if category == "liability" and subtype == "non-current":
-            return "financing"
-        if category == "liability" and "loan" in name:
-            return "financing"
-        if category == "asset" and subtype == "non-current":
-            return "investing"
-    return "operating"
-
-
-def _build_cash_flow(trial_balance, entry_payloads, account_lookup):
-    cash_account_ids = {
-        account.id
-        for account in account_lookup.values()
-        if str(account.code or "").strip() == "1000" or "cash" in str(account.name or "").lower()
-    }
-    if not entry_payloads:
-        ending_cash = _round(
-            sum(
-                _trial_amount(item)
-                for item in trial_balance["items"]
-                if str(item.get("code") or "").strip() == "1000"
-            )
-        )
-        return {
-            "opening_cash": ending_cash,
-            "net_change_in_cash": 0.0,
-            "ending_cash": ending_cash,
-            "operating": {"items": [], "total": 0.0},
-            "investing": {"items": [], "total": 0.0},
-            "financing": {"items": [], "total": 0.0},
-        }
-
-    sections = {"operating": [], "investing": [], "financing": []}
-    totals = {"operating": 0.0, "investing": 0.0, "financing": 0.0}
-    net_cash_change = 0.0
-
-    for entry in entry_payloads:
-        cash_delta = _round(
-            sum(
-                float(line["debit"] or 0) - float(line["credit"] or 0)
-                for line in entry["lines"]
-                if line["account_id"] in cash_account_ids
-            )
-        )
-        if abs(cash_delta) < 0.01:
-            continue
-
-        counterparty_accounts = [
-            account_lookup[line["account_id"]]
-            for line in entry["lines"]
-            if line["account_id"] not in cash_account_ids and line["account_id"] in account_lookup
-        ]
-        section = _classify_cash_flow(counterparty_accounts)
-        payload = {
-            "entry_id": entry["id"],
-            "entry_number": entry["entry_number"],
-            "entry_date": entry["entry_date"],
-            "memo": entry["memo"],
-            "reference": entry["reference"],
-            "amount": cash_delta,
-        }
-        sections[section].append(payload)
-        totals[section] = _round(totals[section] + cash_delta)
-        net_cash_change = _round(net_cash_change + cash_delta)
-
+def _build_cash_flow(company, trial_balance, start_date=None, end_date=None):
+    # Cash-affecting entries are indexed at posting time, so the statement is a range query
+    # plus one grouped sum per section rather than a walk over every posted entry.
+    sections = cash_flow_items(company.id, start_date, end_date)
+    totals = cash_flow_section_totals(company.id, start_date, end_date)
+    net_cash_change = from_cents(sum(totals.values()))
     ending_cash = _round(
         sum(
             _trial_amount(item)
@@ -335,9 +269,9 @@ def _build_cash_flow(trial_balance, entry_payloads, account_lookup):
         "opening_cash": opening_cash,
         "net_change_in_cash": net_cash_change,
         "ending_cash": ending_cash,
-        "operating": {"items": sections["operating"], "total": totals["operating"]},
-        "investing": {"items": sections["investing"], "total": totals["investing"]},
-        "financing": {"items": sections["financing"], "total": totals["financing"]},
+        "operating": {"items": sections["operating"], "total": from_cents(totals["operating"])},
+        "investing": {"items": sections["investing"], "total": from_cents(totals["investing"])},
+        "financing": {"items": sections["financing"], "total": from_cents(totals["financing"])},
     }
 
 
@@ -408,32 +342,20 @@ def _partner_capital_codes(company):
     return items
 
 
-def _build_partnership_appropriation(company, profit_or_loss, entry_payloads, activity):
+def _partner_allocations(lines, partner_codes, trigger_code, side):
+    # Partner lines count only inside entries that also touch trigger_code.
+    column = f"{side}_cents"
+    entry_ids = lines.loc[lines["account_code"] == trigger_code, "entry_id"].unique()
+    selected = lines[
+        lines["entry_id"].isin(entry_ids) & lines["account_code"].isin(partner_codes) & (lines[column] > 0)
+    ]
+    totals = selected.groupby(selected["account_code"].map(partner_codes))[column].sum()
+    return [{"partner": name, "amount": from_cents(int(cents))} for name, cents in sorted(totals.items())]
+
+
+def _build_partnership_appropriation(company, profit_or_loss, lines, activity):
     partner_codes = {item["capital_code"]: item["name"] for item in _partner_capital_codes(company)}
-    allocations = defaultdict(float)
-    interest_on_capital_allocations = defaultdict(float)
-    salary_allocations = defaultdict(float)
-    drawings_interest_allocations = defaultdict(float)
-
-    for entry in entry_payloads:
-        codes = {line["account_code"] for line in entry["lines"]}
-        if "3300" in codes:
-            for line in entry["lines"]:
-                if line["account_code"] in partner_codes and float(line["credit"] or 0) > 0:
-                    allocations[partner_codes[line["account_code"]]] += float(line["credit"] or 0)
-        if "5230" in codes:
-            for line in entry["lines"]:
-                if line["account_code"] in partner_codes and float(line["credit"] or 0) > 0:
-                    interest_on_capital_allocations[partner_codes[line["account_code"]]] += float(line["credit"] or 0)
-        if "5240" in codes:
-            for line in entry["lines"]:
-                if line["account_code"] in partner_codes and float(line["credit"] or 0) > 0:
-                    salary_allocations[partner_codes[line["account_code"]]] += float(line["credit"] or 0)
-        if "4300" in codes:
-            for line in entry["lines"]:
-                partner_name = partner_codes.get(line["account_code"], "")
-                if partner_name and float(line["debit"] or 0) > 0:
-                    drawings_interest_allocations[partner_name] += float(line["debit"] or 0)
+    allocation_items = _partner_allocations(lines, partner_codes, "3300", "credit")
 
     profit_before_appropriation = _round(profit_or_loss["profit_after_tax"])
     interest_on_drawings = _round(activity["4300"]["credit"])
@@ -442,33 +364,20 @@ def _build_partnership_appropriation(company, profit_or_loss, entry_payloads, ac
     partner_salaries = _round(activity["5240"]["debit"])
     residual_profit = _round(adjusted_profit - interest_on_capital - partner_salaries)
 
-    allocation_items = [
-        {"partner": name, "amount": _round(amount)}
-        for name, amount in sorted(allocations.items())
-    ]
     return {
         "profit_before_appropriation": profit_before_appropriation,
         "interest_on_drawings": {
             "total": interest_on_drawings,
-            "items": [
-                {"partner": name, "amount": _round(amount)}
-                for name, amount in sorted(drawings_interest_allocations.items())
-            ],
+            "items": _partner_allocations(lines, partner_codes, "4300", "debit"),
         },
         "adjusted_profit_available": adjusted_profit,
         "interest_on_capital": {
             "total": interest_on_capital,
-            "items": [
-                {"partner": name, "amount": _round(amount)}
-                for name, amount in sorted(interest_on_capital_allocations.items())
-            ],
+            "items": _partner_allocations(lines, partner_codes, "5230", "credit"),
         },
         "partner_salaries": {
             "total": partner_salaries,
-            "items": [
-                {"partner": name, "amount": _round(amount)}
-                for name, amount in sorted(salary_allocations.items())
-            ],
+            "items": _partner_allocations(lines, partner_codes, "5240", "credit"),
         },
         "residual_profit": residual_profit,
         "profit_share_allocations": {
@@ -478,45 +387,330 @@ def _build_partnership_appropriation(company, profit_or_loss, entry_payloads, ac
     }
 
 
-def _build_special_reports(company, trial_balance, profit_or_loss, entry_payloads, activity):
+def _build_special_reports(company, trial_balance, profit_or_loss, start_date=None, end_date=None):
     reports = {}
     business_type = str(company.business_type or "").strip().lower()
+    if business_type not in {"manufacturing", "partnership"}:
+        return reports
+
+    lines = _posted_line_frame(company, start_date, end_date)
+    activity = _activity_by_code(company, lines)
     if business_type == "manufacturing":
         reports["manufacturing_account"] = _build_manufacturing_account(trial_balance, activity)
     if business_type == "partnership":
         reports["partnership_appropriation"] = _build_partnership_appropriation(
             company,
             profit_or_loss,
-            entry_payloads,
+            lines,
             activity,
         )
     return reports
 
 
-def build_financial_statements(company):
-    trial_balance = build_trial_balance(company)
-    entry_payloads, account_lookup = _posted_entry_payloads(company)
-    activity = _activity_by_code(entry_payloads)
-    profit_or_loss = _build_profit_or_loss(trial_balance)
-    financial_position = _build_financial_position(trial_balance, profit_or_loss)
-    cash_flow = _build_cash_flow(trial_balance, entry_payloads, account_lookup)
-    health = _build_health_summary(profit_or_loss, financial_position, cash_flow)
-    special_reports = _build_special_reports(
-        company,
-        trial_balance,
-        profit_or_loss,
-        entry_payloads,
-        activity,
+def parse_statement_sections(include=None):
+    if include is None or include == "":
+        return STATEMENT_SECTIONS
+    names = include.split(",") if isinstance(include, str) else include
+    requested = {str(name).strip().lower() for name in names if str(name).strip()}
+    unknown = requested - set(STATEMENT_SECTIONS)
+    if unknown:
+        raise ValueError(f"include must be drawn from: {', '.join(STATEMENT_SECTIONS)}")
+    return tuple(name for name in STATEMENT_SECTIONS if name in requested) or STATEMENT_SECTIONS
+
+
+def build_financial_statements(company, start_date=None, end_date=None, as_of=None, include=None):
+    if as_of is not None and end_date is not None and as_of != end_date:
+        raise ValueError("as_of and end_date must match when both are provided")
+    end_date = end_date or as_of
+    if start_date is not None and end_date is not None and start_date > end_date:
+        raise ValueError("start_date must be on or before end_date")
+    sections = parse_statement_sections(include)
+    return ledger_cached(
+        company.id,
+        ("financial_statements", start_date, end_date, sections),
+        lambda: _build_financial_statements(company, start_date, end_date, sections),
+    )
+
+
+def _statement_resolver(company, start_date=None, end_date=None):
+    # Each part is built on first use and shared through the request's ledger context, so callers
+    # asking for different sections of the same period never build a part twice.
+    resolved = {}
+
+    def part(name):
+        if name not in resolved:
+            resolved[name] = ledger_cached(
+                company.id,
+                ("statement_part", start_date, end_date, name),
+                builders[name],
+            )
+        return resolved[name]
+
+    # The balance sheet is cumulative through end_date; P&L, cash flow and activity cover the period only.
+    builders = {
+        "trial_balance": lambda: build_trial_balance(company, as_of=end_date),
+        "period_trial_balance": lambda: (
+            part("trial_balance")
+            if start_date is None
+            else build_trial_balance(company, as_of=end_date, date_from=start_date)
+        ),
+        "profit_or_loss": lambda: _build_profit_or_loss(part("period_trial_balance")),
+        "cumulative_profit_or_loss": lambda: (
+            part("profit_or_loss") if start_date is None else _build_profit_or_loss(part("trial_balance"))
+        ),
+        "financial_position": lambda: _build_financial_position(
+            part("trial_balance"),
+            part("cumulative_profit_or_loss"),
+        ),
+        "cash_flow": lambda: _build_cash_flow(company, part("trial_balance"), start_date, end_date),
+        "health": lambda: _build_health_summary(
+            part("profit_or_loss"),
+            part("financial_position"),
+            part("cash_flow"),
+        ),
+        "special_reports": lambda: _build_special_reports(
+            company,
+            part("trial_balance"),
+            part("profit_or_loss"),
+            start_date,
+            end_date,
+        ),
+    }
+    return part
+
+
+def _build_financial_statements(company, start_date=None, end_date=None, sections=STATEMENT_SECTIONS):
+    part = _statement_resolver(company, start_date, end_date)
+    trial_balance = part("trial_balance")
+    payload = {
+        "business_type": company.business_type,
+        "generated_at": datetime.datetime.now(datetime.UTC).isoformat(),
+        "period": {"start_date": iso_date(start_date), "end_date": iso_date(end_date)},
+        "trial_balance_balanced": bool(trial_balance["balanced"]),
+        "trial_balance_difference": _round(trial_balance["difference"]),
+    }
+    for name in sections:
+        payload[name] = part(name)
+    return payload
+
+
+def build_comparative_statements(company, start_date=None, end_date=None, period="month"):
+    period = str(period or "month").strip().lower()
+    if period not in COMPARATIVE_PERIODS:
+        raise ValueError(f"period must be one of: {', '.join(COMPARATIVE_PERIODS)}")
+    end_date = end_date or today_utc_date()
+    freq = COMPARATIVE_PERIODS[period]
+    if start_date is None:
+        first_period = pd.Period(end_date, freq=freq) - (DEFAULT_COMPARATIVE_COLUMNS[period] - 1)
+        start_date = first_period.start_time.date()
+    if start_date > end_date:
+        raise ValueError("start_date must be on or before end_date")
+    periods = pd.period_range(start=start_date, end=end_date, freq=freq)
+    if len(periods) > MAX_COMPARATIVE_COLUMNS:
+        raise ValueError(f"comparative statements are limited to {MAX_COMPARATIVE_COLUMNS} columns")
+    return ledger_cached(
+        company.id,
+        ("comparative_statements", period, start_date, end_date),
+        lambda: _build_comparative_statements(company, start_date, end_date, period, periods),
     )
 
+
+def _pivot_activity(rows, periods):
+    # One (account, day) aggregate from SQL is bucketed into period columns here, so every
+    # column comes from the same read of the journal.
+    if not rows:
+        empty = pd.DataFrame(0, index=pd.Index([], name="account_id"), columns=periods, dtype="int64")
+        return empty, empty.copy()
+    frame = pd.DataFrame(rows)
+    frame["period"] = pd.PeriodIndex(pd.to_datetime(frame["entry_date"]), freq=periods.freq)
+    pivots = [
+        frame.pivot_table(index="account_id", columns="period", values=side, aggfunc="sum", fill_value=0)
+        .reindex(columns=periods, fill_value=0)
+        .astype("int64")
+        for side in ("debit_cents", "credit_cents")
+    ]
+    return pivots[0], pivots[1]
+
+
+def _opening_series(rows, side):
+    return pd.Series({row["account_id"]: row[side] for row in rows}, dtype="int64")
+
+
+def _column_totals(account_ids, debits, credits):
+    return [
+        {"account_id": int(account_id), "debit_cents": int(debit), "credit_cents": int(credit)}
+        for account_id, debit, credit in zip(account_ids, debits, credits)
+        if debit or credit
+    ]
+
+
+def _build_comparative_statements(company, start_date, end_date, period, periods):
+    accounts = company_ledger_accounts(company)
+    opening_date = start_date - datetime.timedelta(days=1)
+    opening_rows = account_balance_rows_as_of(company.id, opening_date)
+    debits, credits = _pivot_activity(
+        journal_activity_by_account_and_date(company.id, after=opening_date, through=end_date),
+        periods,
+    )
+
+    account_ids = debits.index.union(pd.Index([row["account_id"] for row in opening_rows]))
+    debits = debits.reindex(account_ids, fill_value=0)
+    credits = credits.reindex(account_ids, fill_value=0)
+    opening_debits = _opening_series(opening_rows, "debit_cents").reindex(account_ids, fill_value=0)
+    opening_credits = _opening_series(opening_rows, "credit_cents").reindex(account_ids, fill_value=0)
+    cumulative_debits = debits.cumsum(axis=1).add(opening_debits, axis=0)
+    cumulative_credits = credits.cumsum(axis=1).add(opening_credits, axis=0)
+
+    columns = []
+    for column in periods:
+        period_trial_balance = build_trial_balance_report(
+            accounts,
+            account_totals=_column_totals(account_ids, debits[column], credits[column]),
+        )
+        cumulative_trial_balance = build_trial_balance_report(
+            accounts,
+            account_totals=_column_totals(account_ids, cumulative_debits[column], cumulative_credits[column]),
+        )
+        columns.append(
+            {
+                "label": str(column),
+                "start_date": iso_date(max(column.start_time.date(), start_date)),
+                "end_date": iso_date(min(column.end_time.date(), end_date)),
+                "profit_or_loss": _build_profit_or_loss(period_trial_balance),
+                "financial_position": _build_financial_position(
+                    cumulative_trial_balance,
+                    _build_profit_or_loss(cumulative_trial_balance),
+                ),
+            }
+        )
+
+    total_trial_balance = build_trial_balance_report(
+        accounts,
+        account_totals=_column_totals(account_ids, debits.sum(axis=1), credits.sum(axis=1)),
+    )
     return {
         "business_type": company.business_type,
         "generated_at": datetime.datetime.now(datetime.UTC).isoformat(),
+        "period": period,
+        "start_date": iso_date(start_date),
+        "end_date": iso_date(end_date),
+        "columns": columns,
+        "totals": {"profit_or_loss": _build_profit_or_loss(total_trial_balance)},
+    }
+
+
+def _company_consolidation_snapshot(app, company_id, start_date, end_date):
+    # Workers push their own app context, so each one gets its own scoped session and connection.
+    started = time.perf_counter()
+    with app.app_context():
+        company = db.session.get(Company, company_id)
+        trial_balance = build_trial_balance(company, as_of=end_date)
+        period_trial_balance = (
+            trial_balance if start_date is None else build_trial_balance(company, as_of=end_date, date_from=start_date)
+        )
+        snapshot = {
+            "company_id": company.id,
+            "name": company.name,
+            "business_type": company.business_type,
+            "trial_balance": trial_balance,
+            "period_trial_balance": period_trial_balance,
+            "cash_flow_cents": cash_flow_section_totals(company.id, start_date, end_date),
+        }
+    snapshot["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return snapshot
+
+
+def _merge_trial_balances(trial_balances):
+    accounts = {}
+    totals = {}
+    for trial_balance in trial_balances:
+        for item in trial_balance["items"]:
+            code = str(item.get("code") or "").strip()
+            accounts.setdefault(
+                code,
+                {
+                    "id": code,
+                    "code": code,
+                    "name": item.get("name", ""),
+                    "category": item.get("category", ""),
+                    "subtype": item.get("subtype", ""),
+                    "normal_balance": item.get("normal_balance"),
+                },
+            )
+            bucket = totals.setdefault(code, {"account_id": code, "debit_cents": 0, "credit_cents": 0})
+            bucket["debit_cents"] += to_cents(item["debit_total"])
+            bucket["credit_cents"] += to_cents(item["credit_total"])
+    return build_trial_balance_report(
+        [accounts[code] for code in sorted(accounts)],
+        account_totals=totals.values(),
+    )
+
+
+def _merge_cash_flow(trial_balance, snapshots):
+    totals = {
+        section: sum(snapshot["cash_flow_cents"][section] for snapshot in snapshots) for section in CASH_FLOW_SECTIONS
+    }
+    net_cash_change = from_cents(sum(totals.values()))
+    ending_cash = _round(
+        sum(
+            _trial_amount(item)
+            for item in trial_balance["items"]
+            if str(item.get("code") or "").strip() == "1000"
+        )
+    )
+    return {
+        "opening_cash": _round(ending_cash - net_cash_change),
+        "net_change_in_cash": net_cash_change,
+        "ending_cash": ending_cash,
+        **{section: {"total": from_cents(totals[section])} for section in CASH_FLOW_SECTIONS},
+    }
+
+
+def build_consolidated_statements(companies, start_date=None, end_date=None, max_workers=None):
+    if start_date is not None and end_date is not None and start_date > end_date:
+        raise ValueError("start_date must be on or before end_date")
+    company_ids = [company.id for company in companies]
+    workers = max(1, min(max_workers or CONSOLIDATION_MAX_WORKERS, len(company_ids) or 1))
+    app = current_app._get_current_object()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        snapshots = list(
+            pool.map(
+                lambda company_id: _company_consolidation_snapshot(app, company_id, start_date, end_date),
+                company_ids,
+            )
+        )
+
+    trial_balance = _merge_trial_balances(snapshot["trial_balance"] for snapshot in snapshots)
+    period_trial_balance = (
+        trial_balance
+        if start_date is None
+        else _merge_trial_balances(snapshot["period_trial_balance"] for snapshot in snapshots)
+    )
+    profit_or_loss = _build_profit_or_loss(period_trial_balance)
+    cumulative_profit_or_loss = (
+        profit_or_loss if period_trial_balance is trial_balance else _build_profit_or_loss(trial_balance)
+    )
+    return {
+        "generated_at": datetime.datetime.now(datetime.UTC).isoformat(),
+        "period": {"start_date": iso_date(start_date), "end_date": iso_date(end_date)},
+        "company_count": len(snapshots),
+        "workers": workers,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        "companies": [
+            {
+                "company_id": snapshot["company_id"],
+                "name": snapshot["name"],
+                "business_type": snapshot["business_type"],
+                "elapsed_ms": snapshot["elapsed_ms"],
+                "trial_balance_balanced": bool(snapshot["trial_balance"]["balanced"]),
+            }
+            for snapshot in snapshots
+        ],
         "trial_balance_balanced": bool(trial_balance["balanced"]),
         "trial_balance_difference": _round(trial_balance["difference"]),
-        "health": health,
         "profit_or_loss": profit_or_loss,
-        "financial_position": financial_position,
-        "cash_flow": cash_flow,
-        "special_reports": special_reports,
+        "financial_position": _build_financial_position(trial_balance, cumulative_profit_or_loss),
+        "cash_flow": _merge_cash_flow(trial_balance, snapshots),
     }
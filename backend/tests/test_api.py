@@ -1,6 +1,8 @@
+import datetime
 import importlib.util
 import io
 import os
+from contextlib import contextmanager
 from pathlib import Path
 
 import pytest
@@ -29,6 +31,11 @@ def client(backend_module):
         db.drop_all()
         db.create_all()
 
+    from services.accounting_engine import reset_account_index_cache
+    from services.statement_cache import reset_statement_cache
+
+    reset_account_index_cache()
+    reset_statement_cache()
     return app.test_client()
 
 
@@ -58,6 +65,44 @@ def register_and_login(client, email="owner@example.com", password="secret123",
     return payload["token"]
 
 
+@contextmanager
+def capture_statements(backend_module, with_parameters=False):
+    from sqlalchemy import event
+
+    app = backend_module.app
+    db = backend_module.db
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters) if with_parameters else statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", record_statement)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record_statement)
+
+
+def post_two_line_entry(
+    client, headers, debit_code, credit_code, amount, entry_date=None, memo="Journal entry", **fields
+):
+    payload = {
+        **fields,
+        "memo": memo,
+        "lines": [
+            {"account_code": debit_code, "debit": amount, "credit": 0},
+            {"account_code": credit_code, "debit": 0, "credit": amount},
+        ],
+    }
+    if entry_date:
+        payload["entry_date"] = entry_date
+    response = client.post("/finance/journal-entries", headers=headers, json=payload)
+    assert response.status_code == 201
+    return response.get_json()
+
+
 def upgrade_plan(client, headers, plan_code):
     me_response = client.get("/me", headers=headers)
     assert me_response.status_code == 200
@@ -769,6 +814,1304 @@ def test_accounting_core_and_tax_filing_routes(client):
     assert submitted_payload["status"] == "submitted"
 
 
+def test_account_balances_track_postings_and_rebuild_detects_drift(client, backend_module):
+    token = register_and_login(client, email="balances-owner@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/finance/chart-of-accounts", headers=headers).status_code == 200
+
+    for amount in (500, 250):
+        post_two_line_entry(client, headers, "1000", "3000", amount, "2026-03-10", memo="Capital")
+
+    overview_payload = client.get("/finance/accounting/overview", headers=headers).get_json()
+    cash_item = next(item for item in overview_payload["trial_balance"]["items"] if item["code"] == "1000")
+    assert cash_item["debit_total"] == 750.0
+    assert overview_payload["trial_balance"]["balanced"] is True
+
+    from models import AccountBalance, LedgerAccount
+    from services.balance_service import verify_account_balances
+    from services.ledger_state_service import ledger_version
+
+    app = backend_module.app
+    db = backend_module.db
+    with app.app_context():
+        cash_account = LedgerAccount.query.filter_by(code="1000").first()
+        company_id = cash_account.company_id
+        assert verify_account_balances(company_id)["in_sync"] is True
+
+        balance = AccountBalance.query.filter_by(company_id=company_id, account_id=cash_account.id).first()
+        balance.debit_cents = 1000
+        db.session.commit()
+
+        report = verify_account_balances(company_id)
+        assert report["in_sync"] is False
+        assert report["drift"][0]["account_code"] == "1000"
+        assert report["drift"][0]["expected_debit"] == 750.0
+        version_before = ledger_version(company_id)
+
+    result = app.test_cli_runner().invoke(args=["rebuild-balances", "--company-id", str(company_id)])
+    assert result.exit_code == 0
+    assert "1 with drift" in result.output
+
+    with app.app_context():
+        assert verify_account_balances(company_id)["in_sync"] is True
+        # Web processes must stop serving statements cached from the drifted balances.
+        assert ledger_version(company_id) > version_before
+
+
+def test_accounting_overview_as_of_uses_period_snapshots(client, backend_module):
+    token = register_and_login(client, email="snapshots-owner@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/finance/chart-of-accounts", headers=headers).status_code == 200
+
+    def post_cash_entry(entry_date, amount):
+        post_two_line_entry(client, headers, "1000", "4000", amount, entry_date, memo="Cash sale")
+
+    def cash_as_of(as_of):
+        response = client.get(f"/finance/accounting/overview?as_of={as_of}", headers=headers)
+        assert response.status_code == 200
+        payload = response.get_json()
+        assert payload["as_of"] == as_of
+        return next(item for item in payload["trial_balance"]["items"] if item["code"] == "1000")["debit_total"]
+
+    post_cash_entry("2026-01-10", 100)
+    post_cash_entry("2026-02-05", 200)
+    post_cash_entry("2026-02-20", 300)
+    post_cash_entry("2026-03-02", 400)
+
+    assert cash_as_of("2026-02-10") == 300.0
+
+    app = backend_module.app
+    result = app.test_cli_runner().invoke(args=["snapshot-balances", "--through", "2026-03-15"])
+    assert result.exit_code == 0
+    assert "closed 2 periods" in result.output
+
+    from models import AccountPeriodBalance
+
+    with app.app_context():
+        period_ends = {row.period_end.isoformat() for row in AccountPeriodBalance.query.all()}
+    assert period_ends == {"2026-01-31", "2026-02-28"}
+
+    assert cash_as_of("2026-02-10") == 300.0
+    assert cash_as_of("2026-03-31") == 1000.0
+
+    post_cash_entry("2026-02-01", 50)
+    with app.app_context():
+        period_ends = {row.period_end.isoformat() for row in AccountPeriodBalance.query.all()}
+    assert period_ends == {"2026-01-31"}
+    assert cash_as_of("2026-02-10") == 350.0
+
+    assert client.get("/finance/accounting/overview?as_of=bad", headers=headers).status_code == 400
+
+
+def test_document_sequences_allocate_consecutive_numbers_and_blocks(client, backend_module):
+    token = register_and_login(client, email="sequence-owner@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/finance/chart-of-accounts", headers=headers).status_code == 200
+
+    entry_numbers = [
+        post_two_line_entry(client, headers, "1000", "3000", 10, memo="Capital")["entry_number"] for _ in range(2)
+    ]
+
+    company_id = client.get("/me", headers=headers).get_json()["default_company_id"]
+    assert entry_numbers == [f"JE-{company_id:03d}-00001", f"JE-{company_id:03d}-00002"]
+
+    from models import DocumentSequence, JournalEntry, JournalLine
+    from services.sequence_service import reserve_document_numbers
+
+    app = backend_module.app
+    db = backend_module.db
+    with app.app_context():
+        block = reserve_document_numbers(JournalEntry, company_id, "JE", 3)
+        assert block == [f"JE-{company_id:03d}-{value:05d}" for value in (3, 4, 5)]
+        db.session.rollback()
+
+        # Rolled-back reservations are released, so numbering stays gap-free.
+        assert reserve_document_numbers(JournalEntry, company_id, "JE", 1) == [f"JE-{company_id:03d}-00003"]
+
+        # Ledgers numbered before sequences existed continue after their highest number, even
+        # when an earlier document was deleted and the row count no longer reaches it.
+        DocumentSequence.query.filter_by(company_id=company_id).delete()
+        first_entry = JournalEntry.query.filter_by(entry_number=entry_numbers[0]).one()
+        JournalLine.query.filter_by(journal_entry_id=first_entry.id).delete()
+        db.session.delete(first_entry)
+        db.session.flush()
+        assert reserve_document_numbers(JournalEntry, company_id, "JE", 1) == [f"JE-{company_id:03d}-00003"]
+        db.session.rollback()
+
+
+def test_journal_posting_query_count_does_not_grow_with_line_count(client, backend_module):
+    token = register_and_login(client, email="index-owner@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/finance/chart-of-accounts", headers=headers).status_code == 200
+
+    def post_entry(line_count, account_code="5200"):
+        lines = [{"account_code": account_code, "debit": 1, "credit": 0} for _ in range(line_count - 1)]
+        lines.append({"account_code": "1000", "debit": 0, "credit": line_count - 1})
+        statements.clear()
+        response = client.post("/finance/journal-entries", headers=headers, json={"memo": "Expenses", "lines": lines})
+        assert response.status_code == 201
+        return sum(1 for statement in statements if "ledger_account" in statement and statement.startswith("SELECT"))
+
+    with capture_statements(backend_module) as statements:
+        post_entry(2)
+        small_entry_lookups = post_entry(4)
+        large_entry_lookups = post_entry(50)
+
+    assert large_entry_lookups == small_entry_lookups
+
+    create_response = client.post(
+        "/finance/chart-of-accounts",
+        headers=headers,
+        json={"code": "5700", "name": "Professional Fees", "category": "expense", "normal_balance": "debit"},
+    )
+    assert create_response.status_code == 201
+    post_two_line_entry(client, headers, "5700", "1000", 25, memo="Fees")
+
+
+def test_chart_seeding_is_skipped_once_marked_and_fills_only_missing_accounts(client, backend_module):
+    token = register_and_login(client, email="seed-owner@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    first_response = client.get("/finance/chart-of-accounts", headers=headers)
+    assert first_response.status_code == 200
+    seeded_count = len(first_response.get_json()["items"])
+
+    app = backend_module.app
+    db = backend_module.db
+    with capture_statements(backend_module) as statements:
+        second_response = client.get("/finance/chart-of-accounts", headers=headers)
+
+    assert second_response.status_code == 200
+    assert len(second_response.get_json()["items"]) == seeded_count
+    assert not any(statement.startswith("INSERT") for statement in statements)
+    assert sum(1 for statement in statements if "ledger_account" in statement and statement.startswith("SELECT")) == 1
+
+    with app.app_context():
+        from models import LedgerAccount
+
+        LedgerAccount.query.filter(LedgerAccount.code.in_(["1000", "5200"])).delete(synchronize_session=False)
+        db.session.commit()
+
+    assert len(client.get("/finance/chart-of-accounts", headers=headers).get_json()["items"]) == seeded_count - 2
+    seed_response = client.post("/finance/chart-of-accounts/seed", headers=headers)
+    assert seed_response.status_code == 200
+    assert seed_response.get_json()["created"] == 2
+    codes = [item["code"] for item in seed_response.get_json()["items"]]
+    assert len(codes) == len(set(codes)) == seeded_count
+    assert {"1000", "5200"} <= set(codes)
+
+
+def test_journal_batch_posts_entries_in_one_transaction(client, backend_module):
+    token = register_and_login(client, email="batch-owner@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    company_id = client.get("/me", headers=headers).get_json()["default_company_id"]
+
+    def entry(amount, debit_code="5200", entry_date="2026-02-15"):
+        return {
+            "memo": "Month-end accrual",
+            "entry_date": entry_date,
+            "lines": [
+                {"account_code": debit_code, "debit": amount, "credit": 0},
+                {"account_code": "1000", "debit": 0, "credit": amount},
+            ],
+        }
+
+    rejected = client.post(
+        "/finance/journal-entries/batch",
+        headers=headers,
+        json={"entries": [entry(10), entry(20, debit_code="9999"), entry(30, entry_date="not-a-date")]},
+    )
+    assert rejected.status_code == 400
+    rejected_items = rejected.get_json()["items"]
+    assert [item["diagnostics"]["can_post"] for item in rejected_items] == [True, False, False]
+    assert rejected_items[1]["diagnostics"]["line_issues"][0]["issues"] == ["unknown account"]
+    assert client.get("/finance/journal-entries", headers=headers).get_json()["items"] == []
+
+    assert client.post("/finance/journal-entries/batch", headers=headers, json={"entries": []}).status_code == 400
+
+    response = client.post(
+        "/finance/journal-entries/batch",
+        headers=headers,
+        json={"entries": [entry(amount) for amount in range(1, 201)]},
+    )
+    assert response.status_code == 201
+    payload = response.get_json()
+    assert payload["posted"] == 200
+    assert payload["line_count"] == 400
+    assert [item["entry_number"] for item in payload["items"][:2]] == [
+        f"JE-{company_id:03d}-00001",
+        f"JE-{company_id:03d}-00002",
+    ]
+    assert payload["items"][-1]["entry_number"] == f"JE-{company_id:03d}-00200"
+
+    overview_payload = client.get("/finance/accounting/overview", headers=headers).get_json()
+    cash_item = next(item for item in overview_payload["trial_balance"]["items"] if item["code"] == "1000")
+    assert cash_item["credit_total"] == float(sum(range(1, 201)))
+    assert overview_payload["trial_balance"]["balanced"] is True
+
+    from models import JournalLine
+    from services.balance_service import verify_account_balances
+
+    with backend_module.app.app_context():
+        assert verify_account_balances(company_id)["in_sync"] is True
+        lines = JournalLine.query.filter_by(journal_entry_id=payload["items"][0]["id"]).order_by(JournalLine.line_number).all()
+        assert [(line.line_number, line.debit, line.credit) for line in lines] == [(1, 1.0, 0.0), (2, 0.0, 1.0)]
+
+    response = client.post(
+        "/finance/journal-entries/batch",
+        headers=headers,
+        json={"entries": [{**entry(5), "memo": 5, "reference": 77}]},
+    )
+    assert response.status_code == 201
+    posted = client.get("/finance/journal-entries", headers=headers).get_json()["items"][0]
+    assert (posted["memo"], posted["reference"]) == ("5", "77")
+
+
+def test_ai_cfo_overview_loads_each_ledger_dataset_once_per_request(client, backend_module):
+    token = register_and_login(client, email="context-owner@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/finance/chart-of-accounts", headers=headers).status_code == 200
+    for amount in (400, 150):
+        post_two_line_entry(client, headers, "1000", "4000", amount, memo="Cash sale")
+
+    import re
+
+    with capture_statements(backend_module) as statements:
+        response = client.get("/ai-cfo/overview", headers=headers)
+
+    assert response.status_code == 200
+    assert response.get_json()["metrics"]["cash_balance"] == 550.0
+
+    def loads(table):
+        pattern = re.compile(rf"^SELECT .*\sFROM {table}\b", re.DOTALL)
+        return sum(1 for statement in statements if pattern.match(statement))
+
+    for table in ("ledger_account", "account_balance", "invoice", "vendor_bill", "customer_payment", "vendor_payment"):
+        assert loads(table) == 1, table
+    # Posted entries and their lines are loaded at most once; the recent-entries list is a separate dataset.
+    posted_loads = [statement.split()[1].split(".")[0] for statement in statements if "journal_entry.status IN" in statement]
+    assert len(posted_loads) == len(set(posted_loads))
+
+
+def test_trial_balance_journal_source_matches_maintained_balances(client, backend_module):
+    token = register_and_login(client, email="groupby-owner@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/finance/chart-of-accounts", headers=headers).status_code == 200
+    for entry_date, amount in (("2026-01-05", 120.10), ("2026-02-07", 80.20), ("2026-02-20", 0.30)):
+        post_two_line_entry(client, headers, "5200", "1000", amount, entry_date, memo="Supplies")
+
+    balances_payload = client.get("/finance/accounting/overview", headers=headers).get_json()
+    journal_payload = client.get("/finance/accounting/overview?source=journal", headers=headers).get_json()
+    assert journal_payload["trial_balance"] == balances_payload["trial_balance"]
+    assert client.get("/finance/accounting/overview?source=lines", headers=headers).status_code == 400
+
+    from models import Company
+    from services.reporting_service import build_trial_balance
+
+    company_id = client.get("/me", headers=headers).get_json()["default_company_id"]
+    with backend_module.app.app_context():
+        company = backend_module.db.session.get(Company, company_id)
+        february = build_trial_balance(
+            company,
+            as_of=datetime.date(2026, 2, 28),
+            date_from=datetime.date(2026, 2, 1),
+        )
+        supplies = next(item for item in february["items"] if item["code"] == "5200")
+        assert supplies["debit_total"] == 80.5
+        assert february["balanced"] is True
+
+
+def test_ledger_totals_are_exact_integer_cents(client, backend_module):
+    token = register_and_login(client, email="cents-owner@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    entries = [
+        {
+            "memo": "Petty cash",
+            "lines": [
+                {"account_code": "5200", "debit": 0.1, "credit": 0},
+                {"account_code": "5100", "debit": 0.2, "credit": 0},
+                {"account_code": "1000", "debit": 0, "credit": 0.3},
+            ],
+        }
+        for _ in range(300)
+    ]
+    response = client.post("/finance/journal-entries/batch", headers=headers, json={"entries": entries})
+    assert response.status_code == 201
+    assert all(item["diagnostics"]["balanced"] for item in response.get_json()["items"])
+
+    trial_balance = client.get("/finance/accounting/overview", headers=headers).get_json()["trial_balance"]
+    assert trial_balance["debit_total"] == trial_balance["credit_total"] == 90.0
+    assert trial_balance["difference"] == 0.0
+
+    from models import AccountBalance, LedgerAccount
+    from shared.accounting_core import build_trial_balance_report
+
+    with backend_module.app.app_context():
+        cash_account = LedgerAccount.query.filter_by(code="1000").first()
+        balance = AccountBalance.query.filter_by(account_id=cash_account.id).first()
+        assert (balance.debit_cents, balance.credit_cents) == (0, 9000)
+
+    lines = [{"account_id": 1, "debit": 0.1} for _ in range(1000)] + [{"account_id": 2, "credit": 100}]
+    report = build_trial_balance_report([{"id": 1, "name": "Cash"}, {"id": 2, "name": "Capital"}], lines)
+    assert report["items"][0]["debit_total"] == 100.0
+    assert report["balanced"] is True
+
+
+def test_report_queries_use_indexes_instead_of_full_scans(client, backend_module):
+    token = register_and_login(client, email="plan-owner@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/finance/chart-of-accounts", headers=headers).status_code == 200
+    post_two_line_entry(client, headers, "1000", "4000", 75, memo="Cash sale")
+
+    from sqlalchemy import text
+
+    from bootstrap import ensure_model_indexes
+
+    app = backend_module.app
+    db = backend_module.db
+    report_urls = [
+        "/ai-cfo/overview",
+        "/finance/accounting/overview?source=journal",
+        "/finance/accounting/overview?as_of=2026-01-31",
+        "/finance/statements",
+        "/finance/register?account_code=1000",
+        "/finance/register?account_code=1000&limit=1&after=2026-01-01,1,1",
+        "/finance/invoices?limit=1&after=2026-01-01,1",
+        "/finance/bills?limit=1",
+        "/finance/aging/receivables?as_of=2026-01-31",
+        "/finance/aging/payables",
+    ]
+    with capture_statements(backend_module, with_parameters=True) as captured:
+        for url in report_urls:
+            assert client.get(url, headers=headers).status_code == 200, url
+
+    statements = [
+        (statement, parameters)
+        for statement, parameters in captured
+        if statement.lstrip().upper().startswith("SELECT")
+    ]
+    assert len(statements) > 20
+    with app.app_context():
+        with db.engine.connect() as connection:
+            full_scans = []
+            for statement, parameters in statements:
+                plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+                # Only base tables count; scanning a subquery walks rows the database already narrowed.
+                full_scans.extend(
+                    (row[3], statement)
+                    for row in plan
+                    if row[3].startswith("SCAN ")
+                    and "USING" not in row[3]
+                    and row[3].split()[1] in db.metadata.tables
+                )
+        assert full_scans == []
+
+        # Databases created before an index was declared get it on the next startup.
+        db.session.execute(text("DROP INDEX ix_journal_line_account_id_journal_entry_id"))
+        db.session.commit()
+        assert ensure_model_indexes(db) == ["ix_journal_line_account_id_journal_entry_id"]
+        assert ensure_model_indexes(db) == []
+
+
+def test_financial_statements_respect_period_and_as_of_dates(client):
+    token = register_and_login(client, email="period-owner@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/finance/chart-of-accounts", headers=headers).status_code == 200
+    for entry_date, amount in (("2026-01-10", 100), ("2026-02-10", 40), ("2026-03-10", 7)):
+        post_two_line_entry(client, headers, "1000", "4000", amount, entry_date, memo="Cash sale")
+
+    february = client.get(
+        "/finance/statements?start_date=2026-02-01&end_date=2026-02-28",
+        headers=headers,
+    ).get_json()
+    assert february["period"] == {"start_date": "2026-02-01", "end_date": "2026-02-28"}
+    assert february["profit_or_loss"]["revenue"]["total"] == 40.0
+    assert february["financial_position"]["current_assets"]["total"] == 140.0
+    assert february["financial_position"]["balanced"] is True
+    assert february["cash_flow"]["opening_cash"] == 100.0
+    assert february["cash_flow"]["net_change_in_cash"] == 40.0
+    assert february["cash_flow"]["ending_cash"] == 140.0
+    assert [item["entry_date"] for item in february["cash_flow"]["operating"]["items"]] == ["2026-02-10"]
+
+    january = client.get("/finance/statements?as_of=2026-01-31", headers=headers).get_json()
+    assert january["profit_or_loss"]["revenue"]["total"] == 100.0
+    assert january["cash_flow"]["ending_cash"] == 100.0
+
+    all_time = client.get("/finance/statements", headers=headers).get_json()
+    assert all_time["profit_or_loss"]["revenue"]["total"] == 147.0
+
+    assert client.get("/finance/statements?start_date=2026-03-01&end_date=2026-02-01", headers=headers).status_code == 400
+    assert client.get("/finance/statements?as_of=2026-02-30", headers=headers).status_code == 400
+
+
+def test_cash_flow_statement_reads_the_posting_time_cash_index(client, backend_module):
+    token = register_and_login(client, email="cashflow-owner@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/finance/chart-of-accounts", headers=headers).status_code == 200
+
+    def post(debit_code, credit_code, amount, entry_date):
+        memo = f"{debit_code}/{credit_code}"
+        post_two_line_entry(client, headers, debit_code, credit_code, amount, entry_date, memo=memo)
+
+    post("1000", "3000", 1000, "2026-01-02")
+    post("1500", "1000", 400, "2026-01-15")
+    post("1000", "4000", 250, "2026-02-03")
+    post("5200", "2000", 60, "2026-02-04")
+
+    from models import CashFlowEntry
+    from services.cash_flow_service import rebuild_cash_flow_entries
+
+    company_id = client.get("/me", headers=headers).get_json()["default_company_id"]
+    with backend_module.app.app_context():
+        indexed = [
+            (row.entry_date.isoformat(), row.section, row.cash_delta_cents)
+            for row in CashFlowEntry.query.filter_by(company_id=company_id).order_by(CashFlowEntry.entry_date).all()
+        ]
+    assert indexed == [
+        ("2026-01-02", "financing", 100000),
+        ("2026-01-15", "investing", -40000),
+        ("2026-02-03", "operating", 25000),
+    ]
+
+    cash_flow = client.get("/finance/statements", headers=headers).get_json()["cash_flow"]
+    assert cash_flow["financing"]["total"] == 1000.0
+    assert cash_flow["investing"]["total"] == -400.0
+    assert cash_flow["operating"]["total"] == 250.0
+    assert cash_flow["opening_cash"] == 0.0
+    assert cash_flow["ending_cash"] == 850.0
+
+    february = client.get("/finance/statements?start_date=2026-02-01", headers=headers).get_json()["cash_flow"]
+    assert february["opening_cash"] == 600.0
+    assert [item["amount"] for item in february["operating"]["items"]] == [250.0]
+    assert february["financing"]["items"] == []
+
+    with backend_module.app.app_context():
+        assert rebuild_cash_flow_entries(company_id) == 3
+        backend_module.db.session.commit()
+    assert client.get("/finance/statements", headers=headers).get_json()["cash_flow"] == cash_flow
+
+
+def test_comparative_statements_match_single_period_statements(client, backend_module):
+    token = register_and_login(client, email="comparative-owner@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/finance/chart-of-accounts", headers=headers).status_code == 200
+    postings = (
+        ("2025-12-20", "1000", "3000", 500),
+        ("2026-01-10", "1000", "4000", 100),
+        ("2026-01-25", "5200", "1000", 30),
+        ("2026-03-10", "1000", "4000", 7.25),
+    )
+    for entry_date, debit_code, credit_code, amount in postings:
+        post_two_line_entry(client, headers, debit_code, credit_code, amount, entry_date, memo="Comparative")
+
+    with capture_statements(backend_module) as statements:
+        response = client.get(
+            "/finance/statements/comparative?start_date=2026-01-01&end_date=2026-03-31",
+            headers=headers,
+        )
+
+    assert response.status_code == 200
+    comparative = response.get_json()
+    assert [column["label"] for column in comparative["columns"]] == ["2026-01", "2026-02", "2026-03"]
+    # Opening balances plus one grouped read of the window, however many columns are requested.
+    assert sum(1 for statement in statements if "journal_line" in statement) == 2
+
+    for column in comparative["columns"]:
+        single = client.get(
+            f"/finance/statements?start_date={column['start_date']}&end_date={column['end_date']}",
+            headers=headers,
+        ).get_json()
+        assert column["profit_or_loss"] == single["profit_or_loss"]
+        assert column["financial_position"] == single["financial_position"]
+    assert comparative["columns"][1]["profit_or_loss"]["revenue"]["total"] == 0.0
+    assert comparative["columns"][2]["financial_position"]["current_assets"]["total"] == 577.25
+    assert comparative["totals"]["profit_or_loss"]["current_period_result"] == 77.25
+
+    yearly = client.get(
+        "/finance/statements/comparative?period=year&end_date=2026-03-31",
+        headers=headers,
+    ).get_json()
+    assert [column["label"] for column in yearly["columns"]] == ["2025", "2026"]
+    assert [column["financial_position"]["total_assets"] for column in yearly["columns"]] == [500.0, 577.25]
+
+    assert client.get("/finance/statements/comparative?period=week", headers=headers).status_code == 400
+    assert (
+        client.get(
+            "/finance/statements/comparative?start_date=2026-04-01&end_date=2026-03-01",
+            headers=headers,
+        ).status_code
+        == 400
+    )
+
+
+def test_statement_responses_revalidate_against_the_ledger_version(client, backend_module):
+    token = register_and_login(client, email="etag-owner@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/finance/chart-of-accounts", headers=headers).status_code == 200
+
+    def post_sale(amount):
+        post_two_line_entry(client, headers, "1000", "4000", amount, memo="Cash sale")
+
+    post_sale(120)
+    first = client.get("/finance/statements", headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert first.get_json()["profit_or_loss"]["revenue"]["total"] == 120.0
+
+    with capture_statements(backend_module) as statements:
+        revalidated = client.get("/finance/statements", headers={**headers, "If-None-Match": etag})
+        cached = client.get("/finance/statements", headers=headers)
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+    assert cached.get_json() == first.get_json()
+    assert not any("journal_line" in statement or "account_balance" in statement for statement in statements)
+
+    period = client.get("/finance/statements?start_date=2026-01-01", headers=headers)
+    assert period.headers["ETag"] != etag
+
+    post_sale(30)
+    changed = client.get("/finance/statements", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.get_json()["profit_or_loss"]["revenue"]["total"] == 150.0
+
+    summary = client.get("/finance/summary", headers=headers)
+    summary_etag = summary.headers["ETag"]
+    assert client.get("/dashboard", headers={**headers, "If-None-Match": summary_etag}).status_code == 304
+    invoice = client.post(
+        "/finance/invoices",
+        headers=headers,
+        json={"customer_name": "Draft Co", "items": [{"description": "Work", "quantity": 1, "unit_price": 80}]},
+    )
+    assert invoice.status_code == 201
+    refreshed = client.get("/finance/summary", headers={**headers, "If-None-Match": summary_etag})
+    assert refreshed.status_code == 200
+    assert refreshed.get_json()["invoice_count"] == summary.get_json()["invoice_count"] + 1
+
+
+def test_company_setup_invalidates_cached_statements(client):
+    token = register_and_login(client, email="setup-etag-owner@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    company = client.get("/companies", headers=headers).get_json()[0]
+    first = client.get("/finance/statements", headers=headers)
+    assert first.status_code == 200
+    assert first.get_json()["business_type"] == "sole_proprietor"
+
+    response = client.put(
+        f"/companies/{company['id']}/setup",
+        headers=headers,
+        json={"business_type": "partnership", "partner_names": ["Ada", "Ben"]},
+    )
+    assert response.status_code == 200
+
+    changed = client.get("/finance/statements", headers={**headers, "If-None-Match": first.headers["ETag"]})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != first.headers["ETag"]
+    assert changed.get_json()["business_type"] == "partnership"
+    assert changed.get_json()["special_reports"]
+
+
+def test_partnership_appropriation_reduces_posted_lines_by_partner(client):
+    token = register_and_login(
+        client,
+        email="appropriation-owner@example.com",
+        register_overrides={"business_type": "partnership", "partner_names": ["Ada", "Ben"]},
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+    partners = [
+        {"name": "Ada", "ratio": 2, "capital_contribution": 1000, "interest_on_capital": 12.34, "salary": 99.99},
+        {"name": "Ben", "ratio": 1, "capital_contribution": 500, "interest_on_capital": 8.01, "salary": 0},
+    ]
+    for entry_date in ("2026-01-05", "2026-02-07"):
+        response = client.post(
+            "/finance/guided-entries",
+            headers=headers,
+            json={
+                "entry_date": entry_date,
+                "inputs": {"cash_sales": 1200, "partners": partners, "profit_allocation_total": 300},
+            },
+        )
+        assert response.status_code == 201
+
+    appropriation = client.get("/finance/statements", headers=headers).get_json()["special_reports"][
+        "partnership_appropriation"
+    ]
+    assert appropriation["interest_on_capital"] == {
+        "total": 40.7,
+        "items": [{"partner": "Ada", "amount": 24.68}, {"partner": "Ben", "amount": 16.02}],
+    }
+    assert appropriation["partner_salaries"] == {"total": 199.98, "items": [{"partner": "Ada", "amount": 199.98}]}
+    assert appropriation["profit_share_allocations"] == {
+        "total": 600.0,
+        "items": [{"partner": "Ada", "amount": 400.0}, {"partner": "Ben", "amount": 200.0}],
+    }
+
+    february = client.get("/finance/statements?start_date=2026-02-01", headers=headers).get_json()
+    assert february["special_reports"]["partnership_appropriation"]["profit_share_allocations"]["total"] == 300.0
+
+
+def test_consolidated_statements_merge_every_company_by_account_code(client):
+    token = register_and_login(client, email="group-owner@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    me = client.get("/me", headers=headers).get_json()
+    upgrade_response = client.post(
+        "/billing/webhook",
+        json={
+            "type": "customer.subscription.updated",
+            "data": {
+                "object": {
+                    "id": "sub_group_001",
+                    "customer": "cus_group_001",
+                    "status": "active",
+                    "metadata": {"org_id": str(me["org_id"]), "plan_code": "ai"},
+                }
+            },
+        },
+    )
+    assert upgrade_response.status_code == 200
+    company_ids = [me["default_company_id"]]
+    for name in ("East Branch", "West Branch"):
+        response = client.post("/companies", headers=headers, json={"name": name, "business_type": "sole_proprietor"})
+        assert response.status_code == 201
+        company_ids.append(response.get_json()["id"])
+
+    for company_id in company_ids:
+        assert client.get(f"/finance/chart-of-accounts?company_id={company_id}", headers=headers).status_code == 200
+    for company_id, (capital, sales) in zip(company_ids, ((1000, 200), (500, 50.5), (0, 0))):
+        for debit_code, credit_code, amount, entry_date in (
+            ("1000", "3000", capital, "2026-01-05"),
+            ("1000", "4000", sales, "2026-02-10"),
+        ):
+            if not amount:
+                continue
+            post_two_line_entry(
+                client, headers, debit_code, credit_code, amount, entry_date, memo="Group posting", company_id=company_id
+            )
+
+    response = client.get("/org/consolidated-statements", headers=headers)
+    assert response.status_code == 200
+    consolidated = response.get_json()
+    assert consolidated["company_count"] == 3
+    assert [item["company_id"] for item in consolidated["companies"]] == company_ids
+    assert all(item["elapsed_ms"] >= 0 and item["trial_balance_balanced"] for item in consolidated["companies"])
+    assert consolidated["profit_or_loss"]["revenue"]["total"] == 250.5
+    assert consolidated["financial_position"]["total_assets"] == 1750.5
+    assert consolidated["financial_position"]["balanced"] is True
+    assert consolidated["cash_flow"]["financing"]["total"] == 1500.0
+    assert consolidated["cash_flow"]["ending_cash"] == 1750.5
+
+    february = client.get("/org/consolidated-statements?start_date=2026-02-01", headers=headers).get_json()
+    assert february["profit_or_loss"]["revenue"]["total"] == 250.5
+    assert february["cash_flow"]["opening_cash"] == 1500.0
+    assert client.get("/org/consolidated-statements?start_date=2026-03-01&end_date=2026-02-01", headers=headers).status_code == 400
+
+
+def test_account_register_pages_carry_the_opening_balance_forward(client):
+    token = register_and_login(client, email="register-owner@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/finance/chart-of-accounts", headers=headers).status_code == 200
+    postings = (
+        ("2026-01-03", 100, 0),
+        ("2026-01-03", 0, 30.1),
+        ("2026-01-09", 45.55, 0),
+        ("2026-01-09", 0, 5),
+        ("2026-02-01", 12.34, 0),
+    )
+    for entry_date, debit, credit in postings:
+        response = client.post(
+            "/finance/journal-entries",
+            headers=headers,
+            json={
+                "memo": "Register",
+                "entry_date": entry_date,
+                "lines": [
+                    {"account_code": "1000", "debit": debit, "credit": credit},
+                    {"account_code": "4000", "debit": credit, "credit": debit},
+                ],
+            },
+        )
+        assert response.status_code == 201
+
+    full = client.get("/finance/register?account_code=1000", headers=headers).get_json()
+    assert full["opening_balance"] == 0.0
+    assert full["ending_balance"] == 122.79
+    assert full["next_cursor"] is None
+
+    pages = []
+    cursor = None
+    while True:
+        url = "/finance/register?account_code=1000&limit=2" + (f"&after={cursor}" if cursor else "")
+        page = client.get(url, headers=headers).get_json()
+        pages.append(page)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert [len(page["items"]) for page in pages] == [2, 2, 1]
+    assert [item for page in pages for item in page["items"]] == full["items"]
+    for previous, page in zip(pages, pages[1:]):
+        assert page["opening_balance"] == previous["ending_balance"]
+    assert pages[-1]["ending_balance"] == full["ending_balance"]
+
+    revenue_page = client.get(
+        f"/finance/register?account_code=4000&limit=1&after={pages[0]['next_cursor']}",
+        headers=headers,
+    ).get_json()
+    assert revenue_page["opening_balance"] == 100.0
+
+    assert client.get("/finance/register?account_code=1000&after=2026-01-03,1", headers=headers).status_code == 400
+    assert client.get("/finance/register?account_code=1000&limit=0", headers=headers).status_code == 400
+
+
+def test_window_function_register_matches_python_running_balances(client, backend_module):
+    token = register_and_login(client, email="window-owner@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/finance/chart-of-accounts", headers=headers).status_code == 200
+    for day, amount in ((9, 10.1), (2, 20.2), (9, 0.3), (5, 1000), (2, 7.77), (30, 0.03)):
+        response = client.post(
+            "/finance/journal-entries",
+            headers=headers,
+            json={
+                "memo": "Window",
+                "entry_date": f"2026-03-{day:02d}",
+                "lines": [
+                    {"account_code": "1000", "debit": amount, "credit": 0},
+                    {"account_code": "2000", "debit": 0, "credit": round(amount / 2, 2)},
+                    {"account_code": "2000", "debit": 0, "credit": round(amount - round(amount / 2, 2), 2)},
+                ],
+            },
+        )
+        assert response.status_code == 201
+
+    from models import Company, LedgerAccount
+    from services.reporting_service import build_account_register, register_window_functions_supported
+
+    company_id = client.get("/me", headers=headers).get_json()["default_company_id"]
+    with backend_module.app.app_context():
+        assert register_window_functions_supported()
+        company = backend_module.db.session.get(Company, company_id)
+        for code in ("1000", "2000"):
+            account = LedgerAccount.query.filter_by(company_id=company_id, code=code).one()
+            assert build_account_register(company, account, use_window=True) == build_account_register(
+                company, account, use_window=False
+            )
+            cursor = None
+            while True:
+                windowed = build_account_register(company, account, after=cursor, limit=4, use_window=True)
+                python = build_account_register(company, account, after=cursor, limit=4, use_window=False)
+                assert windowed == python
+                if windowed["next_cursor"] is None:
+                    break
+                cursor = tuple(
+                    int(part) if index else datetime.date.fromisoformat(part)
+                    for index, part in enumerate(windowed["next_cursor"].split(","))
+                )
+        assert python["ending_balance"] == 1038.4
+
+
+def test_statements_include_builds_only_the_requested_sections(client, backend_module):
+    token = register_and_login(
+        client,
+        email="include-owner@example.com",
+        register_overrides={"business_type": "partnership", "partner_names": ["Ada", "Ben"]},
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.post(
+        "/finance/guided-entries",
+        headers=headers,
+        json={"inputs": {"cash_sales": 500, "partners": [{"name": "Ada", "capital_contribution": 100}]}},
+    )
+    assert response.status_code == 201
+
+    with capture_statements(backend_module) as statements:
+        response = client.get("/finance/statements?include=profit_or_loss", headers=headers)
+
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert payload["profit_or_loss"]["revenue"]["total"] == 500.0
+    assert not {"health", "financial_position", "cash_flow", "special_reports"} & set(payload)
+    assert not any("company_partner" in statement or "cash_flow_entry" in statement for statement in statements)
+
+    health_only = client.get("/finance/statements?include=health", headers=headers).get_json()
+    full = client.get("/finance/statements", headers=headers).get_json()
+    assert health_only["health"] == full["health"]
+    assert "special_reports" not in health_only
+    assert set(full) >= {"health", "profit_or_loss", "financial_position", "cash_flow", "special_reports"}
+    assert client.get("/finance/statements?include=ledger", headers=headers).status_code == 400
+
+
+def test_document_payment_totals_are_stored_and_reads_never_write(client, backend_module):
+    token = register_and_login(client, email="paid-total-owner@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/finance/chart-of-accounts", headers=headers).status_code == 200
+    invoice = client.post(
+        "/finance/invoices",
+        headers=headers,
+        json={
+            "customer_name": "Paid Total Co",
+            "status": "sent",
+            "due_date": "2099-01-01",
+            "items": [{"description": "Work", "quantity": 1, "unit_price": 100}],
+        },
+    ).get_json()
+    for amount in (30.1, 19.9):
+        response = client.post(f"/finance/invoices/{invoice['id']}/payments", headers=headers, json={"amount": amount})
+        assert response.status_code == 200
+    assert response.get_json()["balance_due"] == 50.0
+    assert response.get_json()["status"] == "partial"
+    # The tax profile is created on first use; that write is not part of the document read path.
+    assert client.get("/finance/tax/summary", headers=headers).status_code == 200
+
+    from models import Invoice
+
+    app = backend_module.app
+    db = backend_module.db
+    with capture_statements(backend_module) as statements:
+        for url in ("/finance/invoices", "/finance/receivables", "/finance/tax/summary"):
+            assert client.get(url, headers=headers).status_code == 200, url
+    assert not any(statement.lstrip().upper().startswith(("UPDATE", "INSERT")) for statement in statements)
+    assert not any("FROM customer_payment WHERE customer_payment.invoice_id" in statement for statement in statements)
+
+    with app.app_context():
+        stored = db.session.get(Invoice, invoice["id"])
+        assert stored.paid_total == 50.0
+        stored.paid_total = 0.0
+        db.session.commit()
+    result = app.test_cli_runner().invoke(args=["reconcile-documents"])
+    assert result.exit_code == 0
+    assert "reconciled 1 documents" in result.output
+    with app.app_context():
+        assert db.session.get(Invoice, invoice["id"]).paid_total == 50.0
+
+
+def test_overdue_sweep_moves_documents_and_reads_trust_stored_status(client, backend_module):
+    token = register_and_login(client, email="overdue-sweep-owner@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/finance/chart-of-accounts", headers=headers).status_code == 200
+    invoice_ids = []
+    for due_date in ("2026-02-01", "2026-04-01"):
+        response = client.post(
+            "/finance/invoices",
+            headers=headers,
+            json={
+                "customer_name": "Sweep Co",
+                "status": "sent",
+                "issue_date": "2026-01-01",
+                "due_date": due_date,
+                "items": [{"description": "Work", "quantity": 1, "unit_price": 100}],
+            },
+        )
+        assert response.status_code == 201
+        invoice_ids.append(response.get_json()["id"])
+
+    from models import Invoice
+
+    app = backend_module.app
+    db = backend_module.db
+    with app.app_context():
+        company_id = db.session.get(Invoice, invoice_ids[0]).company_id
+        for invoice_id in invoice_ids:
+            db.session.get(Invoice, invoice_id).status = "sent"
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(args=["sweep-overdue", "--today", "2026-03-01"])
+    assert result.exit_code == 0
+    assert "marked 1 documents overdue" in result.output
+    with app.app_context():
+        assert [db.session.get(Invoice, invoice_id).status for invoice_id in invoice_ids] == ["overdue", "sent"]
+
+    with capture_statements(backend_module) as statements:
+        response = client.get("/finance/invoices", headers=headers)
+        summary = client.get("/finance/summary", headers=headers).get_json()
+    assert response.status_code == 200
+    assert {item["id"]: item["status"] for item in response.get_json()["items"]}[invoice_ids[1]] == "sent"
+    assert summary["overdue_invoice_count"] == 1
+    assert not any(statement.lstrip().upper().startswith(("UPDATE", "INSERT")) for statement in statements)
+
+    result = app.test_cli_runner().invoke(args=["sweep-overdue", "--company-id", str(company_id)])
+    assert result.exit_code == 0
+    assert "marked 1 documents overdue across 1 companies" in result.output
+    summary = client.get("/finance/summary", headers=headers).get_json()
+    assert summary["overdue_invoice_count"] == 2
+
+
+def test_document_listings_page_filter_and_batch_items(client, backend_module):
+    token = register_and_login(client, email="document-pages-owner@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/finance/chart-of-accounts", headers=headers).status_code == 200
+    for customer_name, issue_date, unit_price in (
+        ("Acme Ltd", "2026-01-05", 100),
+        ("Beta LLC", "2026-01-05", 250),
+        ("acme south", "2026-02-10", 75),
+        ("Gamma Inc", "2026-03-01", 500),
+        ("Acme Ltd", "2026-03-15", 40),
+    ):
+        response = client.post(
+            "/finance/invoices",
+            headers=headers,
+            json={
+                "customer_name": customer_name,
+                "status": "sent",
+                "issue_date": issue_date,
+                "due_date": "2099-01-01",
+                "items": [
+                    {"description": "Work", "quantity": 1, "unit_price": unit_price},
+                    {"description": "Travel", "quantity": 2, "unit_price": 5},
+                ],
+            },
+        )
+        assert response.status_code == 201
+
+    pages = []
+    cursor = None
+    with capture_statements(backend_module) as statements:
+        while True:
+            url = "/finance/invoices?limit=2" + (f"&after={cursor}" if cursor else "")
+            response = client.get(url, headers=headers)
+            assert response.status_code == 200
+            payload = response.get_json()
+            pages.append(payload["items"])
+            cursor = payload["next_cursor"]
+            if cursor is None:
+                break
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    listed = [item for page in pages for item in page]
+    assert [item["issue_date"] for item in listed] == [
+        "2026-01-05",
+        "2026-01-05",
+        "2026-02-10",
+        "2026-03-01",
+        "2026-03-15",
+    ]
+    assert listed == client.get("/finance/invoices", headers=headers).get_json()["items"]
+    assert [item["description"] for item in listed[0]["items"]] == ["Work", "Travel"]
+    item_queries = [statement for statement in statements if "FROM invoice_item" in statement]
+    assert len(item_queries) == len(pages)
+
+    def customers(query):
+        response = client.get(f"/finance/invoices?{query}", headers=headers)
+        assert response.status_code == 200, query
+        return [item["customer_name"] for item in response.get_json()["items"]]
+
+    assert customers("customer=acme") == ["Acme Ltd", "acme south", "Acme Ltd"]
+    assert customers("customer=acme&start_date=2026-02-01&end_date=2026-03-31") == ["acme south", "Acme Ltd"]
+    assert customers("min_amount=100&max_amount=300") == ["Acme Ltd", "Beta LLC"]
+    assert customers("status=paid,draft") == []
+    assert customers("status=sent&customer=gamma") == ["Gamma Inc"]
+
+    for query in ("limit=0", "limit=501", "after=2026-01-05", "min_amount=lots", "start_date=bad"):
+        assert client.get(f"/finance/invoices?{query}", headers=headers).status_code == 400, query
+    assert client.get("/finance/bills?after=bad", headers=headers).status_code == 400
+    assert client.get("/finance/bills?limit=5&vendor=none", headers=headers).get_json() == {
+        "items": [],
+        "next_cursor": None,
+    }
+
+
+def test_aging_reports_bucket_open_balances_as_of_a_date(client):
+    token = register_and_login(client, email="aging-owner@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/finance/chart-of-accounts", headers=headers).status_code == 200
+
+    def invoice(customer_name, issue_date, due_date, amount, status="sent"):
+        response = client.post(
+            "/finance/invoices",
+            headers=headers,
+            json={
+                "customer_name": customer_name,
+                "status": status,
+                "issue_date": issue_date,
+                "due_date": due_date,
+                "items": [{"description": "Work", "quantity": 1, "unit_price": amount}],
+            },
+        )
+        assert response.status_code == 201
+        return response.get_json()["id"]
+
+    def pay(invoice_id, amount, payment_date):
+        response = client.post(
+            f"/finance/invoices/{invoice_id}/payments",
+            headers=headers,
+            json={"amount": amount, "payment_date": payment_date},
+        )
+        assert response.status_code == 200
+
+    invoice("Acme Ltd", "2026-06-01", "2026-07-15", 100)
+    invoice("Acme Ltd", "2026-05-01", "2026-06-15", 200)
+    invoice("Acme Ltd", "2026-05-01", "2026-05-31", 10)
+    pay(invoice("Beta LLC", "2026-03-01", "2026-04-20", 300), 100, "2026-07-05")
+    pay(invoice("Beta LLC", "2026-01-01", "2026-02-01", 50), 50, "2026-06-01")
+    invoice("Gamma Inc", "2026-06-01", "2026-06-10", 999, status="draft")
+    invoice("Gamma Inc", "2026-07-10", "2026-08-10", 100)
+
+    response = client.get("/finance/aging/receivables?as_of=2026-06-30", headers=headers)
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert payload["as_of"] == "2026-06-30"
+    assert payload["buckets"] == ["current", "days_1_30", "days_31_60", "days_61_90", "days_over_90"]
+    assert payload["items"] == [
+        {
+            "customer_name": "Acme Ltd",
+            "document_count": 3,
+            "current": 100.0,
+            "days_1_30": 210.0,
+            "days_31_60": 0.0,
+            "days_61_90": 0.0,
+            "days_over_90": 0.0,
+            "total": 310.0,
+        },
+        {
+            "customer_name": "Beta LLC",
+            "document_count": 1,
+            "current": 0.0,
+            "days_1_30": 0.0,
+            "days_31_60": 0.0,
+            "days_61_90": 300.0,
+            "days_over_90": 0.0,
+            "total": 300.0,
+        },
+    ]
+    assert payload["totals"]["total"] == 610.0
+    assert payload["totals"]["document_count"] == 4
+
+    today_payload = client.get("/finance/aging/receivables", headers=headers).get_json()
+    beta = next(item for item in today_payload["items"] if item["customer_name"] == "Beta LLC")
+    assert beta["total"] == 200.0
+    assert today_payload["totals"]["total"] == 610.0
+
+    response = client.post(
+        "/finance/bills",
+        headers=headers,
+        json={
+            "vendor_name": "Supplies Co",
+            "status": "approved",
+            "issue_date": "2026-06-01",
+            "due_date": "2026-06-20",
+            "items": [{"description": "Paper", "quantity": 1, "unit_price": 80}],
+        },
+    )
+    assert response.status_code == 201
+    payables = client.get("/finance/aging/payables?as_of=2026-06-30", headers=headers).get_json()
+    assert [(item["vendor_name"], item["days_1_30"]) for item in payables["items"]] == [("Supplies Co", 80.0)]
+    assert client.get("/finance/aging/payables?as_of=2026-05-31", headers=headers).get_json()["items"] == []
+    assert client.get("/finance/aging/payables?as_of=bad", headers=headers).status_code == 400
+
+
+def test_bulk_document_import_validates_then_inserts_in_batches(client, backend_module):
+    token = register_and_login(client, email="bulk-import-owner@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/finance/chart-of-accounts", headers=headers).status_code == 200
+
+    def invoice_payload(index, **overrides):
+        payload = {
+            "customer_name": f"Customer {index}",
+            "status": "sent",
+            "issue_date": "2026-09-01",
+            "due_date": "2099-01-01",
+            "tax_rate": 10,
+            "items": [
+                {"description": "Work", "quantity": 2, "unit_price": 50},
+                {"description": "Travel", "quantity": 1, "unit_price": 20},
+            ],
+        }
+        payload.update(overrides)
+        return payload
+
+    rejected = client.post(
+        "/finance/invoices/import",
+        headers=headers,
+        json={"invoices": [invoice_payload(1), invoice_payload(2, items=[]), invoice_payload(3, status="paid")]},
+    )
+    assert rejected.status_code == 400
+    assert rejected.get_json()["error"] == "2 of 3 invoices cannot be imported"
+    assert [item["error"] for item in rejected.get_json()["items"]] == [
+        None,
+        "invoice requires at least one line item",
+        "invoice status must be draft or sent",
+    ]
+    assert client.get("/finance/invoices", headers=headers).get_json()["items"] == []
+    assert client.post("/finance/invoices/import", headers=headers, json={}).status_code == 400
+
+    from models import Invoice, JournalEntry
+
+    app = backend_module.app
+    db = backend_module.db
+    response = client.post("/finance/invoices", headers=headers, json=invoice_payload("earlier", due_date="2026-01-01"))
+    assert response.status_code == 201
+    earlier_id = response.get_json()["id"]
+    with app.app_context():
+        db.session.get(Invoice, earlier_id).status = "sent"
+        db.session.commit()
+
+    payloads = [invoice_payload(index) for index in range(300)]
+    payloads.append(invoice_payload(300, status="draft"))
+    payloads.append(invoice_payload(301, due_date="2026-01-01"))
+    with capture_statements(backend_module) as statements:
+        response = client.post("/finance/invoices/import", headers=headers, json={"invoices": payloads})
+    assert response.status_code == 201
+    payload = response.get_json()
+    assert payload["imported"] == 302
+    assert len(statements) < 60
+
+    numbers = [item["invoice_number"] for item in payload["items"]]
+    assert len(set(numbers)) == 302
+    invoices = {item["id"]: item for item in client.get("/finance/invoices", headers=headers).get_json()["items"]}
+    first = invoices[payload["items"][0]["id"]]
+    assert first["total_amount"] == 132.0
+    assert first["status"] == "sent"
+    assert [item["description"] for item in first["items"]] == ["Work", "Travel"]
+    assert invoices[payload["items"][300]["id"]]["status"] == "draft"
+    assert invoices[payload["items"][301]["id"]]["status"] == "overdue"
+    assert invoices[earlier_id]["status"] == "sent"
+
+    with app.app_context():
+        entries = JournalEntry.query.filter_by(source_type="invoice_issue").all()
+        assert len(entries) == 302
+        assert {entry.source_id for entry in entries} == {earlier_id} | {
+            item["id"] for index, item in enumerate(payload["items"]) if index != 300
+        }
+    trial_balance = client.get("/finance/accounting/overview", headers=headers).get_json()["trial_balance"]
+    receivables = next(item for item in trial_balance["items"] if item["code"] == "1100")
+    assert receivables["debit_total"] == round(302 * 132.0, 2)
+
+    csv_body = (
+        "document_ref,vendor_name,status,issue_date,due_date,description,quantity,unit_price\n"
+        "A,Paper Co,approved,2026-09-01,2099-01-01,Paper,10,2.5\n"
+        "A,Paper Co,approved,2026-09-01,2099-01-01,Toner,1,40\n"
+        ",Paper Co,draft,2026-09-02,,Pens,5,1\n"
+    ).encode()
+    response = client.post(
+        "/finance/bills/import",
+        headers=headers,
+        data={"file": (io.BytesIO(csv_body), "bills.csv")},
+        content_type="multipart/form-data",
+    )
+    assert response.status_code == 201
+    bills = client.get("/finance/bills", headers=headers).get_json()["items"]
+    assert [(bill["total_amount"], bill["status"], len(bill["items"])) for bill in bills] == [
+        (65.0, "approved", 2),
+        (5.0, "draft", 1),
+    ]
+    assert bills[1]["due_date"] == "2026-10-02"
+    from models import VendorProfile
+
+    with app.app_context():
+        assert [vendor.vendor_name for vendor in VendorProfile.query.all()] == ["Paper Co"]
+
+
+def test_remittance_applies_payments_with_per_row_results(client, backend_module):
+    token = register_and_login(client, email="remittance-owner@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/finance/chart-of-accounts", headers=headers).status_code == 200
+    response = client.post(
+        "/finance/invoices/import",
+        headers=headers,
+        json={
+            "invoices": [
+                {
+                    "customer_name": f"Customer {index}",
+                    "status": status,
+                    "due_date": "2099-01-01",
+                    "items": [{"description": "Work", "quantity": 1, "unit_price": 100}],
+                }
+                for index, status in enumerate(("sent", "sent", "sent", "draft"))
+            ]
+        },
+    )
+    assert response.status_code == 201
+    numbers = [item["invoice_number"] for item in response.get_json()["items"]]
+
+    csv_body = "\n".join(
+        [
+            "invoice_number,amount,payment_date,reference",
+            f"{numbers[0]},60,2026-09-10,RA-1",
+            f"{numbers[0]},40,2026-09-11,RA-2",
+            f"{numbers[1]},500,2026-09-10,RA-3",
+            "INV-UNKNOWN,10,2026-09-10,RA-4",
+            f"{numbers[3]},5,2026-09-10,RA-5",
+            f"{numbers[2]},abc,2026-09-10,RA-6",
+            f"{numbers[2]},25.5,,RA-7",
+        ]
+    ).encode()
+
+    from models import CustomerPayment
+
+    app = backend_module.app
+    with capture_statements(backend_module) as statements:
+        response = client.post(
+            "/finance/invoices/remittance",
+            headers=headers,
+            data={"file": (io.BytesIO(csv_body), "remittance.csv")},
+            content_type="multipart/form-data",
+        )
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert payload["applied"] == 3
+    assert payload["failed"] == 4
+    assert [(item["amount"], item["balance_due"], item["error"]) for item in payload["items"]] == [
+        (60.0, 0.0, None),
+        (40.0, 0.0, None),
+        (None, None, "payment exceeds invoice balance"),
+        (None, None, "no open document numbered INV-UNKNOWN"),
+        (None, None, f"no open document numbered {numbers[3]}"),
+        (None, None, "amount must be numeric"),
+        (25.5, 74.5, None),
+    ]
+    assert not any("FROM customer_payment" in statement for statement in statements)
+    assert sum(statement.lstrip().upper().startswith("INSERT INTO CUSTOMER_PAYMENT") for statement in statements) == 1
+
+    listed = client.get("/finance/invoices", headers=headers).get_json()["items"]
+    invoices = {item["invoice_number"]: item for item in listed}
+    assert (invoices[numbers[0]]["status"], invoices[numbers[0]]["balance_due"]) == ("paid", 0.0)
+    assert (invoices[numbers[1]]["status"], invoices[numbers[1]]["balance_due"]) == ("sent", 100.0)
+    assert (invoices[numbers[2]]["status"], invoices[numbers[2]]["balance_due"]) == ("partial", 74.5)
+    with app.app_context():
+        payments = CustomerPayment.query.order_by(CustomerPayment.id.asc()).all()
+        assert [(payment.reference, payment.source) for payment in payments] == [
+            ("RA-1", "remittance"),
+            ("RA-2", "remittance"),
+            ("RA-7", "remittance"),
+        ]
+
+    rejected = client.post(
+        "/finance/invoices/remittance",
+        headers=headers,
+        json={"payments": [{"invoice_number": numbers[0], "amount": 1}]},
+    )
+    assert rejected.status_code == 400
+    assert rejected.get_json()["error"] == "1 of 1 payments cannot be applied"
+    assert client.post("/finance/bills/remittance", headers=headers, json={"payments": []}).status_code == 400
+
+    response = client.post(
+        "/finance/bills",
+        headers=headers,
+        json={
+            "vendor_name": "Paper Co",
+            "status": "approved",
+            "items": [{"description": "Paper", "quantity": 1, "unit_price": 65}],
+        },
+    )
+    assert response.status_code == 201
+    bill = response.get_json()
+    response = client.post(
+        "/finance/bills/remittance",
+        headers=headers,
+        json={
+            "payments": [
+                {"bill_number": bill["bill_number"], "amount": 65, "payment_date": "2026-09-12", "reference": 4417}
+            ]
+        },
+    )
+    assert response.status_code == 200
+    assert response.get_json()["items"][0]["balance_due"] == 0.0
+    bills = client.get("/finance/bills", headers=headers).get_json()["items"]
+    assert bills[0]["status"] == "paid"
+    from models import VendorPayment
+
+    with app.app_context():
+        assert [payment.reference for payment in VendorPayment.query.all()] == ["4417"]
+
+
 def test_vendor_billpay_reconciliation_rules_and_integrations(client):
     token = register_and_login(client)
     headers = {"Authorization": f"Bearer {token}"}
@@ -23,6 +23,32 @@ def parse_money(value, field_name):
         raise ValueError(f"{field_name} must be numeric") from exc
     return round(amount, 2)
 
+PAGE_LIMIT_MAX = 500
+
+def parse_page_limit(value, maximum=PAGE_LIMIT_MAX):
+    if value in {None, ""}:
+        return None
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be a whole number") from None
+    if limit < 1 or limit > maximum:
+        raise ValueError(f"limit must be between 1 and {maximum}")
+    return limit
+
+def parse_keyset_cursor(raw_value, fields):
+    # Keyset cursors name the last row of the previous page as "date,id[,id...]".
+    if not raw_value:
+        return None
+    error = f"after must be {','.join(fields)}"
+    parts = [part.strip() for part in str(raw_value).split(",")]
+    if len(parts) != len(fields):
+        raise ValueError(error)
+    try:
+        return (parse_iso_date(parts[0], "after"), *(int(part) for part in parts[1:]))
+    except ValueError:
+        raise ValueError(error) from None
+
 def parse_bool(value, default=False):
     if value in {None, ""}:
         return default
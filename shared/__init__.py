@@ -1,5 +1,17 @@
 """Shared domain logic reused by the desktop app and the Flask backend."""
 
-from shared.accounting_core import analyze_entry_lines, build_trial_balance_report, infer_normal_balance
+from shared.accounting_core import (
+    analyze_entry_lines,
+    build_trial_balance_report,
+    from_cents,
+    infer_normal_balance,
+    to_cents,
+)
 
-__all__ = ["analyze_entry_lines", "build_trial_balance_report", "infer_normal_balance"]
+__all__ = [
+    "analyze_entry_lines",
+    "build_trial_balance_report",
+    "from_cents",
+    "infer_normal_balance",
+    "to_cents",
+]
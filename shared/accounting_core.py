@@ -1,9 +1,55 @@
 from __future__ import annotations
 
+from itertools import chain
 from typing import Iterable, Mapping
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 CREDIT_NORMAL_CATEGORIES = {"liability", "equity", "revenue", "income"}
+VECTORIZE_MIN_ROWS = 256
+
+
+def to_cents(value: object) -> int:
+    return int(round(float(value or 0) * 100))
+
+
+def from_cents(cents: int) -> float:
+    return round(int(cents or 0) / 100, 2)
+
+
+def _row_cents(payload: Mapping[str, object], side: str) -> int:
+    cents = payload.get(f"{side}_cents")
+    if cents is not None:
+        return int(cents)
+    return to_cents(payload.get(side))
+
+
+def _accumulate_cents(account_ids: list, debits: list[int], credits: list[int]) -> dict:
+    if np is not None and len(account_ids) >= VECTORIZE_MIN_ROWS:
+        slots = {}
+        positions = np.fromiter(
+            (slots.setdefault(account_id, len(slots)) for account_id in account_ids),
+            dtype=np.int64,
+            count=len(account_ids),
+        )
+        debit_totals = np.zeros(len(slots), dtype=np.int64)
+        credit_totals = np.zeros(len(slots), dtype=np.int64)
+        np.add.at(debit_totals, positions, np.asarray(debits, dtype=np.int64))
+        np.add.at(credit_totals, positions, np.asarray(credits, dtype=np.int64))
+        return {
+            account_id: (int(debit_totals[slot]), int(credit_totals[slot]))
+            for account_id, slot in slots.items()
+        }
+
+    totals = {}
+    for account_id, debit, credit in zip(account_ids, debits, credits):
+        debit_total, credit_total = totals.get(account_id, (0, 0))
+        totals[account_id] = (debit_total + debit, credit_total + credit)
+    return totals
 
 
 def infer_normal_balance(category: str | None = None, default: str = "debit") -> str:
@@ -39,26 +85,28 @@ def analyze_entry_lines(
         return diagnostics
 
     contributors = []
+    debit_cents_total = 0
+    credit_cents_total = 0
     for index, payload in enumerate(prepared_lines, start=1):
         line_number = int(payload.get("line_number") or index)
-        debit = round(float(payload.get("debit") or 0), 2)
-        credit = round(float(payload.get("credit") or 0), 2)
+        debit_cents = _row_cents(payload, "debit")
+        credit_cents = _row_cents(payload, "credit")
 
         raw_issues = payload.get("issues") or []
         if not isinstance(raw_issues, list):
             raw_issues = [raw_issues]
         issues = [str(issue).strip() for issue in raw_issues if str(issue).strip()]
 
-        if debit > 0 and credit > 0:
+        if debit_cents > 0 and credit_cents > 0:
             issues.append("line cannot contain both debit and credit")
-        if debit <= 0 and credit <= 0:
+        if debit_cents <= 0 and credit_cents <= 0:
             issues.append("line must contain a debit or credit amount")
 
-        diagnostics["debit_total"] += debit
-        diagnostics["credit_total"] += credit
+        debit_cents_total += debit_cents
+        credit_cents_total += credit_cents
 
-        net_amount = round(debit - credit, 2)
-        if abs(net_amount) > 0:
+        net_cents = debit_cents - credit_cents
+        if net_cents:
             contributors.append(
                 {
                     "line_number": line_number,
@@ -66,8 +114,8 @@ def analyze_entry_lines(
                     "account_name": str(
                         payload.get("account_name") or payload.get("account_label") or ""
                     ).strip(),
-                    "side": "debit" if net_amount > 0 else "credit",
-                    "amount": round(abs(net_amount), 2),
+                    "side": "debit" if net_cents > 0 else "credit",
+                    "amount": from_cents(abs(net_cents)),
                 }
             )
 
@@ -83,10 +131,11 @@ def analyze_entry_lines(
                 }
             )
 
-    diagnostics["debit_total"] = round(diagnostics["debit_total"], 2)
-    diagnostics["credit_total"] = round(diagnostics["credit_total"], 2)
-    diagnostics["difference"] = round(diagnostics["debit_total"] - diagnostics["credit_total"], 2)
-    diagnostics["balanced"] = diagnostics["difference"] == 0
+    # Totals are summed in integer cents so float drift can never unbalance an entry.
+    diagnostics["debit_total"] = from_cents(debit_cents_total)
+    diagnostics["credit_total"] = from_cents(credit_cents_total)
+    diagnostics["difference"] = from_cents(debit_cents_total - credit_cents_total)
+    diagnostics["balanced"] = debit_cents_total == credit_cents_total
     diagnostics["top_contributors"] = sorted(
         contributors,
         key=lambda item: item["amount"],
@@ -117,29 +166,33 @@ def analyze_entry_lines(
 
 def build_trial_balance_report(
     accounts: Iterable[Mapping[str, object]] | None,
-    journal_lines: Iterable[Mapping[str, object]] | None,
+    journal_lines: Iterable[Mapping[str, object]] | None = None,
     *,
+    account_totals: Iterable[Mapping[str, object]] | None = None,
     suspect_limit: int = 5,
 ) -> dict:
+    # account_totals carries rows already summed per account_id (e.g. by a SQL GROUP BY) and
+    # is accumulated exactly like journal_lines, so both paths produce the same report.
     prepared_accounts = [dict(account or {}) for account in (accounts or [])]
-    account_lookup = {}
-    balances = {}
+    known_account_ids = set()
 
     for account in prepared_accounts:
         account_id = account.get("id", account.get("account_id"))
         if account_id is None:
             continue
-        account_lookup[account_id] = account
-        balances[account_id] = {"debit": 0.0, "credit": 0.0}
+        known_account_ids.add(account_id)
 
     unknown_accounts = []
-    for raw_line in journal_lines or []:
-        payload = dict(raw_line or {})
+    line_account_ids = []
+    line_debits = []
+    line_credits = []
+    for raw_line in chain(journal_lines or [], account_totals or []):
+        payload = raw_line or {}
         account_id = payload.get("account_id")
         if account_id is None:
             continue
 
-        if account_id not in balances:
+        if account_id not in known_account_ids:
             synthesized = {
                 "id": account_id,
                 "code": str(payload.get("account_code") or "").strip(),
@@ -147,29 +200,30 @@ def build_trial_balance_report(
                 "category": str(payload.get("category") or "").strip(),
                 "normal_balance": infer_normal_balance(payload.get("category")),
             }
-            account_lookup[account_id] = synthesized
-            balances[account_id] = {"debit": 0.0, "credit": 0.0}
+            known_account_ids.add(account_id)
             unknown_accounts.append(synthesized)
 
-        balances[account_id]["debit"] += float(payload.get("debit") or 0)
-        balances[account_id]["credit"] += float(payload.get("credit") or 0)
+        line_account_ids.append(account_id)
+        line_debits.append(_row_cents(payload, "debit"))
+        line_credits.append(_row_cents(payload, "credit"))
 
+    balances = _accumulate_cents(line_account_ids, line_debits, line_credits)
     items = []
-    debit_total = 0.0
-    credit_total = 0.0
+    debit_cents_total = 0
+    credit_cents_total = 0
 
     for account in prepared_accounts + unknown_accounts:
         account_id = account.get("id", account.get("account_id"))
-        totals = balances.get(account_id, {"debit": 0.0, "credit": 0.0})
-        debit_amount = round(float(totals["debit"] or 0), 2)
-        credit_amount = round(float(totals["credit"] or 0), 2)
-        net_balance = round(debit_amount - credit_amount, 2)
+        debit_cents, credit_cents = balances.get(account_id, (0, 0))
+        debit_amount = from_cents(debit_cents)
+        credit_amount = from_cents(credit_cents)
+        net_balance = from_cents(debit_cents - credit_cents)
         normal_balance = str(
             account.get("normal_balance") or infer_normal_balance(account.get("category") or account.get("type"))
         ).strip().lower() or "debit"
 
-        debit_total += debit_amount
-        credit_total += credit_amount
+        debit_cents_total += debit_cents
+        credit_cents_total += credit_cents
         items.append(
             {
                 **account,
@@ -181,7 +235,7 @@ def build_trial_balance_report(
             }
         )
 
-    difference = round(debit_total - credit_total, 2)
+    difference = from_cents(debit_cents_total - credit_cents_total)
     suspect_accounts = sorted(
         (
             {
@@ -201,8 +255,8 @@ def build_trial_balance_report(
 
     return {
         "items": items,
-        "debit_total": round(debit_total, 2),
-        "credit_total": round(credit_total, 2),
+        "debit_total": from_cents(debit_cents_total),
+        "credit_total": from_cents(credit_cents_total),
         "difference": difference,
         "balanced": difference == 0,
         "imbalance": {